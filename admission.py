@@ -0,0 +1,130 @@
+import os, threading, time
+
+# Poids d'une app en cours de démarrage : ~ nombre de cœurs qu'elle occupe
+WEIGHTS = {"Spring Boot": 2, "Elasticsearch": 3, "ActiveMQ": 2, "Podman Machine": 2,
+           "Podman": 1, "Docker Compose": 1, "Timer": 0}
+MAX_LOAD    = 1.5    # charge moyenne (1 min) par cœur au-delà de laquelle on attend
+MIN_FREE_MB = 512    # mémoire disponible en dessous de laquelle on attend
+HOST_TTL    = 0.5    # durée de validité d'une lecture de /proc
+
+def cpu_count():
+    try:
+        return len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+def read_loadavg(path="/proc/loadavg"):
+    """Charge moyenne sur 1 minute, None hors Linux"""
+    try:
+        with open(path) as f:
+            return float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+
+def read_available_mb(path="/proc/meminfo"):
+    """MemAvailable en Mo, None hors Linux"""
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+# ─── CONTRÔLE D'ADMISSION ────────────────────────────────────────────
+class Admission:
+    """Limite les apps qui démarrent en même temps.
+
+    Une app entre si le nombre d'apps en démarrage reste sous `max_starting`,
+    si la somme des poids reste sous `budget`, et si l'hôte n'est pas déjà
+    saturé (charge /proc/loadavg, mémoire /proc/meminfo). Elle libère sa place
+    dès qu'elle est prête. Quand rien ne démarre, la première app en attente
+    passe toujours, quel que soit son poids ou l'état de l'hôte.
+
+    Réglages par config (JSON) : max_starting, start_budget, max_load,
+    min_free_mb, weights ({type: poids}) ; par app : weight.
+    """
+    def __init__(self, max_starting=None, budget=None, weights=None, max_load=MAX_LOAD,
+                 min_free_mb=MIN_FREE_MB, poll=HOST_TTL):
+        cores = cpu_count()
+        self.cores = cores
+        self.max_starting = int(max_starting or cores)
+        self.budget = float(budget or cores)
+        self.weights = dict(WEIGHTS, **(weights or {}))
+        self.max_load = max_load
+        self.min_free_mb = min_free_mb
+        self.poll = poll
+        self.starting = {}   # clé -> poids
+        self.waiting = []    # clés en attente, dans l'ordre d'arrivée
+        self._cond = threading.Condition()
+        self._host = (0.0, None, None)
+
+    @classmethod
+    def from_config(cls, cfg):
+        return cls(max_starting=cfg.get("max_starting"), budget=cfg.get("start_budget"),
+                   weights=cfg.get("weights"), max_load=cfg.get("max_load", MAX_LOAD),
+                   min_free_mb=cfg.get("min_free_mb", MIN_FREE_MB))
+
+    def weight(self, app):
+        if app.get("weight") not in (None, ""):
+            return float(app["weight"])
+        return float(self.weights.get(app.get("type",""), 1))
+
+    def host(self):
+        """(charge par cœur, Mo disponibles), relus au plus toutes les HOST_TTL"""
+        at, load, free = self._host
+        now = time.monotonic()
+        if now - at >= self.poll:
+            load = read_loadavg()
+            free = read_available_mb()
+            self._host = (now, load, free)
+        return (load / self.cores if load is not None else None), free
+
+    def blocked(self, weight):
+        """Raison pour laquelle une app de ce poids doit attendre, None si elle peut partir"""
+        if not self.starting:
+            return None
+        if len(self.starting) >= self.max_starting:
+            return f"{len(self.starting)} app(s) en démarrage (max {self.max_starting})"
+        if weight <= 0:
+            return None
+        used = sum(self.starting.values())
+        if used + weight > self.budget:
+            return f"poids {used:g}+{weight:g} > {self.budget:g}"
+        load, free = self.host()
+        if load is not None and self.max_load and load > self.max_load:
+            return f"charge {load:.2f}/cœur"
+        if free is not None and self.min_free_mb and free < self.min_free_mb:
+            return f"{free} Mo libres"
+        return None
+
+    def acquire(self, key, app, on_wait=None):
+        """Bloque jusqu'à l'admission, renvoie le temps d'attente (s).
+
+        Les apps en attente passent dans l'ordre d'arrivée : une grosse app
+        n'est pas doublée indéfiniment par des petites.
+        """
+        weight = self.weight(app)
+        t0 = time.monotonic()
+        notified = False
+        with self._cond:
+            self.waiting.append(key)
+            try:
+                while True:
+                    reason = "file d'attente" if self.waiting[0] != key else self.blocked(weight)
+                    if reason is None:
+                        self.starting[key] = weight
+                        return time.monotonic() - t0
+                    if on_wait and not notified:
+                        notified = True
+                        on_wait(reason)
+                    self._cond.wait(self.poll)
+            finally:
+                self.waiting.remove(key)
+                self._cond.notify_all()
+
+    def release(self, key):
+        with self._cond:
+            if self.starting.pop(key, None) is not None:
+                self._cond.notify_all()
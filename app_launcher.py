@@ -1,8 +1,43 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-import json, subprocess, os, threading
-
-CONFIG_FILE = "start_configs.json"
+from tkinter import ttk, messagebox, filedialog, font as tkfont
+import collections, threading, time
+from concurrent.futures import ThreadPoolExecutor
+
+from store import Manager
+from engine import LaunchEngine, GraphError, MAX_PARALLEL, parse_depends
+from probes import parse_spec, probe_specs, format_spec
+from preflight import validate_app
+from supervisor import Supervisor
+from podman import PodmanBackend
+from logpipe import LogQueue
+from timeline import Timeline
+from admission import Admission
+from build import Builder
+from resources import Sampler
+from logindex import LogIndex
+from logfile import LogFile, log_files, parse_when
+from shutdown import StopEngine
+from switch import plan_switch, SwitchEngine, RestartEngine
+from watch import Watcher
+from detect import RunningState
+from plan import PLAN_CACHE
+from ports import PORTS, sample
+from daemon import Client, DaemonError
+import metrics
+
+LOG_DIR     = "logs"
+RUNS_DIR    = "runs"    # timelines des lancements (format Chrome Trace)
+LOG_MAX_LINES = 10000   # lignes gardées par onglet du journal
+LOG_TICK_MS   = 50      # période de vidage de la file vers les widgets
+LOG_BATCH     = 20000   # lignes traitées au plus par tick
+ROW_H         = 100     # hauteur d'une ligne de la liste d'apps (px)
+OVERSCAN      = 3       # cartes préparées au-delà de la zone visible
+ASYNC_POLL_MS = 50      # scrutation des tâches de fond depuis Tk
+VALIDATE_DELAY_MS = 300 # pause de frappe avant de valider une app
+SAMPLE_INTERVAL = 1.0   # secondes entre deux relevés CPU/mémoire
+SPARK_W, SPARK_H = 120, 34   # mini-graphe de ressources d'une carte (px)
+SPARK_POINTS  = 60      # relevés affichés par mini-graphe
+LOGFILE_TICK_MS = 500   # suivi (tail -f) d'un fichier de log ouvert
 
 # ─── COULEURS & STYLE ───────────────────────────────────────────────
 BG       = "#0f1117"
@@ -21,9 +56,14 @@ APP_TYPES = ["Spring Boot", "ActiveMQ", "Elasticsearch", "Podman", "Podman Machi
 TYPE_FIELDS = {
     "Spring Boot":   [("Path du projet",  "path",       False),
                       ("Chemin du JAR",   "jar",        False),
-                      ("Run Config",      "run_config", True )],
-    "ActiveMQ":      [("Home path",       "home",       False)],
-    "Elasticsearch": [("Home path",       "home",       False)],
+                      ("Run Config",      "run_config", True ),
+                      ("Accélération CDS (oui/non)", "cds", True),
+                      ("Build Maven avant lancement (oui/non)", "build", True),
+                      ("Redémarrage (never/on-failure/always)", "restart", True)],
+    "ActiveMQ":      [("Home path",       "home",       False),
+                      ("Redémarrage (never/on-failure/always)", "restart", True)],
+    "Elasticsearch": [("Home path",       "home",       False),
+                      ("Redémarrage (never/on-failure/always)", "restart", True)],
     "Podman":        [("Nom du container","container",  False)],
     "Podman Machine":[],
     "Docker Compose":[("Répertoire projet","directory", False),
@@ -31,6 +71,8 @@ TYPE_FIELDS = {
     "Timer":         [("Secondes",        "seconds",    False)],
 }
 
+TYPE_KEYS = {"type", "name"} | {key for fields in TYPE_FIELDS.values() for _, key, _ in fields}
+
 TYPE_ICON = {
     "Spring Boot":   "🌱",
     "ActiveMQ":      "📨",
@@ -41,61 +83,6 @@ TYPE_ICON = {
     "Timer":         "⏱️",
 }
 
-# ─── DATA MANAGER ────────────────────────────────────────────────────
-class Manager:
-    def __init__(self):
-        self.data = {"configs": []}
-        self.load()
-
-    def save(self):
-        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, indent=2, ensure_ascii=False)
-
-    def load(self):
-        if os.path.exists(CONFIG_FILE):
-            try:
-                with open(CONFIG_FILE, encoding="utf-8") as f:
-                    self.data = json.load(f)
-            except Exception:
-                self.data = {"configs": []}
-
-    @property
-    def config_names(self):
-        return [c["name"] for c in self.data["configs"]]
-
-    def add_config(self, name):
-        if name in self.config_names:
-            return False
-        self.data["configs"].append({"name": name, "apps": []})
-        self.save()
-        return True
-
-    def delete_config(self, name):
-        self.data["configs"] = [c for c in self.data["configs"] if c["name"] != name]
-        self.save()
-
-    def get_config(self, name):
-        return next((c for c in self.data["configs"] if c["name"] == name), None)
-
-    def add_app(self, config_name, app):
-        cfg = self.get_config(config_name)
-        if cfg is not None:
-            cfg["apps"].append(app)
-            self.save()
-
-    def remove_app(self, config_name, idx):
-        cfg = self.get_config(config_name)
-        if cfg and 0 <= idx < len(cfg["apps"]):
-            cfg["apps"].pop(idx)
-            self.save()
-
-    def move_app(self, config_name, from_idx, to_idx):
-        cfg = self.get_config(config_name)
-        if cfg and 0 <= from_idx < len(cfg["apps"]) and 0 <= to_idx <= len(cfg["apps"]):
-            app = cfg["apps"].pop(from_idx)
-            cfg["apps"].insert(to_idx, app)
-            self.save()
-
 # ─── STYLE HELPERS ───────────────────────────────────────────────────
 def styled(root):
     style = ttk.Style(root)
@@ -135,15 +122,67 @@ def _lighten(hex_color):
 
 # ─── MAIN UI ─────────────────────────────────────────────────────────
 class UI:
-    def __init__(self, root):
+    def __init__(self, root, mgr=None, log_dir=LOG_DIR):
         self.root = root
-        self.mgr = Manager()
+        self.mgr = mgr if mgr is not None else Manager()
+        self.sup = Supervisor(log_dir=log_dir)
+        self.podman = PodmanBackend()
+        self.sampler = Sampler(self.sup, self.podman, interval=SAMPLE_INTERVAL).start()
+        self.log_index = LogIndex().attach(self.sup)
+        self.app_list = None
+        self.shown_config = None
+        self.pool = ThreadPoolExecutor(max_workers=4)
+        self.last_runs = {}   # config -> dernier LaunchEngine
+        self.daemon = Client()   # superviseur partagé (cli.py daemon), s'il tourne
+        self.watchers = {}       # config -> (Watcher, fenêtre de suivi)
+        self.metrics_server = None
         root.title("🚀 App Launcher")
         root.configure(bg=BG)
         root.geometry("900x600")
         root.minsize(800, 500)
         styled(root)
         self._build()
+        root.protocol("WM_DELETE_WINDOW", self._quit)
+        if self.mgr.load_error:
+            messagebox.showwarning("Configurations", self.mgr.load_error)
+        if metrics.METRICS_PORT:
+            # Endpoint Prometheus local : APP_LAUNCHER_METRICS_PORT=9464 par exemple
+            try:
+                self.metrics_server = metrics.serve(self.sampler, metrics.METRICS_PORT)
+            except OSError as ex:
+                messagebox.showwarning("Métriques", f"Port {metrics.METRICS_PORT} indisponible : {ex}")
+
+    def _quit(self):
+        self.sampler.stop()
+        self.log_index.stop()
+        for watcher, _ in self.watchers.values():
+            watcher.stop()
+        if self.metrics_server is not None:
+            self.metrics_server.shutdown()
+        self.mgr.flush()
+        self.root.destroy()
+
+    def _run_async(self, fn, callback, on_error=None):
+        """Exécute fn hors du thread Tk puis appelle callback(résultat) dans le thread Tk.
+
+        Une exception de fn est passée à on_error(exception), affichée par défaut.
+        """
+        fut = self.pool.submit(fn)
+
+        def poll():
+            if fut.done():
+                try:
+                    result = fut.result()
+                except Exception as ex:
+                    if on_error is not None:
+                        on_error(ex)
+                    else:
+                        messagebox.showerror("Erreur", f"{type(ex).__name__} : {ex}")
+                    return
+                callback(result)
+            else:
+                self.root.after(ASYNC_POLL_MS, poll)
+        self.root.after(ASYNC_POLL_MS, poll)
 
     def _build(self):
         # LEFT PANEL – config list
@@ -165,6 +204,11 @@ class UI:
         bbar.pack(fill="x", padx=8, pady=8)
         btn(bbar, "+ Nouvelle", self._new_config_dlg, color=ACCENT2).pack(side="left", fill="x", expand=True, padx=(0,4))
         btn(bbar, "🗑", self._del_config, color=DANGER).pack(side="left")
+        btn(left, "📋 Processus", self._show_processes, color=BORDER, fg=TEXT).pack(fill="x", padx=8, pady=(0,8))
+        btn(left, "📈 Exporter ressources", self._export_resources,
+            color=BORDER, fg=TEXT).pack(fill="x", padx=8, pady=(0,8))
+        btn(left, "🔎 Rechercher dans les logs", self._search_logs,
+            color=BORDER, fg=TEXT).pack(fill="x", padx=8, pady=(0,8))
 
         # RIGHT PANEL – config detail
         self.right = tk.Frame(self.root, bg=BG)
@@ -224,6 +268,8 @@ class UI:
             return
         if messagebox.askyesno("Supprimer", f"Supprimer « {n} » ?"):
             self.mgr.delete_config(n)
+            if n in self.watchers:
+                self.watchers[n][1].destroy()
             self._refresh_configs()
             self._show_empty()
 
@@ -231,6 +277,8 @@ class UI:
     def _clear_right(self):
         for w in self.right.winfo_children():
             w.destroy()
+        self.app_list = None
+        self.shown_config = None
 
     def _show_empty(self):
         self._clear_right()
@@ -250,131 +298,48 @@ class UI:
                  font=("Segoe UI", 15, "bold")).pack(side="left")
         btn(hdr, "▶  Lancer tout", lambda: self._launch(name),
             color=SUCCESS).pack(side="right")
+        btn(hdr, "⇄ Basculer ici", lambda: self._switch_to(name),
+            color=ACCENT2).pack(side="right", padx=(0,8))
+        btn(hdr, "👁 Surveiller", lambda: self._watch_config(name),
+            color=BORDER, fg=TEXT).pack(side="right", padx=(0,8))
+        btn(hdr, "🔍 Aperçu", lambda: self._preview(name),
+            color=BORDER, fg=TEXT).pack(side="right", padx=(0,8))
+        btn(hdr, "■ Arrêter tout", lambda: self._stop_all(name),
+            color=DANGER).pack(side="right", padx=(0,8))
+        btn(hdr, "↻ Relancer les échecs", lambda: self._relaunch_failed(name),
+            color=BORDER, fg=TEXT).pack(side="right", padx=(0,8))
         btn(hdr, "+ Ajouter app", lambda: self._add_app_dlg(name),
             color=ACCENT).pack(side="right", padx=(0,8))
 
         tk.Frame(self.right, bg=BORDER, height=1).pack(fill="x", pady=(0,10))
 
         # App list
-        scroll = tk.Frame(self.right, bg=BG)
-        scroll.pack(fill="both", expand=True)
-
-        canvas = tk.Canvas(scroll, bg=BG, highlightthickness=0)
-        sb = ttk.Scrollbar(scroll, orient="vertical", command=canvas.yview)
-        canvas.configure(yscrollcommand=sb.set)
-        sb.pack(side="right", fill="y")
-        canvas.pack(side="left", fill="both", expand=True)
-
-        inner = tk.Frame(canvas, bg=BG)
-        win_id = canvas.create_window((0,0), window=inner, anchor="nw")
-
-        def on_resize(e):
-            canvas.itemconfig(win_id, width=e.width)
-        canvas.bind("<Configure>", on_resize)
-
-        def on_frame(e):
-            canvas.configure(scrollregion=canvas.bbox("all"))
-        inner.bind("<Configure>", on_frame)
-
-        if not cfg["apps"]:
-            tk.Label(inner, text="Aucune application. Cliquez sur « + Ajouter app ».",
-                     bg=BG, fg=SUBTEXT, font=("Segoe UI", 10)).pack(pady=20)
+        self.app_list = AppList(self.right, cfg["apps"],
+                                on_edit=lambda i: self._edit_app_dlg(name, i),
+                                on_delete=lambda i: self._del_app(name, i),
+                                on_logs=lambda i: self._view_log_files(name, i),
+                                on_move=lambda a, b: self._move_app(name, a, b),
+                                sampler=self.sampler)
+        self.app_list.pack(fill="both", expand=True)
+        self.shown_config = name
+
+    def _list_changed(self, config_name, lo, hi=None):
+        """Répercute une modification des apps sur la liste affichée, sans la reconstruire"""
+        if config_name in self.watchers:
+            self.watchers[config_name][0].set_apps(self.mgr.get_config(config_name)["apps"])
+        if self.app_list and self.shown_config == config_name:
+            self.app_list.changed(lo, hi)
         else:
-            for i, app in enumerate(cfg["apps"]):
-                self._app_card(inner, name, i, app)
-
-    def _app_card(self, parent, config_name, idx, app):
-        card = tk.Frame(parent, bg=PANEL, bd=1, relief="solid")
-        card.pack(fill="x", pady=4, padx=2)
-
-        # Drag handle
-        handle = tk.Label(card, text="⋮⋮", bg=ACCENT, fg="white",
-                         font=("Segoe UI", 10), width=3, cursor="hand2")
-        handle.grid(row=0, column=0, rowspan=2, sticky="ns", padx=(4,8), pady=8)
-
-        # Store drag data
-        card.drag_data = {"config": config_name, "idx": idx, "card": card}
-
-        def on_press(e):
-            card.drag_data["start_y"] = e.y
-            card.config(bg="#2d3a5a", relief="solid", bd=2)
-            card.lift()
-
-        def on_motion(e):
-            # Visual feedback while dragging
-            pass
-
-        def on_release(e):
-            card.config(bg=PANEL, relief="solid", bd=1)
-            # Find target position based on mouse Y
-            y_pos = e.widget.winfo_y() + e.y
-            target_idx = self._find_drop_index(parent, y_pos)
-            if target_idx is not None and target_idx != idx:
-                self.mgr.move_app(config_name, idx, target_idx)
-                self._show_config(config_name)
-
-        handle.bind("<Button-1>", on_press)
-        handle.bind("<B1-Motion>", on_motion)
-        handle.bind("<ButtonRelease-1>", on_release)
-
-        # Buttons frame (right side, fixed width)
-        btn_frame = tk.Frame(card, bg=PANEL)
-        btn_frame.grid(row=0, column=99, rowspan=2, sticky="ns", padx=8, pady=8)
-
-        # Edit button
-        edit_btn = btn(btn_frame, "✎", lambda i=idx: self._edit_app_dlg(config_name, i),
-                       color=ACCENT, fg="white")
-        edit_btn.pack(side="top", padx=2, pady=2)
-
-        # Delete button
-        del_btn = btn(btn_frame, "✕", lambda i=idx: self._del_app(config_name, i),
-                      color=DANGER, fg="white")
-        del_btn.pack(side="top", padx=2, pady=2)
-
-        # Content frame (middle - expandable)
-        content_frame = tk.Frame(card, bg=PANEL)
-        content_frame.grid(row=0, column=1, columnspan=98, sticky="ew", padx=8, pady=(10,4))
-        card.columnconfigure(1, weight=1)
-
-        icon = TYPE_ICON.get(app.get("type",""), "⚙️")
-        title = tk.Label(content_frame, text=f"{icon}  {app.get('name','?')}",
-                         bg=PANEL, fg=TEXT, font=("Segoe UI", 11, "bold"))
-        title.pack(anchor="w")
-
-        type_label = tk.Label(content_frame, text=app.get("type",""), bg=PANEL, fg=ACCENT,
-                              font=("Segoe UI", 9))
-        type_label.pack(anchor="w")
-
-        # Fields preview
-        fields_frame = tk.Frame(card, bg=PANEL)
-        fields_frame.grid(row=1, column=1, columnspan=98, sticky="w", padx=8, pady=(0,8))
-
-        for key, val in app.items():
-            if key in ("name","type"):
-                continue
-            if val:
-                f = tk.Frame(fields_frame, bg=PANEL)
-                f.pack(anchor="w")
-                tk.Label(f, text=key.replace("_"," ").title()+":", bg=PANEL,
-                         fg=SUBTEXT, font=("Segoe UI", 8)).pack(anchor="w")
-                tk.Label(f, text=val, bg=PANEL, fg=TEXT,
-                         font=("Segoe UI", 9)).pack(anchor="w")
+            self._show_config(config_name)
 
-    def _find_drop_index(self, parent, y_pos):
-        """Trouve l'index où déposer l'élément basé sur la position Y"""
-        children = parent.winfo_children()
-        for i, child in enumerate(children):
-            if hasattr(child, 'winfo_y'):
-                child_y = child.winfo_y()
-                child_height = child.winfo_height()
-                if y_pos < child_y + child_height / 2:
-                    return i
-        return len(children)
+    def _move_app(self, config_name, from_idx, to_idx):
+        self.mgr.move_app(config_name, from_idx, to_idx)
+        self._list_changed(config_name, min(from_idx, to_idx), max(from_idx, to_idx))
 
     def _del_app(self, config_name, idx):
         if messagebox.askyesno("Supprimer", "Retirer cette application ?"):
             self.mgr.remove_app(config_name, idx)
-            self._show_config(config_name)
+            self._list_changed(config_name, idx)
 
     def _edit_app_dlg(self, config_name, idx):
         """Dialog pour éditer une application existante"""
@@ -383,7 +348,7 @@ class UI:
             return
         
         app = cfg["apps"][idx]
-        dlg = Dlg(self.root, f"Éditer - {app.get('name','')}", 500, 550)
+        dlg = Dlg(self.root, f"Éditer - {app.get('name','')}", 500, 700)
 
         tk.Label(dlg.body, text="Nom :", bg=PANEL, fg=TEXT).pack(anchor="w")
         name_e = entry(dlg.body, width=38)
@@ -396,6 +361,8 @@ class UI:
                                textvariable=type_var, state="readonly", width=48)
         type_cb.pack(pady=(2,12), fill="x")
 
+        common = self._common_entries(dlg.body, app)
+
         # Scroll frame for fields
         scroll_frame = tk.Frame(dlg.body, bg=PANEL)
         scroll_frame.pack(fill="both", expand=True)
@@ -450,6 +417,7 @@ class UI:
 
         type_cb.bind("<<ComboboxSelected>>", build_fields)
         build_fields()
+        self._live_validation(dlg, type_var, field_entries)
 
         def save():
             atype = type_var.get()
@@ -457,20 +425,93 @@ class UI:
             if not name:
                 messagebox.showerror("Erreur", "Nom requis.", parent=dlg)
                 return
-            new_app = {"type": atype, "name": name}
+            # Les clés propres à aucun type (réglages avancés) sont conservées
+            new_app = {k: v for k, v in app.items() if k not in TYPE_KEYS}
+            new_app.update({"type": atype, "name": name})
             for label, key, optional in TYPE_FIELDS.get(atype, []):
                 val = field_entries[key].get().strip()
                 new_app[key] = val
+            if not self._apply_common(new_app, common, dlg):
+                return
             cfg["apps"][idx] = new_app
             self.mgr.save()
-            self._show_config(config_name)
+            self._list_changed(config_name, idx, idx)
             dlg.destroy()
 
         btn(dlg.body, "Enregistrer", save, color=SUCCESS).pack(pady=(14,0), fill="x")
 
+    def _common_entries(self, parent, app=None):
+        """Champs communs à tous les types : dépendances et sonde de disponibilité"""
+        app = app or {}
+        entries = {}
+        for key, label, val in (
+                ("depends_on", "Dépend de (optionnel, séparés par des virgules) :",
+                 ", ".join(parse_depends(app.get("depends_on")))),
+                ("ready", "Prêt quand (optionnel — tcp:61616, http://…, log:<regex>, podman) :",
+                 format_spec(app.get("ready")))):
+            tk.Label(parent, text=label, bg=PANEL, fg=SUBTEXT,
+                     font=("Segoe UI", 9)).pack(anchor="w")
+            e = entry(parent, width=38)
+            e.insert(0, val)
+            e.pack(pady=(2,10), fill="x")
+            entries[key] = e
+        return entries
+
+    def _apply_common(self, app, entries, dlg):
+        deps = parse_depends(entries["depends_on"].get())
+        app.pop("depends_on", None)
+        if deps:
+            app["depends_on"] = deps
+        ready = entries["ready"].get().strip()
+        app.pop("ready", None)
+        if ready:
+            try:
+                app["ready"] = parse_spec(ready, app) if ready.startswith(("{", "[")) else ready
+                probe_specs(sample(app))
+            except (ValueError, KeyError) as ex:
+                messagebox.showerror("Erreur", f"Sonde invalide : {ex}", parent=dlg)
+                return False
+        return True
+
+    def _live_validation(self, dlg, type_var, field_entries):
+        """Valide l'app pendant la saisie, en tâche de fond, après chaque pause de frappe"""
+        status = tk.Label(dlg.body, text="", bg=PANEL, fg=SUBTEXT,
+                          font=("Segoe UI", 9), anchor="w")
+        status.pack(fill="x", pady=(8,0))
+        pending = [None]
+        seq = [0]
+
+        def check():
+            pending[0] = None
+            seq[0] += 1
+            mine = seq[0]
+            app = {"type": type_var.get()}
+            for key, e in field_entries.items():
+                app[key] = e.get().strip()
+
+            def show(err):
+                if mine != seq[0] or not status.winfo_exists():
+                    return   # résultat périmé ou dialogue fermé
+                status.config(text=f"⚠ {err}" if err else "✔ Paramètres valides",
+                              fg=DANGER if err else SUCCESS)
+            self._run_async(lambda: validate_app(app), show,
+                            on_error=lambda ex: show(f"validation impossible : {ex}"))
+
+        def schedule(*_):
+            if not dlg.winfo_exists():
+                return
+            if pending[0]:
+                dlg.after_cancel(pending[0])
+            pending[0] = dlg.after(VALIDATE_DELAY_MS, check)
+
+        dlg.bind("<KeyRelease>", schedule, add="+")
+        dlg.bind("<FocusIn>", schedule, add="+")
+        type_var.trace_add("write", schedule)
+        schedule()
+
     # ── Add app dialog ───────────────────────────────────────────────
     def _add_app_dlg(self, config_name):
-        dlg = Dlg(self.root, "Ajouter une application", 440, 420)
+        dlg = Dlg(self.root, "Ajouter une application", 440, 570)
 
         tk.Label(dlg.body, text="Nom :", bg=PANEL, fg=TEXT).pack(anchor="w")
         name_e = entry(dlg.body, width=38)
@@ -482,6 +523,8 @@ class UI:
                                textvariable=type_var, state="readonly", width=36)
         type_cb.pack(pady=(2,12), fill="x")
 
+        common = self._common_entries(dlg.body)
+
         fields_frame = tk.Frame(dlg.body, bg=PANEL)
         fields_frame.pack(fill="both", expand=True)
 
@@ -518,6 +561,7 @@ class UI:
 
         type_cb.bind("<<ComboboxSelected>>", build_fields)
         build_fields()
+        self._live_validation(dlg, type_var, field_entries)
 
         def add():
             atype = type_var.get()
@@ -532,166 +576,1028 @@ class UI:
                 if not optional and not val:
                     required_missing = True
                 app[key] = val
+            if not self._apply_common(app, common, dlg):
+                return
             if required_missing:
                 if not messagebox.askyesno("Champs manquants",
                                            "Certains champs requis sont vides. Continuer ?",
                                            parent=dlg):
                     return
             self.mgr.add_app(config_name, app)
-            self._show_config(config_name)
+            self._list_changed(config_name, len(self.mgr.get_config(config_name)["apps"]) - 1)
             dlg.destroy()
 
         btn(dlg.body, "Ajouter", add, color=ACCENT).pack(pady=(14,0), fill="x")
 
     # ── Launcher ─────────────────────────────────────────────────────
-    def _launch(self, config_name):
+    def _failed_apps(self, config_name, cfg):
+        """Apps en échec au dernier lancement, ou dont le processus s'est arrêté en erreur"""
+        names = set()
+        engine = self.last_runs.get(config_name)
+        if engine:
+            names |= {engine.graph.apps[i].get("name") for i, s in engine.status.items()
+                      if s in ("failed", "invalid", "skipped")}
+        for app in cfg["apps"]:
+            proc = self.sup.get(app.get("name"))
+            if proc is not None and proc.state == "failed":
+                names.add(app.get("name"))
+        return names
+
+    def _relaunch_failed(self, config_name):
+        cfg = self.mgr.get_config(config_name)
+        if not cfg:
+            return
+        names = self._failed_apps(config_name, cfg)
+        if not names:
+            messagebox.showinfo("Info", "Aucune application en échec.")
+            return
+        self._launch(config_name, only=names)
+
+    def _launch(self, config_name, only=None):
+        cfg = self.mgr.get_config(config_name)
+        if not cfg or not cfg["apps"]:
+            messagebox.showinfo("Info", "Aucune application à lancer.")
+            return
+        if self.daemon.available():
+            # Le démon supervise les apps : la CLI les voit aussi
+            self.mgr.flush()
+            self._remote(config_name, cfg, "launch", f"Lancement (démon) – {config_name}",
+                         only=sorted(only) if only else None)
+            return
+        try:
+            apps, ports = PORTS.resolve(config_name, cfg["apps"])
+            engine = LaunchEngine(apps, log=None,
+                                  max_parallel=cfg.get("max_parallel", MAX_PARALLEL),
+                                  supervisor=self.sup, podman=self.podman, only=only,
+                                  timeline=Timeline(config_name), runs_dir=RUNS_DIR,
+                                  admission=Admission.from_config(cfg),
+                                  builder=Builder.from_config(cfg), ports=ports)
+        except (GraphError, RuntimeError) as ex:
+            messagebox.showerror("Erreur", str(ex))
+            return
+
+        def checked(plan):
+            # Rapport unique avant de démarrer quoi que ce soit
+            report = plan.report()
+            if not report.ok and not messagebox.askyesno(
+                    "Pré-vérification", report.format() + "\n\nLancer quand même les autres apps ?"):
+                return
+            engine.plan, engine.report = plan, report
+            self.last_runs[config_name] = engine
+            self._start_launch(config_name, cfg, engine)
+        # Plan déjà compilé si ni la config ni les fichiers qu'elle cite n'ont changé
+        self._run_async(lambda: PLAN_CACHE.get(apps, timeline=engine.timeline), checked)
+
+    def _preview(self, config_name):
+        """Lancement à blanc : commandes, répertoires, dépendances et sondes, sans rien démarrer"""
         cfg = self.mgr.get_config(config_name)
         if not cfg or not cfg["apps"]:
             messagebox.showinfo("Info", "Aucune application à lancer.")
             return
 
-        log_win = Dlg(self.root, f"Lancement – {config_name}", 600, 400)
-        log = tk.Text(log_win.body, bg="#0a0d14", fg=TEXT, font=("Consolas",9),
-                      relief="flat", state="disabled")
-        log.pack(fill="both", expand=True)
+        def show(result):
+            if isinstance(result, Exception):
+                messagebox.showerror("Erreur", str(result))
+                return
+            plan, ports = result
+            dlg = Dlg(self.root, f"Aperçu – {config_name}", 720, 460)
+            text = tk.Text(dlg.body, bg="#0a0d14", fg=TEXT, font=("Consolas", 9), relief="flat",
+                           wrap="none")
+            if ports:
+                text.insert("end", "Ports : " + ", ".join(f"{n}={p}" for n, p in sorted(ports.items())) + "\n\n")
+            text.insert("end", plan.format())
+            text.config(state="disabled")
+            text.pack(fill="both", expand=True)
+            btn(dlg.body, "Fermer", dlg.destroy, color=BORDER, fg=TEXT).pack(side="right", pady=(10,0))
+
+        def compile_():
+            try:
+                apps, ports = PORTS.resolve(config_name, cfg["apps"])
+                return PLAN_CACHE.get(apps), ports
+            except (GraphError, RuntimeError) as ex:
+                return ex
+        self._run_async(compile_, show)
 
-        def write(msg):
-            log.config(state="normal")
-            log.insert("end", msg+"\n")
-            log.see("end")
-            log.config(state="disabled")
+    def _stop_all(self, config_name):
+        cfg = self.mgr.get_config(config_name)
+        if not cfg or not cfg["apps"]:
+            messagebox.showinfo("Info", "Aucune application à arrêter.")
+            return
+        if not messagebox.askyesno("Arrêter", f"Arrêter toutes les applications de « {config_name} » ?"):
+            return
+        if self.daemon.available():
+            self.mgr.flush()
+            self._remote(config_name, cfg, "stop", f"Arrêt (démon) – {config_name}")
+            return
+        # Les arrêts s'ajoutent à la timeline du dernier lancement de la config
+        last = self.last_runs.get(config_name)
+        try:
+            engine = StopEngine(cfg["apps"], log=None,
+                                max_parallel=cfg.get("max_parallel", MAX_PARALLEL),
+                                supervisor=self.sup, podman=self.podman,
+                                timeline=last.timeline if last else Timeline(config_name),
+                                runs_dir=RUNS_DIR)
+        except GraphError as ex:
+            messagebox.showerror("Erreur", str(ex))
+            return
+        self._start_launch(config_name, cfg, engine, title=f"Arrêt – {config_name}")
+
+    def _switch_to(self, config_name):
+        """Passe à cette config en ne touchant qu'aux apps qui diffèrent de ce qui tourne"""
+        cfg = self.mgr.get_config(config_name)
+        if not cfg:
+            return
+        state = RunningState(self.sup, self.podman)
+        self._run_async(lambda: plan_switch(self.mgr.data["configs"], config_name, state),
+                        lambda plan: self._confirm_switch(config_name, cfg, plan))
+
+    def _confirm_switch(self, config_name, cfg, plan):
+        dlg = Dlg(self.root, f"Basculer vers {config_name}", 560, 380)
+        text = tk.Text(dlg.body, bg="#0a0d14", fg=TEXT, font=("Consolas", 9), relief="flat",
+                       height=14, wrap="none")
+        text.insert("1.0", plan.format())
+        text.config(state="disabled")
+        text.pack(fill="both", expand=True)
+
+        def apply():
+            dlg.destroy()
+            try:
+                apps, ports = PORTS.resolve(config_name, cfg["apps"])
+                engine = SwitchEngine(plan, apps, log=None,
+                                      max_parallel=cfg.get("max_parallel", MAX_PARALLEL),
+                                      supervisor=self.sup, podman=self.podman,
+                                      timeline=Timeline(config_name), runs_dir=RUNS_DIR,
+                                      admission=Admission.from_config(cfg),
+                                      builder=Builder.from_config(cfg), ports=ports)
+            except (GraphError, RuntimeError) as ex:
+                messagebox.showerror("Erreur", str(ex))
+                return
+            self.last_runs[config_name] = engine.launcher
+            self._start_launch(config_name, cfg, engine, title=f"Bascule – {config_name}")
+
+        bar = tk.Frame(dlg.body, bg=PANEL)
+        bar.pack(fill="x", pady=(10,0))
+        if not plan.empty:
+            btn(bar, "Appliquer", apply, color=SUCCESS).pack(side="right")
+        btn(bar, "Fermer" if plan.empty else "Annuler", dlg.destroy,
+            color=BORDER, fg=TEXT).pack(side="right", padx=(0,8))
+
+    def _start_launch(self, config_name, cfg, engine, title=None):
+        log_win = Dlg(self.root, title or f"Lancement – {config_name}", 760, 480)
+        bar = tk.Frame(log_win.body, bg=PANEL)
+        bar.pack(fill="x", pady=(0,6))
+        btn(bar, "📊 Timeline", lambda: self._show_timeline(engine),
+            color=BORDER, fg=TEXT).pack(side="right")
+        btn(bar, "🔎 Rechercher", self._search_logs,
+            color=BORDER, fg=TEXT).pack(side="right", padx=(0,6))
+        view = LogView(log_win.body, max_lines=cfg.get("log_max_lines", LOG_MAX_LINES))
+        view.pack(fill="both", expand=True)
+        write = view.write
+        engine.log = write
+
+        for app in cfg["apps"]:
+            if app.get("type") == "Podman":
+                self.sampler.watch_container(app.get("name"), app.get("container","").strip())
+
+        # Sortie des processus de cette config
+        names = {a.get("name") for a in cfg["apps"]}
+        def on_line(proc, stream, text):
+            if proc.name in names:
+                write(f"  [{proc.name}] {text}", proc.name)
+        self.sup.listeners.append(on_line)
+
+        def on_close(e):
+            if e.widget is log_win and on_line in self.sup.listeners:
+                self.sup.listeners.remove(on_line)
+        log_win.bind("<Destroy>", on_close)
 
         def run():
-            import time
-            for app in cfg["apps"]:
-                atype = app.get("type","")
-                name  = app.get("name","?")
-                write(f"▶ {name} [{atype}]…")
-                try:
-                    # Validation des paramètres
-                    validation_error = self._validate_app(app)
-                    if validation_error:
-                        write(f"  ⚠ {validation_error}")
-                        continue
-                    
-                    if atype == "Timer":
-                        # Handle Timer type
-                        seconds = int(app.get("seconds","0"))
-                        write(f"  ⏱️ Attente de {seconds} seconde(s)...")
-                        for i in range(seconds):
-                            time.sleep(1)
-                            remaining = seconds - i - 1
-                            if remaining > 0:
-                                write(f"  {remaining}s...")
-                        write(f"  ✅ Délai écoulé - passage à l'app suivante")
-                    else:
-                        cmd = self._build_cmd(app)
-                        if not cmd:
-                            write(f"  ⚠ Type inconnu, ignoré.")
-                            continue
-                        write(f"  $ {cmd}")
-                        # Launch in separate terminal window
-                        full_cmd = f'start "App Launcher - {name}" cmd /k "{cmd}"'
-                        subprocess.Popen(full_cmd, shell=True)
-                        write(f"  ✅ Lancé dans un nouveau terminal")
-                except Exception as ex:
-                    write(f"  ❌ Erreur : {ex}")
+            engine.run()
             write("\n— Terminé —")
 
         threading.Thread(target=run, daemon=True).start()
 
-    def _validate_app(self, app):
-        """Valide les paramètres d'une application avant lancement"""
-        atype = app.get("type","")
-        
-        if atype == "Spring Boot":
-            jar = app.get("jar","").strip()
-            if not jar:
-                return "Chemin du JAR non spécifié"
-            if not os.path.exists(jar):
-                return f"Fichier JAR introuvable : {jar}"
-            return None
-            
-        elif atype == "ActiveMQ":
-            home = app.get("home","").strip()
-            if not home:
-                return "Home path non spécifié"
-            activemq_bin = os.path.join(home, "bin", "activemq.bat")
-            if not os.path.exists(activemq_bin):
-                return f"ActiveMQ introuvable : {activemq_bin}"
-            return None
-            
-        elif atype == "Elasticsearch":
-            home = app.get("home","").strip()
-            if not home:
-                return "Home path non spécifié"
-            es_bin = os.path.join(home, "bin", "elasticsearch.bat")
-            if not os.path.exists(es_bin):
-                return f"Elasticsearch introuvable : {es_bin}"
-            return None
-            
-        elif atype == "Podman":
-            container = app.get("container","").strip()
-            if not container:
-                return "Nom du container non spécifié"
-            return None
-            
-        elif atype == "Podman Machine":
-            # Pas de validation requise
-            return None
-            
-        elif atype == "Docker Compose":
-            directory = app.get("directory","").strip()
-            if not directory:
-                return "Répertoire projet non spécifié"
-            if not os.path.exists(directory):
-                return f"Répertoire introuvable : {directory}"
-            compose_file = app.get("compose_file","docker-compose.yaml").strip()
-            if not compose_file:
-                compose_file = "docker-compose.yaml"
-            compose_path = os.path.join(directory, compose_file)
-            if not os.path.exists(compose_path):
-                return f"Fichier Docker Compose introuvable : {compose_path}"
-            return None
-            
-        elif atype == "Timer":
-            seconds = app.get("seconds","").strip()
-            if not seconds:
-                return "Nombre de secondes non spécifié"
+    def _watch_config(self, config_name):
+        """Relance les apps dont le jar, le fichier compose ou la configuration change.
+
+        La surveillance dure tant que sa fenêtre est ouverte ; les relances
+        passent par le démon s'il tourne et s'exécutent dans self.pool, leur
+        journal passant par la file du LogView. Les apps surveillées suivent
+        les modifications de la config (_list_changed).
+        """
+        if config_name in self.watchers:
+            self.watchers[config_name][1].lift()
+            return
+        cfg = self.mgr.get_config(config_name)
+        if not cfg:
+            return
+        win = Dlg(self.root, f"Surveillance – {config_name}", 760, 480)
+        win.grab_release()   # reste ouverte pendant qu'on travaille ailleurs
+        view = LogView(win.body, max_lines=cfg.get("log_max_lines", LOG_MAX_LINES))
+        view.pack(fill="both", expand=True)
+        write = view.write
+
+        def restart(names):
+            write(f"\n— Modifié : {', '.join(sorted(names))} —")
+            if self.daemon.available():
+                try:
+                    self.mgr.flush()   # le démon relit le fichier de configs
+                    self.daemon.call("restart", write, config=config_name, apps=sorted(names))
+                except (OSError, DaemonError) as ex:
+                    write(f"❌ Démon : {ex}")
+                return
+            cfg = self.mgr.get_config(config_name)
+            if cfg is None:
+                write("❌ Config supprimée")
+                return
             try:
-                int(seconds)
-            except ValueError:
-                return f"Nombre de secondes invalide : {seconds}"
-            return None
-            
-        return None
+                apps, ports = PORTS.resolve(config_name, cfg["apps"])
+                engine = RestartEngine(apps, names, write,
+                                       max_parallel=cfg.get("max_parallel", MAX_PARALLEL),
+                                       supervisor=self.sup, podman=self.podman,
+                                       timeline=Timeline(config_name), runs_dir=RUNS_DIR,
+                                       admission=Admission.from_config(cfg),
+                                       builder=Builder.from_config(cfg), ports=ports)
+            except (GraphError, RuntimeError) as ex:
+                write(f"❌ {ex}")
+                return
+            self.last_runs[config_name] = engine.launcher
+            try:
+                engine.run()
+            except Exception as ex:
+                write(f"❌ Relance interrompue : {ex}")
+
+        watcher = Watcher(cfg["apps"], lambda names: self.pool.submit(restart, names))
+        if not watcher.paths:
+            win.destroy()
+            messagebox.showinfo("Surveillance", "Rien à surveiller : aucun jar, fichier compose "
+                                                "ou dossier de configuration.")
+            return
+        def on_line(proc, stream, text):
+            if proc.name in watcher.names:
+                write(f"  [{proc.name}] {text}", proc.name)
+        self.sup.listeners.append(on_line)
+
+        def on_close(e):
+            if e.widget is win:
+                watcher.stop()
+                self.watchers.pop(config_name, None)
+                if on_line in self.sup.listeners:
+                    self.sup.listeners.remove(on_line)
+        win.bind("<Destroy>", on_close)
+        self.watchers[config_name] = (watcher, win)
+        write(f"👁 Surveillance de {len(watcher.paths)} chemin(s) ({watcher.mode}) :")
+        for path, apps in sorted(watcher.paths.items()):
+            write(f"  {path} → {', '.join(sorted(apps))}")
+        watcher.start()
+
+    def _remote(self, config_name, cfg, cmd, title, **args):
+        """Commande exécutée par le démon, son journal affiché comme un lancement local"""
+        log_win = Dlg(self.root, title, 760, 480)
+        view = LogView(log_win.body, max_lines=cfg.get("log_max_lines", LOG_MAX_LINES))
+        view.pack(fill="both", expand=True)
+
+        def run():
+            try:
+                self.daemon.call(cmd, view.write, config=config_name, **args)
+            except (OSError, DaemonError) as ex:
+                view.write(f"❌ Démon : {ex}")
+            view.write("\n— Terminé —")
+
+        threading.Thread(target=run, daemon=True).start()
 
-    def _build_cmd(self, app):
-        t = app.get("type","")
-        if t == "Spring Boot":
-            jar = app.get("jar","")
-            rc  = app.get("run_config","").strip()
-            return f'java -jar "{jar}" {rc}'.strip()
-        elif t == "ActiveMQ":
-            home = app.get("home","")
-            return f'"{home}/bin/activemq" start'
-        elif t == "Elasticsearch":
-            home = app.get("home","")
-            return f'"{home}/bin/elasticsearch"'
-        elif t == "Podman":
-            return f'podman start {app.get("container","")}'
-        elif t == "Podman Machine":
-            return f'podman machine start'
-        elif t == "Docker Compose":
-            directory = app.get("directory","")
-            compose_file = app.get("compose_file","docker-compose.yaml").strip()
-            if not compose_file:
-                compose_file = "docker-compose.yaml"
-            if directory:
-                return f'cd /d "{directory}" && podman compose -f {compose_file} up -d'
+    def _show_timeline(self, engine):
+        tl = engine.timeline
+        dlg = Dlg(self.root, f"Timeline – {tl.label}", 860, 420)
+        times = getattr(engine, "times", {})   # StopEngine : pas de chemin critique
+        critical = {engine.graph.apps[i].get("name") for i in engine.graph.critical_path(times)}
+        GanttView(dlg.body, tl, critical).pack(fill="both", expand=True)
+
+        def export(kind):
+            ext, title = (".json", "Chrome Trace") if kind == "chrome" else (".csv", "CSV")
+            path = filedialog.asksaveasfilename(parent=dlg, defaultextension=ext,
+                                                initialfile=f"{tl.label or 'timeline'}{ext}",
+                                                filetypes=[(title, f"*{ext}")])
+            if not path:
+                return
+            try:
+                (tl.write_chrome if kind == "chrome" else tl.write_csv)(path)
+            except OSError as ex:
+                messagebox.showerror("Erreur", str(ex), parent=dlg)
+
+        bar = tk.Frame(dlg.body, bg=PANEL)
+        bar.pack(fill="x", pady=(8,0))
+        btn(bar, "Exporter (Chrome Trace)", lambda: export("chrome"), color=ACCENT).pack(side="left")
+        btn(bar, "Exporter (CSV)", lambda: export("csv"), color=BORDER, fg=TEXT).pack(side="left", padx=6)
+
+    def _export_resources(self):
+        if not self.sampler.series:
+            messagebox.showinfo("Info", "Aucun relevé pour l'instant : lancez d'abord des applications.")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".csv", initialfile="ressources.csv",
+                                            filetypes=[("CSV", "*.csv")])
+        if path:
+            try:
+                self.sampler.write_csv(path)
+            except OSError as ex:
+                messagebox.showerror("Erreur", str(ex))
+
+    # ── Processus supervisés ─────────────────────────────────────────
+    def _show_processes(self):
+        dlg = Dlg(self.root, "Processus", 640, 360)
+        cols = ("name", "pid", "state", "exit", "uptime")
+        tree = ttk.Treeview(dlg.body, columns=cols, show="headings")
+        for c, title, w in zip(cols, ("App", "PID", "État", "Code", "Durée"),
+                               (200, 80, 100, 60, 100)):
+            tree.heading(c, text=title)
+            tree.column(c, width=w, anchor="w")
+        tree.pack(fill="both", expand=True)
+
+        def refresh():
+            if not tree.winfo_exists():
+                return
+            tree.delete(*tree.get_children())
+            for p in self.sup.status():
+                tree.insert("", "end", values=(
+                    p["name"], p["pid"] or "", p["state"],
+                    "" if p["exit_code"] is None else p["exit_code"],
+                    f"{int(p['uptime'])}s"))
+            dlg.after(1000, refresh)
+        refresh()
+
+    # ── Recherche dans les logs ──────────────────────────────────────
+    def _search_logs(self):
+        dlg = Dlg(self.root, "Recherche dans les logs", 900, 560)
+        bar = tk.Frame(dlg.body, bg=PANEL)
+        bar.pack(fill="x", pady=(0,6))
+        query = entry(bar, width=60)
+        query.pack(side="left", fill="x", expand=True, ipady=4)
+        info = tk.Label(dlg.body, bg=PANEL, fg=SUBTEXT, font=("Segoe UI", 8), anchor="w",
+                        text='ex. : ERROR app=amq last 5 min · "connection refused" level>=warn -debug')
+        info.pack(fill="x")
+
+        cols = ("time", "app", "level", "text")
+        tree = ttk.Treeview(dlg.body, columns=cols, show="headings", height=10)
+        for c, title, w in zip(cols, ("Heure", "App", "Niveau", "Ligne"), (90, 120, 60, 600)):
+            tree.heading(c, text=title)
+            tree.column(c, width=w, anchor="w", stretch=(c == "text"))
+        tree.pack(fill="both", expand=True, pady=(6,6))
+        ctx = tk.Text(dlg.body, bg="#0a0d14", fg=TEXT, font=("Consolas", 9), relief="flat",
+                      height=12, wrap="none", state="disabled")
+        ctx.tag_configure("hit", background="#3b2f0b", foreground="#fde68a")
+        ctx.pack(fill="both", expand=True)
+        hits = {}
+
+        def show(results, elapsed):
+            tree.delete(*tree.get_children())
+            hits.clear()
+            for h in results:
+                item = tree.insert("", "end", values=(
+                    time.strftime("%H:%M:%S", time.localtime(h.ts)), h.app, h.level, h.text[:300]))
+                hits[item] = h
+            info.config(text=f"{len(results)} résultat(s) en {elapsed * 1000:.0f} ms"
+                             f" — {self.log_index.lines} lignes indexées")
+
+        def run(e=None):
+            text = query.get().strip()
+            if not text:
+                return
+
+            def search():
+                t0 = time.perf_counter()
+                try:
+                    return self.log_index.search(text), time.perf_counter() - t0
+                except ValueError as ex:
+                    return ex, 0.0
+
+            def done(result):
+                if not dlg.winfo_exists():
+                    return
+                if isinstance(result[0], ValueError):
+                    info.config(text=f"⚠ {result[0]}")
+                else:
+                    show(*result)
+            self._run_async(search, done)
+
+        def context(e=None):
+            sel = tree.selection()
+            if not sel or sel[0] not in hits:
+                return
+            lines = self.log_index.context(hits[sel[0]].seq)
+            ctx.config(state="normal")
+            ctx.delete("1.0", "end")
+            for n, (h, is_hit) in enumerate(lines, 1):
+                ctx.insert("end", f"{time.strftime('%H:%M:%S', time.localtime(h.ts))}  {h.text}\n",
+                           "hit" if is_hit else ())
+                if is_hit:
+                    ctx.see(f"{n}.0")
+            ctx.config(state="disabled")
+
+        query.bind("<Return>", run)
+        tree.bind("<<TreeviewSelect>>", context)
+        btn(bar, "Rechercher", run, color=ACCENT).pack(side="left", padx=(8,0))
+        query.focus_set()
+
+    # ── Fichiers de log d'une app ────────────────────────────────────
+    def _view_log_files(self, config_name, idx):
+        app = self.mgr.get_config(config_name)["apps"][idx]
+        name = app.get("name", "?")
+        files = log_files(app, extra=[self.sup.log_path(name)])
+        if not files:
+            messagebox.showinfo("Logs", f"Aucun fichier de log trouvé pour {name}.")
+            return
+        dlg = Dlg(self.root, f"Logs — {name}", 1000, 620)
+        dlg.resizable(True, True)
+        view = LogFileView(dlg.body, files)
+        view.pack(fill="both", expand=True)
+
+# ─── LISTE D'APPS VIRTUALISÉE ────────────────────────────────────────
+def app_summary(app, limit=180):
+    """Résumé des champs d'une app sur une ligne, pour sa carte"""
+    parts = []
+    for key, val in app.items():
+        if key in ("name","type"):
+            continue
+        if key == "ready":
+            val = format_spec(val)
+        elif isinstance(val, list):
+            val = ", ".join(map(str, val))
+        if val:
+            parts.append(f"{key.replace('_',' ').title()}: {val}")
+    text = "   ·   ".join(parts)
+    return text if len(text) <= limit else text[:limit-1] + "…"
+
+class AppCard(tk.Frame):
+    """Carte d'app réutilisable : show() change l'app affichée sans recréer de widgets"""
+    def __init__(self, parent, on_edit, on_delete, on_logs):
+        super().__init__(parent, bg=PANEL, bd=1, relief="solid")
+        self.idx = None
+        self.stale = True
+        self.item = None
+
+        self.handle = tk.Label(self, text="⋮⋮", bg=ACCENT, fg="white",
+                               font=("Segoe UI", 10), width=3, cursor="hand2")
+        self.handle.grid(row=0, column=0, rowspan=3, sticky="ns", padx=(4,8), pady=8)
+
+        res = tk.Frame(self, bg=PANEL)
+        res.grid(row=0, column=2, rowspan=3, sticky="ns", pady=8)
+        self.spark = tk.Canvas(res, bg=PANEL, width=SPARK_W, height=SPARK_H, highlightthickness=0)
+        self.spark.pack()
+        self.spark_rss = self.spark.create_line(0, 0, 0, 0, fill=ACCENT, width=1, state="hidden")
+        self.spark_cpu = self.spark.create_line(0, 0, 0, 0, fill=SUCCESS, width=1, state="hidden")
+        self.res_label = tk.Label(res, bg=PANEL, fg=SUBTEXT, font=("Segoe UI", 8))
+        self.res_label.pack()
+        self.restart_label = tk.Label(res, bg=PANEL, fg=SUBTEXT, font=("Segoe UI", 8))
+        self.restart_label.pack()
+
+        btn_frame = tk.Frame(self, bg=PANEL)
+        btn_frame.grid(row=0, column=3, rowspan=3, sticky="ns", padx=8, pady=4)
+        btn(btn_frame, "✎", lambda: on_edit(self.idx), color=ACCENT).grid(row=0, column=0, padx=2, pady=2)
+        btn(btn_frame, "📄", lambda: on_logs(self.idx), color=BORDER, fg=TEXT).grid(row=0, column=1, padx=2, pady=2)
+        btn(btn_frame, "✕", lambda: on_delete(self.idx), color=DANGER).grid(row=1, column=0, padx=2, pady=2)
+
+        self.title = tk.Label(self, bg=PANEL, fg=TEXT, font=("Segoe UI", 11, "bold"), anchor="w")
+        self.title.grid(row=0, column=1, sticky="ew", pady=(8,0))
+        self.type_label = tk.Label(self, bg=PANEL, fg=ACCENT, font=("Segoe UI", 9), anchor="w")
+        self.type_label.grid(row=1, column=1, sticky="ew")
+        self.fields = tk.Label(self, bg=PANEL, fg=SUBTEXT, font=("Segoe UI", 8),
+                               anchor="w", justify="left")
+        self.fields.grid(row=2, column=1, sticky="ew", pady=(0,8))
+        self.columnconfigure(1, weight=1)
+
+    def show(self, idx, app):
+        self.idx = idx
+        self.stale = False
+        icon = TYPE_ICON.get(app.get("type",""), "⚙️")
+        self.title.config(text=f"{icon}  {app.get('name','?')}")
+        self.type_label.config(text=app.get("type",""))
+        self.fields.config(text=app_summary(app))
+
+    def show_resources(self, series):
+        """Mini-graphe RSS (bleu) et CPU (vert) des derniers relevés de l'app"""
+        if series is None or len(series) < 2:
+            self.spark.itemconfigure(self.spark_rss, state="hidden")
+            self.spark.itemconfigure(self.spark_cpu, state="hidden")
+            self.res_label.config(text="")
+            return
+        for item, values in ((self.spark_rss, series.values("rss", SPARK_POINTS)),
+                             (self.spark_cpu, series.values("cpu", SPARK_POINTS))):
+            top = max(values) or 1.0
+            step = SPARK_W / (SPARK_POINTS - 1)
+            x0 = SPARK_W - step * (len(values) - 1)
+            coords = []
+            for k, v in enumerate(values):
+                coords += (x0 + k * step, SPARK_H - 1 - v / top * (SPARK_H - 2))
+            self.spark.coords(item, *coords)
+            self.spark.itemconfigure(item, state="normal")
+        _, cpu, rss = series.latest()
+        self.res_label.config(text=f"CPU {cpu:.0f}% · {rss:.0f} Mo")
+
+    def show_restart(self, restart):
+        """État du redémarrage automatique (Supervisor.restart_state), crash-loop en rouge"""
+        state, detail, next_at = restart or (None, "", None)
+        if state == "crashloop":
+            text, color = "⛔ crash-loop", DANGER
+        elif state == "backoff":
+            text, color = f"⟳ {detail} dans {max(0, next_at - time.time()):.0f}s", "#f59e0b"
+        elif state == "waiting_deps":
+            text, color = "⏳ attend ses dépendances", "#f59e0b"
+        else:
+            text, color = "", SUBTEXT
+        self.restart_label.config(text=text, fg=color)
+        self.handle.config(bg=DANGER if state == "crashloop" else ACCENT)
+
+    def highlight(self, on):
+        self.config(bg="#2d3a5a" if on else PANEL, bd=2 if on else 1)
+
+class AppList(tk.Frame):
+    """Liste des apps d'une config qui ne crée des cartes que pour les lignes visibles.
+
+    Les cartes sorties de la zone visible retournent dans un pool et sont
+    réutilisées au défilement. Après une modification, changed(lo, hi) ne
+    redessine que les lignes visibles concernées.
+    """
+    def __init__(self, parent, apps, on_edit, on_delete, on_move, on_logs=None, sampler=None):
+        super().__init__(parent, bg=BG)
+        self.apps = apps
+        self.sampler = sampler
+        self.on_edit = on_edit
+        self.on_delete = on_delete
+        self.on_logs = on_logs or (lambda i: None)
+        self.on_move = on_move
+        self.cards = {}     # index -> carte affichée
+        self.pool = []      # cartes libres
+        self._width = 1
+        self._pending = False
+
+        self.canvas = tk.Canvas(self, bg=BG, highlightthickness=0, yscrollincrement=ROW_H // 4)
+        self.sb = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_scroll)
+        self.sb.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self._empty = self.canvas.create_text(
+            12, 20, anchor="nw", fill=SUBTEXT, font=("Segoe UI", 10),
+            text="Aucune application. Cliquez sur « + Ajouter app ».")
+        self.canvas.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self.canvas)
+        self._layout()
+        if sampler is not None:
+            self.after(int(sampler.interval * 1000), self._tick_resources)
+
+    # ── Rendu ────────────────────────────────────────────────────────
+    def changed(self, lo=0, hi=None):
+        """Les apps d'index lo..hi (jusqu'à la fin si hi est None) ont changé"""
+        for idx, card in self.cards.items():
+            if idx >= lo and (hi is None or idx <= hi):
+                card.stale = True
+        self._layout()
+        self._schedule()
+
+    def _layout(self):
+        n = len(self.apps)
+        self.canvas.configure(scrollregion=(0, 0, self._width, max(n * ROW_H, 1)))
+        self.canvas.itemconfigure(self._empty, state="hidden" if n else "normal")
+
+    def _schedule(self):
+        if not self._pending:
+            self._pending = True
+            self.after_idle(self._render)
+
+    def _render(self):
+        self._pending = False
+        if not self.winfo_exists():
+            return
+        n = len(self.apps)
+        top = self.canvas.canvasy(0)
+        first = max(0, int(top // ROW_H) - OVERSCAN)
+        last = min(n, int((top + self.canvas.winfo_height()) // ROW_H) + 1 + OVERSCAN)
+        for idx in [i for i in self.cards if not first <= i < last]:
+            card = self.cards.pop(idx)
+            self.canvas.itemconfigure(card.item, state="hidden")
+            self.pool.append(card)
+        for idx in range(first, last):
+            card = self.cards.get(idx)
+            if card is None:
+                card = self.pool.pop() if self.pool else self._new_card()
+                self.cards[idx] = card
+                self.canvas.coords(card.item, 0, idx * ROW_H + 4)
+                self.canvas.itemconfigure(card.item, state="normal")
+                card.stale = True
+            if card.stale:
+                card.show(idx, self.apps[idx])
+                self._show_resources(card)
+
+    def _show_resources(self, card):
+        if self.sampler is not None and card.idx is not None and card.idx < len(self.apps):
+            name = self.apps[card.idx].get("name")
+            card.show_resources(self.sampler.series.get(name))
+            card.show_restart(self.sampler.supervisor.restart_state(name))
+
+    def _tick_resources(self):
+        """Met à jour mini-graphes et état de redémarrage des cartes visibles au rythme des relevés"""
+        if not self.winfo_exists():
+            return
+        for card in self.cards.values():
+            self._show_resources(card)
+        self.after(int(self.sampler.interval * 1000), self._tick_resources)
+
+    def _new_card(self):
+        card = AppCard(self.canvas, self.on_edit, self.on_delete, self.on_logs)
+        card.item = self.canvas.create_window(0, 0, window=card, anchor="nw",
+                                              width=self._width, height=ROW_H - 8)
+        card.handle.bind("<Button-1>", lambda e: card.highlight(True))
+        card.handle.bind("<ButtonRelease-1>", lambda e: self._drop(card, e))
+        self._bind_wheel(card)
+        return card
+
+    # ── Événements ───────────────────────────────────────────────────
+    def _on_scroll(self, first, last):
+        self.sb.set(first, last)
+        self._schedule()
+
+    def _on_resize(self, e):
+        self._width = e.width
+        for card in list(self.cards.values()) + self.pool:
+            self.canvas.itemconfigure(card.item, width=e.width)
+        self._layout()
+        self._schedule()
+
+    def _bind_wheel(self, widget):
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            widget.bind(seq, self._on_wheel, add="+")
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
+
+    def _on_wheel(self, e):
+        up = e.num == 4 or getattr(e, "delta", 0) > 0
+        self.canvas.yview_scroll(-2 if up else 2, "units")
+
+    def _drop(self, card, e):
+        """Fin de glisser-déposer : la ligne sous le pointeur donne la position cible"""
+        card.highlight(False)
+        y = self.canvas.canvasy(e.y_root - self.canvas.winfo_rooty())
+        target = min(max(int(y // ROW_H), 0), len(self.apps) - 1)
+        if card.idx is not None and target != card.idx:
+            self.on_move(card.idx, target)
+
+# ─── JOURNAL DE LANCEMENT ────────────────────────────────────────────
+class LogView(tk.Frame):
+    """Journal avec un onglet « Tout » et un onglet par app.
+
+    write() peut être appelé depuis n'importe quel thread : il ne touche pas
+    à Tk. Le thread Tk vide la file toutes les LOG_TICK_MS et insère chaque
+    lot en une fois ; au-delà de max_lines les plus anciennes lignes partent.
+    """
+    def __init__(self, parent, max_lines=LOG_MAX_LINES, tick_ms=LOG_TICK_MS):
+        super().__init__(parent, bg=PANEL)
+        self.queue = LogQueue()
+        self.max_lines = max_lines
+        self.tick_ms = tick_ms
+        self.rendered = 0
+        self.tabs = {}
+        self._filter = ""
+
+        bar = tk.Frame(self, bg=PANEL)
+        bar.pack(fill="x", pady=(0,6))
+        tk.Label(bar, text="Filtre :", bg=PANEL, fg=SUBTEXT,
+                 font=("Segoe UI", 9)).pack(side="left")
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add("write", lambda *_: self._apply_filter())
+        entry(bar, width=30, textvariable=self.filter_var).pack(side="left", padx=6)
+
+        self.nb = ttk.Notebook(self)
+        self.nb.pack(fill="both", expand=True)
+        self._tab(None, "Tout")
+        self.after(self.tick_ms, self._drain)
+
+    def write(self, msg, app=None):
+        self.queue.push(app, msg)
+
+    def _tab(self, key, title):
+        frame = tk.Frame(self.nb, bg=PANEL)
+        text = tk.Text(frame, bg="#0a0d14", fg=TEXT, font=("Consolas",9),
+                       relief="flat", state="disabled", wrap="none")
+        sb = ttk.Scrollbar(frame, orient="vertical", command=text.yview)
+        text.configure(yscrollcommand=sb.set)
+        sb.pack(side="right", fill="y")
+        text.pack(side="left", fill="both", expand=True)
+        self.nb.add(frame, text=title)
+        tab = self.tabs[key] = {"text": text, "lines": collections.deque(maxlen=self.max_lines), "count": 0}
+        return tab
+
+    def _drain(self):
+        if not self.winfo_exists():
+            return
+        batch = self.queue.drain(LOG_BATCH)
+        if batch:
+            groups = {None: []}
+            for app, msg in batch:
+                lines = msg.split("\n")
+                groups[None].extend(lines)
+                if app:
+                    groups.setdefault(app, []).extend(lines)
+            for key, lines in groups.items():
+                self._append(self.tabs.get(key) or self._tab(key, key), lines)
+            self.rendered += len(batch)
+        self.after(1 if len(self.queue) else self.tick_ms, self._drain)
+
+    def _append(self, tab, lines):
+        tab["lines"].extend(lines)
+        if self._filter:
+            lines = [l for l in lines if self._filter in l.lower()]
+        if lines:
+            self._insert(tab, lines)
+
+    def _insert(self, tab, lines):
+        text = tab["text"]
+        follow = text.yview()[1] >= 0.999
+        text.config(state="normal")
+        text.insert("end", "\n".join(lines) + "\n")
+        tab["count"] += len(lines)
+        excess = tab["count"] - self.max_lines
+        if excess > 0:
+            text.delete("1.0", f"{excess + 1}.0")
+            tab["count"] -= excess
+        text.config(state="disabled")
+        if follow:
+            text.see("end")
+
+    def _apply_filter(self):
+        self._filter = self.filter_var.get().strip().lower()
+        for tab in self.tabs.values():
+            text = tab["text"]
+            text.config(state="normal")
+            text.delete("1.0", "end")
+            text.config(state="disabled")
+            tab["count"] = 0
+            lines = [l for l in tab["lines"] if self._filter in l.lower()] if self._filter else list(tab["lines"])
+            if lines:
+                self._insert(tab, lines)
+
+# ─── FICHIERS DE LOG ─────────────────────────────────────────────────
+class LogFileView(tk.Frame):
+    """Visionneuse d'un fichier de log de taille quelconque (LogFile, mmap).
+
+    Seules les lignes visibles sont lues et insérées : la position est un
+    offset dans le fichier, la barre de défilement est proportionnelle aux
+    octets. L'index des lignes se construit dans un thread ; « Aller à »
+    accepte un numéro de ligne ou une heure (2026-01-01 12:00[:00] ou 12:00).
+    """
+    def __init__(self, parent, files):
+        super().__init__(parent, bg=PANEL)
+        self.lf = None
+        self.top = 0          # offset de la première ligne affichée
+        self.bottom = 0       # offset qui suit la dernière ligne affichée
+        self.mark = None      # offset de la ligne à surligner
+        self._stop = threading.Event()
+        self.line_h = tkfont.Font(font=("Consolas", 9)).metrics("linespace")
+
+        bar = tk.Frame(self, bg=PANEL)
+        bar.pack(fill="x", pady=(0,6))
+        self.file_var = tk.StringVar(value=files[0])
+        pick = ttk.Combobox(bar, textvariable=self.file_var, values=files, state="readonly", width=60)
+        pick.pack(side="left")
+        pick.bind("<<ComboboxSelected>>", lambda e: self.open(self.file_var.get()))
+        self.goto = entry(bar, width=20)
+        self.goto.pack(side="left", padx=(12,4), ipady=3)
+        self.goto.bind("<Return>", lambda e: self._jump())
+        btn(bar, "Aller à", self._jump, color=ACCENT).pack(side="left")
+        self.follow = tk.BooleanVar(value=True)
+        tk.Checkbutton(bar, text="Suivre", variable=self.follow, bg=PANEL, fg=TEXT, selectcolor=BG,
+                       activebackground=PANEL, activeforeground=TEXT,
+                       command=lambda: self.follow.get() and self._to_end()).pack(side="left", padx=8)
+
+        body = tk.Frame(self, bg=PANEL)
+        body.pack(fill="both", expand=True)
+        self.text = tk.Text(body, bg="#0a0d14", fg=TEXT, font=("Consolas", 9), relief="flat",
+                            wrap="none", state="disabled")
+        self.text.tag_configure("num", foreground=SUBTEXT)
+        self.text.tag_configure("hit", background="#3b2f0b", foreground="#fde68a")
+        self.sb = ttk.Scrollbar(body, orient="vertical", command=self._yview)
+        xsb = ttk.Scrollbar(self, orient="horizontal", command=self.text.xview)
+        self.text.configure(xscrollcommand=xsb.set)
+        self.sb.pack(side="right", fill="y")
+        self.text.pack(side="left", fill="both", expand=True)
+        xsb.pack(fill="x")
+        self.info = tk.Label(self, bg=PANEL, fg=SUBTEXT, font=("Segoe UI", 8), anchor="w")
+        self.info.pack(fill="x")
+
+        self.text.bind("<Configure>", lambda e: self._render())
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.text.bind(seq, self._on_wheel)
+        self.text.bind("<Prior>", lambda e: self._yview("scroll", -1, "pages"))
+        self.text.bind("<Next>", lambda e: self._yview("scroll", 1, "pages"))
+        self.text.bind("<Control-Home>", lambda e: self._yview("moveto", 0))
+        self.text.bind("<Control-End>", lambda e: self._to_end())
+        self.bind("<Destroy>", self._on_destroy)
+        self.open(files[0])
+        self.after(LOGFILE_TICK_MS, self._tick)
+
+    # ── Fichier ──────────────────────────────────────────────────────
+    def open(self, path):
+        self._close()
+        try:
+            self.lf = LogFile(path)
+        except OSError as ex:
+            self.info.config(text=f"⚠ {ex}")
+            return
+        self._stop = threading.Event()
+        threading.Thread(target=self.lf.index_all, args=(self._stop,), daemon=True).start()
+        self.mark = None
+        self._to_end()
+
+    def _close(self):
+        self._stop.set()
+        if self.lf is not None:
+            self.lf.close()
+            self.lf = None
+
+    def _on_destroy(self, e):
+        if e.widget is self:
+            self._close()
+
+    def _tick(self):
+        if not self.winfo_exists():
+            return
+        if self.lf is not None:
+            change = self.lf.refresh()
+            if change == "reset":
+                threading.Thread(target=self.lf.index_all, args=(self._stop,), daemon=True).start()
+                self.top = 0
+            if change and self.follow.get():
+                self._to_end()
             else:
-                return f'podman compose -f {compose_file} up -d'
-        return None
+                self._status()
+        self.after(LOGFILE_TICK_MS, self._tick)
+
+    # ── Affichage ────────────────────────────────────────────────────
+    def _rows(self):
+        return max(1, self.text.winfo_height() // self.line_h)
+
+    def _render(self):
+        lf = self.lf
+        if lf is None:
+            return
+        lines = lf.read(self.top, self._rows())
+        first = lf.line_at(self.top)
+        width = len(str(max(lf.lines, 1)))
+        t = self.text
+        t.config(state="normal")
+        t.delete("1.0", "end")
+        for k, (offset, line) in enumerate(lines):
+            num = f"{first + k + 1:>{width}}  " if first is not None else " " * (width + 2)
+            t.insert("end", num, "num")
+            t.insert("end", line + "\n", "hit" if offset == self.mark else ())
+        t.config(state="disabled")
+        self.bottom = lf.next_line(lines[-1][0]) if lines else self.top
+        size = lf.size or 1
+        self.sb.set(self.top / size, self.bottom / size)
+        self._status()
+
+    def _status(self):
+        lf = self.lf
+        if lf is None:
+            return
+        mb = lf.size / 1024**2
+        if lf.progress < 1:
+            self.info.config(text=f"{mb:,.1f} Mo — indexation des lignes {lf.progress:.0%}")
+        else:
+            self.info.config(text=f"{mb:,.1f} Mo — {lf.lines:,} lignes")
+
+    def _to_end(self):
+        if self.lf is not None:
+            self.top = self.lf.tail_offset(self._rows())
+            self._render()
+
+    # ── Défilement ───────────────────────────────────────────────────
+    def _move(self, lines):
+        lf = self.lf
+        step = lf.next_line if lines > 0 else lf.prev_line
+        for _ in range(abs(lines)):
+            pos = step(self.top)
+            if pos >= lf.size or pos == self.top:
+                break
+            self.top = pos
+
+    def _yview(self, *args):
+        if self.lf is None:
+            return
+        if args[0] == "moveto":
+            self.top = self.lf.line_start(int(float(args[1]) * self.lf.size))
+        elif args[0] == "scroll":
+            n = int(args[1]) * (self._rows() - 1 if args[2] == "pages" else 1)
+            self._move(n)
+        self._render()
+        # Suivi actif seulement quand la fin du fichier est affichée
+        self.follow.set(self.bottom >= self.lf.size)
+
+    def _on_wheel(self, e):
+        up = e.num == 4 or getattr(e, "delta", 0) > 0
+        self._yview("scroll", -3 if up else 3, "units")
+        return "break"
+
+    def _jump(self):
+        lf, target = self.lf, self.goto.get().strip()
+        if lf is None or not target:
+            return
+        if target.isdigit():
+            offset = lf.line_offset(int(target) - 1)
+            if offset is None:
+                self.info.config(text=f"⚠ Ligne {target} pas encore indexée ({lf.progress:.0%})")
+                return
+        else:
+            ts = parse_when(target, lf.last_ts())
+            if ts is None:
+                self.info.config(text="⚠ Numéro de ligne ou heure attendu (ex. 1200, 12:30, 2026-01-01 12:30:00)")
+                return
+            offset = lf.find_time(ts)
+        self.follow.set(False)
+        self.mark = offset
+        self.top = offset
+        self._move(-(self._rows() // 3))
+        self._render()
+
+# ─── TIMELINE ────────────────────────────────────────────────────────
+SPAN_COLORS = {"run": BORDER, "stop all": BORDER, "validation": SUBTEXT, "admission": "#f59e0b",
+               "build": "#a855f7", "start": ACCENT, "readiness": ACCENT2, "stop": DANGER}
+MARK_COLORS = {"spawn": TEXT, "first_output": "#38bdf8", "ready": SUCCESS, "exit": "#f59e0b",
+               "failed": DANGER, "invalid": DANGER, "skipped": DANGER, "already_running": SUCCESS,
+               "stopped": SUBTEXT, "stop_failed": DANGER}
+
+class GanttView(tk.Frame):
+    """Diagramme de Gantt d'une Timeline, redessiné chaque seconde"""
+    NAME_W, ROW, PAD = 170, 22, 8
+
+    def __init__(self, parent, timeline, critical=()):
+        super().__init__(parent, bg=PANEL)
+        self.timeline = timeline
+        self.critical = set(critical)
+        self.tips = {}
+        self.canvas = tk.Canvas(self, bg="#0a0d14", highlightthickness=0)
+        sb = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=sb.set)
+        sb.pack(side="right", fill="y")
+        self.canvas.pack(side="top", fill="both", expand=True)
+        self.info = tk.Label(self, bg=PANEL, fg=SUBTEXT, font=("Segoe UI", 9), anchor="w")
+        self.info.pack(fill="x")
+        self.canvas.bind("<Motion>", self._hover)
+        self.canvas.bind("<Configure>", lambda e: self._draw())
+        self.after(1000, self._tick)
+
+    def _tick(self):
+        if not self.winfo_exists():
+            return
+        self._draw()
+        self.after(1000, self._tick)
+
+    def _draw(self):
+        c, tl = self.canvas, self.timeline
+        c.delete("all")
+        self.tips.clear()
+        spans, marks = tl.spans(), tl.instants()
+        rows = [None] + tl.apps()
+        y_of = {app: self.PAD + 18 + i * self.ROW for i, app in enumerate(rows)}
+        total = max(tl.duration(), 0.001)
+        x0 = self.NAME_W
+        width = max(c.winfo_width() - x0 - self.PAD, 100)
+        x = lambda t: x0 + t / total * width
+        height = y_of[rows[-1]] + self.ROW + self.PAD
+
+        # Graduations
+        step = next((s for s in (0.1, 0.25, 0.5, 1, 2, 5, 10, 15, 30, 60, 120, 300, 600)
+                     if total / s <= 10), 1200)
+        t = 0.0
+        while t <= total:
+            c.create_line(x(t), 14, x(t), height, fill=BORDER)
+            c.create_text(x(t), 2, text=f"{t:g}s", anchor="n", fill=SUBTEXT, font=("Segoe UI", 8))
+            t += step
+
+        for app, y in y_of.items():
+            label = "(lancement)" if app is None else app
+            bold = app in self.critical
+            c.create_text(self.PAD, y + self.ROW / 2, text=("★ " if bold else "") + label, anchor="w",
+                          fill=ACCENT if bold else TEXT, font=("Segoe UI", 9, "bold" if bold else "normal"))
+        now = time.time() - tl.t0
+        for app, name, start, end in spans:
+            y = y_of.get(app, y_of[None])
+            inset = 3 if name in ("run", "stop all", "start", "stop") else 6
+            stop = end if end is not None else now
+            item = c.create_rectangle(x(start), y + inset, max(x(stop), x(start) + 2), y + self.ROW - inset,
+                                      fill=SPAN_COLORS.get(name, SUBTEXT), outline="")
+            self.tips[item] = (f"{app or tl.label} — {name} : {start:.3f}s → "
+                               + (f"{end:.3f}s ({end - start:.3f}s)" if end is not None else "en cours"))
+        for app, name, t in marks:
+            y = y_of.get(app, y_of[None])
+            item = c.create_line(x(t), y + 2, x(t), y + self.ROW - 2, width=2,
+                                 fill=MARK_COLORS.get(name, TEXT))
+            self.tips[item] = f"{app or tl.label} — {name} à {t:.3f}s"
+        c.configure(scrollregion=(0, 0, x0 + width + self.PAD, height))
+
+    def _hover(self, e):
+        found = self.canvas.find_overlapping(self.canvas.canvasx(e.x) - 2, self.canvas.canvasy(e.y) - 2,
+                                             self.canvas.canvasx(e.x) + 2, self.canvas.canvasy(e.y) + 2)
+        tips = [self.tips[i] for i in reversed(found) if i in self.tips]
+        self.info.config(text=tips[0] if tips else "")
 
 # ─── DIALOG HELPER ───────────────────────────────────────────────────
 class Dlg(tk.Toplevel):
@@ -0,0 +1,521 @@
+"""Benchmarks de l'App Launcher.
+
+    python benchmarks.py logpipe [--rate 50000] [--seconds 5]
+    python benchmarks.py applist [--sizes 10,100,1000]
+    python benchmarks.py store [--sizes 10,100,1000,10000]
+    python benchmarks.py config_view [--sizes 10,100,1000]
+    python benchmarks.py validate [--sizes 10,100,1000]
+    python benchmarks.py launch [--sizes 5,20,50]
+    python benchmarks.py logindex [--sizes 10000,100000]
+    python benchmarks.py logfile [--sizes 100000,1000000]
+    python benchmarks.py metrics [--sizes 10,100] [--seconds 5]
+    python benchmarks.py all --out bench.json
+    python benchmarks.py store --baseline bench.json [--tolerance 0.1]
+
+Les résultats sont écrits en JSON avec --out ; --baseline compare chaque
+mesure (…_ms, …_us, …_s, …_per_s) à un fichier précédent et renvoie le code 2
+si l'une régresse au-delà de la tolérance.
+"""
+import argparse, json, os, platform, shutil, statistics, sys, tempfile, threading, time
+
+# ─── JOURNAL DE LANCEMENT ────────────────────────────────────────────
+def bench_logpipe(rate=50000, seconds=5.0, apps=8):
+    """Inonde un LogView à `rate` lignes/s et mesure le retard de la boucle Tk"""
+    import tkinter as tk
+    from app_launcher import LogView
+
+    root = tk.Tk()
+    root.geometry("900x500")
+    view = LogView(root)
+    view.pack(fill="both", expand=True)
+    names = [f"app{i}" for i in range(apps)]
+    stop = threading.Event()
+
+    def produce():
+        step = 0.01
+        per_step = max(1, int(rate * step))
+        n = 0
+        t_next = time.perf_counter()
+        while not stop.is_set():
+            for _ in range(per_step):
+                name = names[n % apps]
+                view.write(f"  [{name}] 2026-01-01 12:00:00.000 INFO  ligne de log numéro {n}", name)
+                n += 1
+            t_next += step
+            delay = t_next - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    # Un tick toutes les 10 ms : son retard mesure la réactivité de l'UI
+    lags = []
+    tick_ms = 10
+    last = [time.perf_counter()]
+
+    def tick():
+        now = time.perf_counter()
+        lags.append((now - last[0]) * 1000 - tick_ms)
+        last[0] = now
+        if not stop.is_set():
+            root.after(tick_ms, tick)
+
+    def finish():
+        stop.set()
+        root.after(200, root.quit)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    t0 = time.perf_counter()
+    producer.start()
+    root.after(tick_ms, tick)
+    root.after(int(seconds * 1000), finish)
+    root.mainloop()
+    elapsed = time.perf_counter() - t0
+    producer.join()
+    root.destroy()
+
+    lags.sort()
+    return {
+        "pushed": view.queue.pushed,
+        "rendered": view.rendered,
+        "backlog": len(view.queue),
+        "lines_per_s": round(view.rendered / elapsed),
+        "lag_p50_ms": round(lags[len(lags) // 2], 2) if lags else None,
+        "lag_p99_ms": round(lags[int(len(lags) * 0.99)], 2) if lags else None,
+        "lag_max_ms": round(lags[-1], 2) if lags else None,
+    }
+
+# ─── LISTE D'APPS ────────────────────────────────────────────────────
+def synthetic_apps(n):
+    kinds = [
+        {"type": "Spring Boot", "path": "/srv/m2m", "jar": "/srv/m2m/app/target/m2m.jar", "run_config": "--spring.profiles.active=dev"},
+        {"type": "ActiveMQ", "home": "/opt/activemq"},
+        {"type": "Podman", "container": "redis"},
+        {"type": "Docker Compose", "directory": "/srv/stack", "compose_file": "compose.yaml"},
+    ]
+    return [dict(kinds[i % len(kinds)], name=f"app-{i}") for i in range(n)]
+
+def bench_applist(sizes=(10, 100, 1000)):
+    """Temps d'affichage, de défilement et de modification de la liste d'apps"""
+    import tkinter as tk
+    from app_launcher import AppList
+
+    def timed(root, fn):
+        t0 = time.perf_counter()
+        fn()
+        root.update()
+        return round((time.perf_counter() - t0) * 1000, 2)
+
+    results = {}
+    root = tk.Tk()
+    root.geometry("800x600")
+    try:
+        for n in sizes:
+            apps = synthetic_apps(n)
+            lst = [None]
+
+            def build():
+                lst[0] = AppList(root, apps, on_edit=lambda i: None,
+                                 on_delete=lambda i: None, on_move=lambda a, b: None)
+                lst[0].pack(fill="both", expand=True)
+            r = {"render_ms": timed(root, build)}
+            view = lst[0]
+
+            steps = 50
+            t0 = time.perf_counter()
+            for s in range(steps + 1):
+                view.canvas.yview_moveto(s / steps)
+                root.update()
+            r["scroll_step_ms"] = round((time.perf_counter() - t0) * 1000 / (steps + 1), 2)
+            view.canvas.yview_moveto(0)
+            root.update()
+
+            def move():
+                apps.insert(0, apps.pop(n // 2 if n > 1 else 0))
+                view.changed(0, n // 2)
+            r["move_ms"] = timed(root, move)
+
+            def remove():
+                apps.pop(0)
+                view.changed(0)
+            r["remove_ms"] = timed(root, remove)
+
+            def insert():
+                apps.append(synthetic_apps(1)[0])
+                view.changed(len(apps) - 1)
+            r["insert_ms"] = timed(root, insert)
+
+            r["widgets"] = len(view.cards) + len(view.pool)
+            view.destroy()
+            results[str(n)] = r
+    finally:
+        root.destroy()
+    return results
+
+# ─── STOCKAGE DES CONFIGS ────────────────────────────────────────────
+def _median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return round(statistics.median(times), 3)
+
+def bench_store(sizes=(10, 100, 1000, 10000), repeat=5):
+    """Chargement et écriture du fichier de configs (Manager.load / _write)"""
+    from store import Manager
+
+    results = {}
+    tmp = tempfile.mkdtemp(prefix="bench-store-")
+    try:
+        for n in sizes:
+            path = os.path.join(tmp, f"configs-{n}.json")
+            data = {"configs": [{"name": "bench", "apps": synthetic_apps(n)},
+                                {"name": "autre", "apps": synthetic_apps(10)}]}
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            mgr = Manager(path, save_delay=3600, backups=1)
+            results[str(n)] = {
+                "bytes": os.path.getsize(path),
+                "load_ms": _median_ms(mgr.load, repeat),
+                "write_ms": _median_ms(mgr._write, repeat),
+                # 1000 appels : la durée en ms est aussi la durée d'un appel en µs
+                "lookup_us": _median_ms(lambda: [mgr.get_config("bench") for _ in range(1000)], repeat),
+            }
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return results
+
+# ─── AFFICHAGE D'UNE CONFIG ──────────────────────────────────────────
+def bench_config_view(sizes=(10, 100, 1000), repeat=5):
+    """Affichage complet d'une config (en-tête + cartes d'apps) via UI._show_config"""
+    import tkinter as tk
+    from app_launcher import UI
+    from store import Manager
+
+    results = {}
+    tmp = tempfile.mkdtemp(prefix="bench-view-")
+    root = tk.Tk()
+    mgr = Manager(os.path.join(tmp, "configs.json"), save_delay=3600, backups=0)
+    ui = None
+    try:
+        # Rien du poste : configs et journaux dans le dossier temporaire
+        ui = UI(root, mgr=mgr, log_dir=os.path.join(tmp, "logs"))
+        for n in sizes:
+            name = f"bench-{n}"
+            ui.mgr.add_config(name)
+            ui.mgr.get_config(name)["apps"].extend(synthetic_apps(n))
+
+            def show():
+                ui._show_config(name)
+                root.update()
+            first = _median_ms(show, 1)
+            results[str(n)] = {"first_ms": first, "show_ms": _median_ms(show, repeat),
+                               "cards": len(ui.app_list.cards)}
+    finally:
+        if ui is not None:
+            ui.sampler.stop()
+            ui.log_index.stop()
+            if ui.metrics_server is not None:
+                ui.metrics_server.shutdown()
+        root.destroy()
+        mgr.flush()   # sinon l'écriture de sortie viserait un dossier supprimé
+        shutil.rmtree(tmp, ignore_errors=True)
+    return results
+
+# ─── VALIDATION ──────────────────────────────────────────────────────
+def _app_tree(root, n):
+    """Arborescence temporaire : une app sur quatre pointe vers un chemin absent"""
+    from preflight import SCRIPT_EXT
+
+    apps = []
+    for i in range(n):
+        kind = i % 4
+        base = os.path.join(root, f"app-{i}")
+        missing = i % 4 == 3
+        if kind in (0, 3):
+            jar = os.path.join(base, "target", "app.jar")
+            if not missing:
+                os.makedirs(os.path.dirname(jar))
+                open(jar, "wb").close()
+            apps.append({"type": "Spring Boot", "name": f"app-{i}", "path": base, "jar": jar})
+        elif kind == 1:
+            os.makedirs(os.path.join(base, "bin"))
+            open(os.path.join(base, "bin", "activemq" + SCRIPT_EXT), "w").close()
+            apps.append({"type": "ActiveMQ", "name": f"app-{i}", "home": base,
+                         "ready": "tcp:61616"})
+        else:
+            os.makedirs(base)
+            open(os.path.join(base, "compose.yaml"), "w").close()
+            apps.append({"type": "Docker Compose", "name": f"app-{i}", "directory": base,
+                         "compose_file": "compose.yaml"})
+    return apps
+
+def bench_validate(sizes=(10, 100, 1000), repeat=5):
+    """validate_app sur un arbre de fichiers temporaire, sans cache, avec cache, et en parallèle"""
+    from preflight import StatCache, validate_app, preflight
+
+    results = {}
+    tmp = tempfile.mkdtemp(prefix="bench-validate-")
+    try:
+        for n in sizes:
+            apps = _app_tree(os.path.join(tmp, str(n)), n)
+            cold = lambda: [validate_app(a, None) for a in apps]
+            warm_cache = StatCache()
+            cold()
+            [validate_app(a, warm_cache) for a in apps]
+            results[str(n)] = {
+                "errors": sum(1 for e in cold() if e),
+                "cold_ms": _median_ms(cold, repeat),
+                "cached_ms": _median_ms(lambda: [validate_app(a, warm_cache) for a in apps], repeat),
+                "preflight_ms": _median_ms(lambda: preflight(apps, stat=StatCache()), repeat),
+            }
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return results
+
+# ─── ORCHESTRATION ───────────────────────────────────────────────────
+def _fake_home(root, sleep):
+    """Faux Elasticsearch : un script qui écrit une ligne puis dort"""
+    from preflight import SCRIPT_EXT
+
+    os.makedirs(os.path.join(root, "bin"), exist_ok=True)
+    script = os.path.join(root, "bin", "elasticsearch" + SCRIPT_EXT)
+    with open(script, "w", encoding="utf-8") as f:
+        if os.name == "nt":
+            f.write(f"@echo off\necho started\npowershell -command Start-Sleep -Milliseconds {int(sleep * 1000)}\n")
+        else:
+            f.write(f"#!/bin/sh\necho started\nsleep {sleep}\n")
+    os.chmod(script, 0o755)
+    return root
+
+def bench_launch(sizes=(5, 20, 50), sleep=0.2, max_parallel=8):
+    """Lancement complet d'apps factices : coût du lanceur au-delà du travail des apps.
+
+    « parallel » : apps indépendantes (depends_on déclaré sur une racine commune),
+    « chain » : ordre séquentiel historique. Chaque app attend sa ligne « started »
+    via une sonde de log, comme une vraie app.
+    """
+    from engine import LaunchEngine
+    from supervisor import Supervisor
+    from admission import Admission
+
+    results = {}
+    tmp = tempfile.mkdtemp(prefix="bench-launch-")
+    try:
+        home = _fake_home(os.path.join(tmp, "es"), sleep)
+        for n in sizes:
+            r = {}
+            for mode in ("parallel", "chain"):
+                apps = [{"type": "Elasticsearch", "name": f"app-{i}", "home": home,
+                         "ready": "log:started"} for i in range(n)]
+                if mode == "parallel":
+                    for a in apps[1:]:
+                        a["depends_on"] = "app-0"
+                lines = [0]
+
+                def log(msg, app=None):
+                    lines[0] += 1
+                # Admission sans limite : on mesure le lanceur, pas la machine
+                engine = LaunchEngine(apps, log, max_parallel=max_parallel, supervisor=Supervisor(),
+                                      skip_running=False,
+                                      admission=Admission(max_starting=n, budget=10 * n, max_load=None,
+                                                          min_free_mb=None))
+                t0 = time.perf_counter()
+                status = engine.run()
+                total = time.perf_counter() - t0
+                for i in range(n):
+                    engine.supervisor.get(f"app-{i}").wait(sleep + 5)
+                starts = [end - start for app, name, start, end in engine.timeline.spans()
+                          if name == "start" and end is not None]
+                r[mode] = {"ok": sum(1 for s in status.values() if s == "ok"),
+                           "total_s": round(total, 3),
+                           "start_p50_ms": round(statistics.median(starts) * 1000, 2) if starts else None,
+                           "log_lines": lines[0]}
+            results[str(n)] = r
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return results
+
+# ─── RECHERCHE DANS LES LOGS ─────────────────────────────────────────
+LOG_QUERIES = {"rare": "ERROR app=amq last 5 min", "frequent": "started broker",
+               "phrase": '"connection refused" level>=warn', "absent": "introuvable"}
+
+def bench_logindex(sizes=(10000, 100000), repeat=5):
+    """Indexation (lignes/s) puis requêtes typiques sur `size` lignes de logs synthétiques"""
+    import random
+    from logindex import LogIndex, detect_level
+
+    rnd = random.Random(42)
+    apps = ["amq", "es", "m2m", "gateway", "podman"]
+    words = ("connection refused timeout started broker client session queue message consumer "
+             "producer index shard cluster node").split()
+    levels = ["INFO"] * 20 + ["DEBUG"] * 5 + ["WARN"] * 2 + ["ERROR"]
+    results = {}
+    for n in sizes:
+        lines = [(rnd.choice(apps), f"2026-01-01 12:00:00.000 {rnd.choice(levels)} [main] "
+                  f"o.a.{rnd.choice(words)} : {' '.join(rnd.choices(words, k=6))} id={i}")
+                 for i in range(n)]
+        index = LogIndex()
+        t0 = time.time() - 600
+        start = time.perf_counter()
+        for i, (app, text) in enumerate(lines):
+            index.add(t0 + i * 600 / n, app, text, detect_level(text, "out"))
+        elapsed = time.perf_counter() - start
+        r = {"index_lines_per_s": round(n / elapsed), "mb": round(index.bytes / 1024**2, 1)}
+        for name, q in LOG_QUERIES.items():
+            r[f"{name}_ms"] = _median_ms(lambda: index.search(q), repeat)
+        results[str(n)] = r
+    return results
+
+def bench_logfile(sizes=(100000, 1000000), repeat=5):
+    """Fichier de log de `size` lignes : ouverture, fin, index des lignes, sauts par ligne et par heure"""
+    from logfile import LogFile
+
+    results = {}
+    with tempfile.TemporaryDirectory() as root:
+        for n in sizes:
+            path = os.path.join(root, f"{n}.log")
+            t0 = time.mktime((2026, 1, 1, 0, 0, 0, 0, 0, -1))
+            with open(path, "w", encoding="utf-8") as f:
+                for i in range(n):
+                    f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(t0 + i // 10))}.000 "
+                            f"INFO [main] o.a.broker : message {i} traité\n")
+            size = os.path.getsize(path)
+            r = {"mb": round(size / 1024**2, 1)}
+            start = time.perf_counter()
+            lf = LogFile(path)
+            r["open_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            r["tail_ms"] = _median_ms(lambda: lf.read(lf.tail_offset(50), 50), repeat)
+            r["goto_time_ms"] = _median_ms(lambda: lf.find_time(t0 + n // 20), repeat)
+            start = time.perf_counter()
+            lf.index_all()
+            r["index_mb_per_s"] = round(size / 1024**2 / (time.perf_counter() - start), 1)
+            r["index_kb"] = round(len(lf.marks) * lf.marks.itemsize / 1024, 1)
+            r["goto_line_ms"] = _median_ms(lambda: lf.read(lf.line_offset(n * 2 // 3), 50), repeat)
+            lf.close()
+            results[str(n)] = r
+    return results
+
+def bench_metrics(sizes=(10, 100), seconds=2.0, repeat=5):
+    """Endpoint Prometheus pour `size` apps : rendu, lecture en cache et scrapes HTTP par seconde"""
+    import http.client
+    from types import SimpleNamespace
+    from metrics import Metrics, serve
+
+    results = {}
+    for n in sizes:
+        m = Metrics()
+        apps = [{"name": f"app{i}"} for i in range(n)]
+        engine = SimpleNamespace(timeline=SimpleNamespace(label="bench"), graph=SimpleNamespace(apps=apps),
+                                 times={i: (0.0, 1.0 + i % 7) for i in range(n)},
+                                 ready_waits={i: 0.5 for i in range(n)}, status={i: "ok" for i in range(n)},
+                                 only=None, duration=12.0)
+        m.observe_run(engine)
+        r = {}
+        r["render_ms"] = _median_ms(lambda: (m.observe_run(engine), m.render()), repeat)
+        start = time.perf_counter()
+        for _ in range(10000):
+            m.render()
+        r["cached_us"] = round((time.perf_counter() - start) / 10000 * 1e6, 3)
+        server = serve(port=0, metrics=m)
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+        count, deadline = 0, time.perf_counter() + seconds
+        start = time.perf_counter()
+        while time.perf_counter() < deadline:
+            conn.request("GET", "/metrics")
+            conn.getresponse().read()
+            count += 1
+        r["scrapes_per_s"] = round(count / (time.perf_counter() - start))
+        conn.close()
+        server.shutdown()
+        server.server_close()
+        results[str(n)] = r
+    return results
+
+def _sizes(a, default):
+    return [int(s) for s in (a.sizes or default).split(",")]
+
+BENCHES = {
+    "logpipe":     lambda a: bench_logpipe(a.rate, a.seconds),
+    "applist":     lambda a: bench_applist(_sizes(a, "10,100,1000")),
+    "store":       lambda a: bench_store(_sizes(a, "10,100,1000,10000"), a.repeat),
+    "config_view": lambda a: bench_config_view(_sizes(a, "10,100,1000"), a.repeat),
+    "validate":    lambda a: bench_validate(_sizes(a, "10,100,1000"), a.repeat),
+    "launch":      lambda a: bench_launch(_sizes(a, "5,20,50")),
+    "logindex":    lambda a: bench_logindex(_sizes(a, "10000,100000"), a.repeat),
+    "logfile":     lambda a: bench_logfile(_sizes(a, "100000,1000000"), a.repeat),
+    "metrics":     lambda a: bench_metrics(_sizes(a, "10,100"), min(a.seconds, 2.0), a.repeat),
+}
+
+# ─── COMPARAISON ─────────────────────────────────────────────────────
+def _metrics(result, prefix=""):
+    """Mesures comparables d'un résultat imbriqué : {"store/1000/load_ms": 12.3, …}"""
+    out = {}
+    for k, v in result.items():
+        key = f"{prefix}/{k}" if prefix else str(k)
+        if isinstance(v, dict):
+            out.update(_metrics(v, key))
+        elif isinstance(v, (int, float)) and not isinstance(v, bool) and k.endswith(("_ms", "_us", "_s")):
+            out[key] = v
+    return out
+
+def compare(results, baseline, tolerance=0.1):
+    """Lignes de comparaison et nombre de régressions au-delà de `tolerance`"""
+    cur, base = _metrics(results), _metrics(baseline)
+    lines, regressions = [], 0
+    for key in sorted(cur.keys() & base.keys()):
+        old, new = base[key], cur[key]
+        if not old:
+            continue
+        ratio = new / old
+        # Débits (…_per_s) : plus grand = mieux ; durées : plus petit = mieux
+        worse = ratio < 1 - tolerance if key.endswith("_per_s") else ratio > 1 + tolerance
+        regressions += worse
+        lines.append(f"{'⚠' if worse else ' '} {key:<40} {old:>12} → {new:<12} ({(ratio - 1) * 100:+.1f}%)")
+    return lines, regressions
+
+# ─── MAIN ────────────────────────────────────────────────────────────
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmarks de l'App Launcher")
+    ap.add_argument("bench", nargs="+", choices=sorted(BENCHES) + ["all"])
+    ap.add_argument("--rate", type=int, default=50000, help="lignes/s injectées (logpipe)")
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--sizes", default=None, help="nombres d'apps (lignes pour logindex et logfile), séparés par des virgules")
+    ap.add_argument("--repeat", type=int, default=5, help="répétitions (médiane)")
+    ap.add_argument("--out", help="fichier JSON où écrire les résultats")
+    ap.add_argument("--baseline", help="fichier JSON de référence à comparer")
+    ap.add_argument("--tolerance", type=float, default=0.1, help="écart toléré (0.1 = 10 %%)")
+    args = ap.parse_args(argv)
+    names = sorted(BENCHES) if "all" in args.bench else list(dict.fromkeys(args.bench))
+
+    results, failed = {}, 0
+    for name in names:
+        try:
+            results[name] = BENCHES[name](args)
+        except Exception as ex:   # pas d'affichage (TclError) par exemple
+            print(f"{name} : impossible à exécuter ({ex})", file=sys.stderr)
+            failed += 1
+            continue
+        print(f"── {name}")
+        for k, v in results[name].items():
+            print(f"{k:>14} : {v}")
+    if not results:
+        return 1
+
+    if args.out:
+        doc = {"date": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+               "platform": platform.platform(), "results": results}
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=2, ensure_ascii=False)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+        lines, regressions = compare(results, baseline, args.tolerance)
+        print(f"── comparaison avec {args.baseline}")
+        print("\n".join(lines) or "aucune mesure commune")
+        if regressions:
+            print(f"{regressions} régression(s) au-delà de {args.tolerance:.0%}")
+            return 2
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
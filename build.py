@@ -0,0 +1,226 @@
+import hashlib, json, os, shlex, subprocess, threading, time
+from concurrent.futures import ThreadPoolExecutor
+
+BUILD_DIR      = ".build"    # index des entrées des projets, à côté du fichier de configs
+BUILD_PARALLEL = 2           # projets construits en même temps
+BUILD_ARGS     = "-DskipTests"
+BUILD_TIMEOUT  = 900         # secondes max pour un build
+PRUNE = {"target", "node_modules"}   # sorties et dépendances, jamais des entrées (hors src/)
+
+def sha1(path, chunk=1024 * 1024):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def maven_command(project):
+    """Wrapper Maven du projet s'il existe, sinon mvn du PATH"""
+    wrapper = os.path.join(project, "mvnw.cmd" if os.name == "nt" else "mvnw")
+    if os.path.isfile(wrapper):
+        return [wrapper]
+    return ["mvn.cmd" if os.name == "nt" else "mvn"]
+
+def scan(project):
+    """(modules, entrées) d'un projet Maven.
+
+    Un module est un dossier contenant un pom.xml (chemin relatif, "" pour la
+    racine) ; ses entrées sont son pom.xml et les fichiers de son src/.
+    Renvoie les entrées sous la forme {chemin relatif: (taille, mtime_ns)}.
+    """
+    modules, files = [], {}
+    for root, dirs, names in os.walk(project):
+        rel = os.path.relpath(root, project)
+        rel = "" if rel == "." else rel.replace(os.sep, "/")
+        in_src = "src" in (rel.split("/") if rel else [])
+        if not in_src:
+            dirs[:] = [d for d in dirs if d not in PRUNE and not d.startswith(".")]
+        if "pom.xml" in names and not in_src:
+            modules.append(rel)
+        for n in names:
+            if n == "pom.xml" or in_src:
+                path = os.path.join(root, n)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                files[f"{rel}/{n}" if rel else n] = (st.st_size, st.st_mtime_ns)
+    return modules, files
+
+def module_of(rel, modules):
+    """Module le plus profond contenant le fichier `rel`"""
+    best = ""
+    for m in modules:
+        if m and (rel == m or rel.startswith(m + "/")) and len(m) > len(best):
+            best = m
+    return best
+
+# ─── INDEX ET BUILD ──────────────────────────────────────────────────
+class Builder:
+    """Build Maven incrémental des projets Spring Boot avant leur lancement.
+
+    Un index (taille, mtime, sha1) des entrées de chaque projet dit quels
+    modules ont changé depuis le dernier build réussi : rien → pas de build,
+    sinon `mvn -pl <modules> -amd package` (les modules qui en dépendent sont
+    reconstruits avec eux), ou tout le projet si le pom racine a changé. Un
+    fichier seulement « touché » (même sha1) ne compte pas. Sans index, les
+    entrées plus récentes que le jar comptent comme modifiées.
+
+    Réglages : par config build_parallel ; par app build (oui/non), build_args.
+    Une seule instance par processus (BUILDER) : ses threads et son index
+    sont partagés par tous les lancements, et deux lancements simultanés
+    attendent le même build d'un projet.
+    """
+    def __init__(self, root=BUILD_DIR, max_parallel=BUILD_PARALLEL):
+        self.root = root
+        self.index_path = os.path.join(root, "index.json")
+        self.max_parallel = max(1, int(max_parallel or 1))
+        self.pool = ThreadPoolExecutor(max_workers=self.max_parallel)
+        self._lock = threading.Lock()
+        self._futures = {}   # projet -> Future du build en cours, un seul à la fois par projet
+        self.index = {}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, encoding="utf-8") as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError):
+                self.index = {}
+
+    @classmethod
+    def from_config(cls, cfg):
+        """Le Builder partagé, réglé sur le build_parallel de la config"""
+        return BUILDER.configure(cfg.get("build_parallel", BUILD_PARALLEL))
+
+    def configure(self, max_parallel):
+        """Change le nombre de builds simultanés ; les builds en cours se terminent normalement"""
+        max_parallel = max(1, int(max_parallel or 1))
+        with self._lock:
+            if max_parallel != self.max_parallel:
+                old, self.pool = self.pool, ThreadPoolExecutor(max_workers=max_parallel)
+                self.max_parallel = max_parallel
+                old.shutdown(wait=False)
+        return self
+
+    def _save(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f)
+        os.replace(tmp, self.index_path)
+
+    def changes(self, project, jar):
+        """(modules à reconstruire, nouvel index des entrées) ; None = tout le projet"""
+        modules, files = scan(project)
+        with self._lock:
+            old = self.index.get(project, {}).get("files")
+        try:
+            jar_mtime = os.stat(jar).st_mtime_ns
+        except OSError:
+            jar_mtime = None
+        changed, new = set(), {}
+        for rel, (size, mtime) in files.items():
+            prev = old.get(rel) if old is not None else None
+            if prev and prev[0] == size and prev[1] == mtime:
+                new[rel] = prev
+                continue
+            try:
+                digest = sha1(os.path.join(project, rel))
+            except OSError:
+                continue
+            new[rel] = [size, mtime, digest]
+            if old is None:
+                # Premier passage : seul le jar dit si le fichier est plus récent que le build
+                if jar_mtime is None or mtime > jar_mtime:
+                    changed.add(module_of(rel, modules))
+            elif not prev or prev[2] != digest:
+                changed.add(module_of(rel, modules))
+        for rel in (old or {}).keys() - files.keys():
+            changed.add(module_of(rel, modules))   # fichier supprimé
+        if jar_mtime is None:
+            jar_rel = os.path.relpath(jar, project).replace(os.sep, "/")
+            changed.add("" if jar_rel.startswith("..") else module_of(jar_rel, modules))
+        if "" in changed or len(modules) <= 1:
+            return (None if changed else set()), new
+        return changed, new
+
+    def submit(self, app, write, timeline=None):
+        """Lance (ou rejoint) le build du projet de l'app ; Future → True si le jar est à jour"""
+        project = os.path.abspath(app.get("path","").strip())
+        with self._lock:
+            fut = self._futures.get(project)
+            joined = fut is not None
+            if not joined:
+                fut = self._futures[project] = self.pool.submit(self._build, project, app, write, timeline)
+        if joined:
+            write("🔨 Build déjà en cours pour ce projet, attente de sa fin")
+        else:
+            fut.add_done_callback(lambda f: self._done(project, f))   # hors verrou : peut être appelé ici
+        return fut
+
+    def _done(self, project, fut):
+        with self._lock:
+            if self._futures.get(project) is fut:
+                del self._futures[project]
+
+    def _build(self, project, app, write, timeline):
+        name = app.get("name")
+        jar = os.path.abspath(app.get("jar","").strip())
+        t0 = time.perf_counter()
+        modules, files = self.changes(project, jar)
+        if modules is not None and not modules:
+            with self._lock:
+                if self.index.get(project, {}).get("files") != files:
+                    self.index[project] = {"files": files, "built_at": time.time()}
+                    self._save()
+            write(f"🔨 Build : rien n'a changé ({len(files)} fichiers vérifiés en "
+                  f"{time.perf_counter() - t0:.2f}s)")
+            return True
+        argv = maven_command(project) + ["-B", "package"] + shlex.split(
+            app.get("build_args", BUILD_ARGS) or "", posix=os.name != "nt")
+        if modules:
+            argv += ["-pl", ",".join(sorted(modules)), "-amd"]
+        write("🔨 Build : " + ("tout le projet" if modules is None else ", ".join(sorted(modules)))
+              + f" — $ {' '.join(argv)}")
+        if timeline is not None:
+            timeline.begin(name, "build")
+        try:
+            ok, tail = self._run(argv, project, write)
+        finally:
+            if timeline is not None:
+                timeline.end(name, "build")
+        if not ok:
+            write(f"❌ Build en échec : {tail}")
+            return False
+        if not os.path.isfile(jar):
+            write(f"❌ Build terminé mais JAR introuvable : {jar}")
+            return False
+        # Index des entrées lues avant le build : une modification pendant le build sera revue
+        with self._lock:
+            self.index[project] = {"files": files, "built_at": time.time()}
+            self._save()
+        write(f"✅ Build terminé en {time.perf_counter() - t0:.1f}s")
+        return True
+
+    def _run(self, argv, cwd, write):
+        try:
+            proc = subprocess.Popen(argv, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                    stdin=subprocess.DEVNULL, text=True, errors="replace")
+        except OSError as ex:
+            return False, str(ex)
+        timer = threading.Timer(BUILD_TIMEOUT, proc.kill)
+        timer.start()
+        last = ""
+        try:
+            for line in proc.stdout:
+                line = line.rstrip()
+                if line:
+                    last = line
+                    # Maven est bavard : seules les erreurs et le résumé remontent au journal
+                    if line.startswith(("[ERROR]", "[WARNING] COMPILATION", "[INFO] BUILD", "[INFO] Reactor")):
+                        write(f"mvn {line}")
+            code = proc.wait()
+        finally:
+            timer.cancel()
+        return code == 0, last or f"code {code}"
+
+BUILDER = Builder()
@@ -0,0 +1,161 @@
+import hashlib, json, os, re, subprocess, threading, time
+
+CDS_DIR = ".cds"   # archives et index, à côté du fichier de configs
+
+STARTED_RE = re.compile(r"Started \S+ in ([\d.]+) seconds")
+
+_java_versions = {}
+
+def java_major(java="java"):
+    """Version majeure de la JVM (mémorisée), None si introuvable"""
+    if java not in _java_versions:
+        try:
+            out = subprocess.run([java, "-version"], capture_output=True, text=True, timeout=15)
+            m = re.search(r'version "(\d+)(?:\.(\d+))?', out.stderr + out.stdout)
+            major = int(m.group(1)) if m else None
+            if major == 1 and m.group(2):   # "1.8.0_…"
+                major = int(m.group(2))
+        except (OSError, subprocess.SubprocessError):
+            major = None
+        _java_versions[java] = major
+    return _java_versions[java]
+
+def file_hash(path, chunk=1024 * 1024):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def find_extracted(jar, app=None):
+    """(jar extrait, jar extrait périmé) de la disposition `-Djarmode=tools extract`.
+
+    Le jar extrait n'est retenu que s'il est au moins aussi récent que le jar
+    complet : après une reconstruction, l'ancienne extraction est signalée
+    comme périmée et le jar complet est lancé.
+    """
+    explicit = (app or {}).get("extracted", "").strip()
+    candidates = [explicit] if explicit else []
+    stem = os.path.splitext(os.path.basename(jar))[0]
+    candidates.append(os.path.join(os.path.dirname(jar), stem, os.path.basename(jar)))
+    for path in candidates:
+        if os.path.isdir(path):
+            path = os.path.join(path, os.path.basename(jar))
+        if path and os.path.isfile(path) and os.path.isdir(os.path.join(os.path.dirname(path), "lib")):
+            try:
+                fresh = os.stat(path).st_mtime_ns >= os.stat(jar).st_mtime_ns
+            except OSError:
+                fresh = True   # jar complet absent : l'extraction est tout ce qu'on a
+            return (path, None) if fresh else (None, path)
+    return None, None
+
+# ─── CACHE D'ARCHIVES ────────────────────────────────────────────────
+class CdsPlan:
+    """Ce qu'il faut ajouter à la ligne de commande java pour un lancement"""
+    def __init__(self, jar, flags, mode, archive, note=None):
+        self.jar = jar          # jar à lancer (éventuellement extrait)
+        self.flags = flags      # options JVM
+        self.mode = mode        # "create" (1er lancement), "use" ou None (non supporté)
+        self.archive = archive
+        self.note = note        # message à afficher avant le lancement (extraction périmée…)
+
+class CdsCache:
+    """Archives AppCDS par jar, invalidées quand le jar est reconstruit.
+
+    La clé est chemin + taille + mtime ; si seul le mtime change, le hash du
+    contenu évite de régénérer l'archive pour un jar identique.
+    """
+    def __init__(self, root=CDS_DIR):
+        self.root = root
+        self.index_path = os.path.join(root, "index.json")
+        self._lock = threading.Lock()
+        self.index = {}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, encoding="utf-8") as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError):
+                self.index = {}
+
+    def _save(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp, self.index_path)
+
+    def _key(self, jar):
+        st = os.stat(jar)
+        raw = f"{os.path.abspath(jar)}|{st.st_size}|{st.st_mtime_ns}"
+        return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+    def prepare(self, app, java="java"):
+        jar = app.get("jar","").strip()
+        extracted, stale = find_extracted(jar, app)
+        run_jar = extracted or jar
+        note = f"CDS : extraction périmée ({stale} plus ancien que le jar), lancement du jar complet" \
+            if stale else None
+        major = java_major(java)
+        if major is None or major < 13:
+            return CdsPlan(run_jar, [], None, None, note)
+
+        with self._lock:
+            entry = self.index.setdefault(os.path.abspath(run_jar), {})
+            key = self._key(run_jar)
+            archive = os.path.join(os.path.abspath(self.root), f"{key}.jsa")
+            if entry.get("key") != key:
+                digest = file_hash(run_jar)
+                old = entry.get("archive")
+                if entry.get("sha256") == digest and old and os.path.exists(old):
+                    os.replace(old, archive)     # jar identique, seulement « touché »
+                else:
+                    if old and os.path.exists(old):
+                        os.remove(old)
+                    entry.pop("baseline", None)
+                entry.update(key=key, sha256=digest, archive=archive)
+                self._save()
+            exists = os.path.exists(archive)
+
+        os.makedirs(self.root, exist_ok=True)
+        if major >= 19:
+            # La JVM crée l'archive si besoin et la revalide elle-même
+            flags = ["-XX:+AutoCreateSharedArchive", f"-XX:SharedArchiveFile={archive}"]
+        elif exists:
+            flags = [f"-XX:SharedArchiveFile={archive}", "-Xshare:auto"]
+        else:
+            flags = [f"-XX:ArchiveClassesAtExit={archive}"]
+        return CdsPlan(run_jar, flags, "use" if exists else "create", archive, note)
+
+    def record(self, plan, seconds):
+        """Note un temps de démarrage et renvoie le message à afficher"""
+        with self._lock:
+            entry = self.index.get(os.path.abspath(plan.jar))
+            if entry is None:
+                return None
+            if plan.mode == "use":
+                entry["last"] = seconds
+                base = entry.get("baseline")
+                self._save()
+                if base:
+                    return f"CDS : démarré en {seconds:.1f}s (sans archive {base:.1f}s, {base - seconds:.1f}s gagnées)"
+                return f"CDS : démarré en {seconds:.1f}s avec archive"
+            entry["baseline"] = seconds
+            self._save()
+            return f"CDS : démarré en {seconds:.1f}s, archive générée pour les prochains lancements"
+
+def watch_started(proc, callback, timeout=600):
+    """Appelle callback(secondes) quand Spring Boot affiche « Started … in N seconds »"""
+    read = proc.output.reader()
+
+    def run():
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            for line in read():
+                m = STARTED_RE.search(line)
+                if m:
+                    callback(float(m.group(1)))
+                    return
+            if proc.exited:
+                return
+            time.sleep(0.5)
+    threading.Thread(target=run, daemon=True).start()
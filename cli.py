@@ -0,0 +1,241 @@
+"""App Launcher sans interface graphique.
+
+    python cli.py list
+    python cli.py status [CONFIG]
+    python cli.py launch CONFIG [--only APP ...] [--local]
+    python cli.py stop CONFIG [--local]
+    python cli.py logs APP [-n 50] [--follow]
+    python cli.py watch CONFIG [--local]
+    python cli.py ports [CONFIG] [--release]
+    python cli.py daemon [--metrics-port 9464]
+
+Si un démon tourne (`python cli.py daemon`), les commandes lui sont
+transmises : l'interface et toutes les CLI partagent alors la même table de
+processus, et `launch` rend la main dès les apps prêtes. Sans démon, `launch`
+reste attaché aux apps lancées et affiche leur sortie ; Ctrl+C les arrête.
+`watch` relance une app (et celles qui en dépendent) quand son jar, son
+fichier compose ou son dossier de configuration change. `ports` liste les
+ports attribués aux ${port:nom} de chaque config ; --release les rend.
+N'importe jamais tkinter.
+"""
+import argparse, os, sys, time
+
+from store import CONFIG_FILE
+
+FOLLOW_POLL = 0.5   # secondes entre deux lectures du fichier de log suivi
+
+def _print(text, app=None):
+    print(text, flush=True)
+
+def _client(args):
+    """Client du démon s'il répond, None sinon (ou avec --local)"""
+    if getattr(args, "local", False):
+        return None
+    from daemon import Client
+    client = Client(args.socket) if args.socket else Client()
+    return client if client.available() else None
+
+def _service(args):
+    from service import LauncherService
+    return LauncherService(args.config_file)
+
+def _exit_code(result):
+    return 1 if any(s in ("failed", "invalid") for s in result.values()) else 0
+
+# ─── COMMANDES ───────────────────────────────────────────────────────
+def cmd_list(args):
+    from store import Manager
+    mgr = Manager(args.config_file)
+    if mgr.load_error:
+        print(f"⚠ {mgr.load_error}", file=sys.stderr)
+    for cfg in mgr.data["configs"]:
+        print(f"{cfg['name']} ({len(cfg['apps'])} app(s))")
+        for app in cfg["apps"]:
+            print(f"  {app.get('name','?'):<30} {app.get('type','')}")
+    return 0
+
+def cmd_status(args):
+    client = _client(args)
+    rows = client.call("status", config=args.name) if client else _service(args).status(args.name)
+    width = max((len(r["name"]) for r in rows), default=10)
+    config = None
+    for r in rows:
+        if r["config"] != config:
+            config = r["config"]
+            print(config)
+        state = "● en cours" if r["running"] else "○ arrêtée"
+        print(f"  {r['name']:<{width}}  {state:<10}  {r['detail']}")
+    return 0
+
+def cmd_launch(args):
+    client = _client(args)
+    if client:
+        return _exit_code(client.call("launch", _print, config=args.name, only=args.only))
+    service = _service(args)
+    names = {a.get("name") for a in service.config(args.name)["apps"]}
+
+    def on_line(proc, stream, text):
+        if proc.name in names:
+            _print(f"  [{proc.name}] {text}")
+    service.sup.listeners.append(on_line)
+    result = service.launch(args.name, _print, only=args.only)
+    if not any(p.alive for p in service.sup.procs.values()):
+        return _exit_code(result)
+    # Les apps écrivent dans nos tubes : partir les priverait de leur sortie
+    print("— Sortie des apps (Ctrl+C pour les arrêter) —", flush=True)
+    try:
+        while any(p.alive for p in service.sup.procs.values()):
+            time.sleep(FOLLOW_POLL)
+    except KeyboardInterrupt:
+        service.sup.listeners.remove(on_line)
+        service.stop(args.name, _print)
+    return _exit_code(result)
+
+def cmd_stop(args):
+    client = _client(args)
+    result = client.call("stop", _print, config=args.name) if client else _service(args).stop(args.name, _print)
+    return 1 if any(s == "failed" for s in result.values()) else 0
+
+def cmd_logs(args):
+    client = _client(args)
+    if client:
+        try:
+            client.call("logs", _print, app=args.app, lines=args.lines, follow=args.follow)
+        except (KeyboardInterrupt, BrokenPipeError):
+            pass
+        return 0
+    # Sans démon : fichier de log écrit par le processus qui supervise l'app
+    from service import LOG_DIR, tail_file
+    from supervisor import Supervisor
+    path = Supervisor(log_dir=LOG_DIR).log_path(args.app)
+    for line in tail_file(path, args.lines):
+        print(line)
+    if not args.follow:
+        return 0
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            f.seek(0, os.SEEK_END)
+            while True:
+                line = f.readline()
+                if line:
+                    print(line, end="", flush=True)
+                    continue
+                time.sleep(FOLLOW_POLL)
+                if os.path.getsize(path) < f.tell():
+                    f.seek(0)   # fichier tourné
+    except (KeyboardInterrupt, BrokenPipeError):
+        return 0
+    except OSError as ex:
+        print(f"❌ {ex}", file=sys.stderr)
+        return 1
+
+def cmd_watch(args):
+    from store import Manager
+    from watch import Watcher
+    client = _client(args)
+    service = None if client else _service(args)
+    cfg = Manager(args.config_file).get_config(args.name)
+    if cfg is None:
+        raise KeyError(f"Config inconnue : {args.name}")
+
+    def on_change(names):
+        print(f"— Modifié : {', '.join(sorted(names))} —", flush=True)
+        try:
+            if client:
+                client.call("restart", _print, config=args.name, apps=sorted(names))
+            else:
+                service.restart(args.name, names, _print)
+        except Exception as ex:
+            print(f"❌ {ex}", file=sys.stderr, flush=True)
+    watcher = Watcher(cfg["apps"], on_change)
+    if not watcher.paths:
+        print("Rien à surveiller : aucun jar, fichier compose ou dossier de configuration", file=sys.stderr)
+        return 1
+    print(f"Surveillance de {len(watcher.paths)} chemin(s) ({watcher.mode}), Ctrl+C pour arrêter", flush=True)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        watcher.stop()
+    return 0
+
+def cmd_ports(args):
+    from ports import PORTS
+    if args.release:
+        if not args.name:
+            print("❌ --release demande une config", file=sys.stderr)
+            return 1
+        freed = PORTS.release(args.name)
+        print(f"{len(freed)} port(s) rendu(s) : {args.name}")
+        return 0
+    for config, ports in sorted(PORTS.reservations().items()):
+        if args.name in (None, config):
+            print(config)
+            for name, port in sorted(ports.items()):
+                print(f"  {name:<20} {port}")
+    return 0
+
+def cmd_daemon(args):
+    from daemon import serve, supported, SOCKET_PATH
+    if not supported():
+        print("❌ Sockets unix indisponibles sur cette plateforme", file=sys.stderr)
+        return 1
+    path = args.socket or SOCKET_PATH
+    service = _service(args)
+    if args.metrics_port:
+        import metrics
+        from resources import Sampler
+        sampler = Sampler(service.sup).start()
+        metrics.serve(sampler, args.metrics_port)
+        print(f"Métriques Prometheus : http://{metrics.METRICS_HOST}:{args.metrics_port}/metrics", flush=True)
+    print(f"Démon à l'écoute sur {path} (Ctrl+C pour arrêter, les apps continuent)", flush=True)
+    serve(service, path)
+    return 0
+
+# ─── MAIN ────────────────────────────────────────────────────────────
+def main(argv=None):
+    p = argparse.ArgumentParser(description="App Launcher sans interface graphique")
+    p.add_argument("--config-file", default=CONFIG_FILE)
+    p.add_argument("--socket", help="socket du démon")
+    sub = p.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="configs et apps").set_defaults(fn=cmd_list)
+    s = sub.add_parser("status", help="apps en cours")
+    s.add_argument("name", nargs="?")
+    s.add_argument("--local", action="store_true", help="sans passer par le démon")
+    s.set_defaults(fn=cmd_status)
+    s = sub.add_parser("launch", help="lance une config")
+    s.add_argument("name")
+    s.add_argument("--only", nargs="+", help="apps à lancer")
+    s.add_argument("--local", action="store_true", help="sans passer par le démon")
+    s.set_defaults(fn=cmd_launch)
+    s = sub.add_parser("stop", help="arrête une config")
+    s.add_argument("name")
+    s.add_argument("--local", action="store_true", help="sans passer par le démon")
+    s.set_defaults(fn=cmd_stop)
+    s = sub.add_parser("logs", help="sortie d'une app")
+    s.add_argument("app")
+    s.add_argument("-n", "--lines", type=int, default=50)
+    s.add_argument("-f", "--follow", action="store_true")
+    s.set_defaults(fn=cmd_logs)
+    s = sub.add_parser("watch", help="relance les apps dont les fichiers changent")
+    s.add_argument("name")
+    s.add_argument("--local", action="store_true", help="sans passer par le démon")
+    s.set_defaults(fn=cmd_watch)
+    s = sub.add_parser("ports", help="ports attribués aux ${port:nom}")
+    s.add_argument("name", nargs="?")
+    s.add_argument("--release", action="store_true", help="rend les ports de la config")
+    s.set_defaults(fn=cmd_ports)
+    s = sub.add_parser("daemon", help="superviseur partagé sur socket unix")
+    s.add_argument("--metrics-port", type=int, default=int(os.environ.get("APP_LAUNCHER_METRICS_PORT") or 0),
+                   help="expose les métriques Prometheus sur 127.0.0.1:PORT")
+    s.set_defaults(fn=cmd_daemon)
+    args = p.parse_args(argv)
+    try:
+        return args.fn(args)
+    except KeyError as ex:
+        print(f"❌ {ex.args[0]}", file=sys.stderr)
+    except Exception as ex:
+        print(f"❌ {ex}", file=sys.stderr)
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+import json, os, queue, signal, socket, socketserver, threading
+
+from service import LOG_DIR
+
+SOCKET_PATH = os.environ.get("APP_LAUNCHER_SOCKET", os.path.join(LOG_DIR, "launcher.sock"))
+HEARTBEAT = 1.0   # secondes entre deux messages vides pendant un suivi de logs
+CONNECT_TIMEOUT = 0.5
+
+class DaemonError(RuntimeError):
+    pass
+
+def supported():
+    return hasattr(socket, "AF_UNIX")
+
+# ─── SERVEUR ─────────────────────────────────────────────────────────
+# Protocole : une requête JSON par connexion, puis des lignes JSON en réponse :
+# {"log": texte, "app": nom} … et pour finir {"result": …} ou {"error": message}.
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.gone = False
+        self._lock = threading.Lock()
+        line = self.rfile.readline()
+        if not line:
+            return   # simple test de connexion (Client.available)
+        try:
+            req = json.loads(line)
+        except ValueError as ex:
+            self.send({"error": f"Requête invalide : {ex}"})
+            return
+        try:
+            result = self.dispatch(req)
+        except Exception as ex:
+            self.send({"error": str(ex.args[0]) if isinstance(ex, KeyError) else str(ex)})
+        else:
+            self.send({"result": result})
+
+    def send(self, obj):
+        """Un client parti n'interrompt pas un lancement en cours : on cesse juste d'écrire"""
+        if self.gone:
+            return
+        data = (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            try:
+                self.wfile.write(data)
+                self.wfile.flush()
+            except OSError:
+                self.gone = True
+
+    def log(self, text, app=None):
+        self.send({"log": text, "app": app})
+
+    def dispatch(self, req):
+        service = self.server.service
+        cmd = req.get("cmd")
+        if cmd == "ping":
+            return {"pid": os.getpid()}
+        if cmd == "launch":
+            return service.launch(req["config"], self.log, only=req.get("only"))
+        if cmd == "restart":
+            return service.restart(req["config"], req["apps"], self.log)
+        if cmd == "stop":
+            return service.stop(req["config"], self.log)
+        if cmd == "status":
+            return service.status(req.get("config"))
+        if cmd == "logs":
+            app = req["app"]
+            for line in service.tail(app, int(req.get("lines", 50))):
+                self.log(line, app)
+            if req.get("follow"):
+                self._follow(app)
+            return None
+        raise DaemonError(f"Commande inconnue : {cmd}")
+
+    def _follow(self, app):
+        lines = queue.Queue()
+        stop = threading.Event()
+        t = threading.Thread(target=self.server.service.follow, args=(app, lines.put, stop), daemon=True)
+        t.start()
+        try:
+            while not self.gone:
+                try:
+                    self.log(lines.get(timeout=HEARTBEAT), app)
+                except queue.Empty:
+                    self.send({})   # détecte le départ du client
+        finally:
+            stop.set()
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def serve(service, path=SOCKET_PATH):
+    """Sert `service` (LauncherService) sur une socket unix jusqu'à Ctrl+C ou SIGTERM"""
+    if Client(path).available():
+        raise DaemonError(f"Un démon écoute déjà sur {path}")
+    if os.path.exists(path):
+        os.remove(path)   # socket d'un démon précédent mort
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    server = _Server(path, _Handler)
+    server.service = service
+    os.chmod(path, 0o600)   # réservé à l'utilisateur courant
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+# ─── CLIENT ──────────────────────────────────────────────────────────
+class Client:
+    """Connexion au démon : une requête par appel de call()"""
+    def __init__(self, path=SOCKET_PATH):
+        self.path = path
+
+    def _connect(self):
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        s.settimeout(CONNECT_TIMEOUT)
+        try:
+            s.connect(self.path)
+        except OSError:
+            s.close()
+            raise
+        s.settimeout(None)
+        return s
+
+    def available(self):
+        if not supported() or not os.path.exists(self.path):
+            return False
+        try:
+            self._connect().close()
+            return True
+        except OSError:
+            return False
+
+    def call(self, cmd, on_log=None, **args):
+        """Envoie une commande ; on_log(texte, app) reçoit le journal ; renvoie le résultat"""
+        with self._connect() as s:
+            s.sendall((json.dumps(dict(args, cmd=cmd), ensure_ascii=False) + "\n").encode("utf-8"))
+            with s.makefile("rb") as f:
+                for raw in f:
+                    msg = json.loads(raw)
+                    if "log" in msg:
+                        if on_log:
+                            on_log(msg["log"], msg.get("app"))
+                    elif "result" in msg:
+                        return msg["result"]
+                    elif "error" in msg:
+                        raise DaemonError(msg["error"])
+        raise DaemonError("Connexion au démon interrompue")
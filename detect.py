@@ -0,0 +1,222 @@
+import json, os, re, shlex, subprocess, threading
+
+from ports import PORT_RE
+
+# Paramètres qui identifient une app : même type + mêmes valeurs = même app
+IDENTITY_KEYS = {
+    "Spring Boot":    ("jar", "run_config"),
+    "ActiveMQ":       ("home",),
+    "Elasticsearch":  ("home",),
+    "Podman":         ("container",),
+    "Podman Machine": (),
+    "Docker Compose": ("directory", "compose_file"),
+}
+PATH_KEYS = {"jar", "home", "directory"}
+
+def app_identity(app):
+    """Clé d'identité d'une app, None pour celles qui ne se partagent pas (Timer)"""
+    atype = app.get("type","")
+    keys = IDENTITY_KEYS.get(atype)
+    if keys is None:
+        return None
+    values = []
+    for key in keys:
+        v = str(app.get(key) or "").strip()
+        if key in PATH_KEYS and v:
+            v = os.path.normcase(os.path.normpath(v))
+        elif key == "compose_file":
+            v = v or "docker-compose.yaml"
+        else:
+            v = " ".join(v.split())
+        values.append(v)
+    return (atype, *values)
+
+# ─── PID ─────────────────────────────────────────────────────────────
+def pid_alive(pid):
+    if not pid or pid <= 0:
+        return False
+    if os.name == "nt":
+        import ctypes
+        PROCESS_QUERY_LIMITED_INFORMATION, STILL_ACTIVE = 0x1000, 259
+        k32 = ctypes.windll.kernel32
+        h = k32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not h:
+            return False
+        code = ctypes.c_ulong()
+        try:
+            return bool(k32.GetExitCodeProcess(h, ctypes.byref(code))) and code.value == STILL_ACTIVE
+        finally:
+            k32.CloseHandle(h)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def pid_matches(pid, token):
+    """Évite les faux positifs dus à la réutilisation des PID (Linux uniquement)"""
+    if not token:
+        return True
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            cmdline = f.read().replace(b"\0", b" ").decode("utf-8", "replace")
+    except OSError:
+        return True   # pas de /proc : on se fie au PID
+    return token in cmdline
+
+def read_pid_file(path):
+    """Fichier PID : PID sur la 1re ligne, éventuellement la commande ensuite"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            first = f.readline().strip()
+        return int(first)
+    except (OSError, ValueError):
+        return None
+
+def read_pid_cmd(path):
+    """Commande enregistrée sous le PID (fichiers du superviseur), None sinon"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            f.readline()
+            return f.readline().strip() or None
+    except OSError:
+        return None
+
+def cmd_matches(app, cmd):
+    """La commande d'un processus lancé est-elle celle de cette app (même identité) ?
+
+    Deux apps de même nom dans deux configs (home, jar ou arguments
+    différents) ne se confondent pas. Une commande inconnue ne prouve rien.
+    """
+    if not cmd:
+        return True
+    text = cmd if isinstance(cmd, str) else " ".join(cmd)
+    norm = lambda p: os.path.normcase(os.path.normpath(p))
+    has = lambda path: path in text or norm(path) in norm(text) if path else True
+    t = app.get("type","")
+    if t in ("ActiveMQ", "Elasticsearch"):
+        home = app.get("home","").strip()
+        return has(os.path.join(home, "bin")) if home else True
+    if t != "Spring Boot":
+        return True
+    jar = app.get("jar","").strip()
+    if jar:
+        # Disposition extraite (cds.find_extracted) : <dossier>/<nom>/<jar>
+        stem = os.path.splitext(os.path.basename(jar))[0]
+        extracted = [app.get("extracted","").strip(),
+                     os.path.join(os.path.dirname(jar), stem, os.path.basename(jar))]
+        if not has(jar) and not any(p and has(p) for p in extracted):
+            return False
+    try:
+        args = shlex.split(app.get("run_config","").strip(), posix=os.name != "nt")
+    except ValueError:
+        return True
+    words = text.split()
+    for arg in args:
+        if PORT_RE.search(arg):
+            # Port attribué au lancement : n'importe quel nombre à sa place
+            pattern = re.compile("".join(r"\d+" if k % 2 else re.escape(part)
+                                         for k, part in enumerate(PORT_RE.split(arg))) + "$")
+            if not any(pattern.match(w) for w in words):
+                return False
+        elif arg not in words:
+            return False
+    return True
+
+# ─── DÉTECTION ───────────────────────────────────────────────────────
+class RunningState:
+    """Détecte les apps déjà démarrées ; résultats mémorisés pour un lancement.
+
+    Renvoie (en cours ?, détail) pour chaque app, selon son type : processus
+    supervisé ou fichier PID pour les JVM, état du container pour Podman,
+    état de la machine, `compose ps` pour Docker Compose.
+    """
+    def __init__(self, supervisor=None, podman=None):
+        self.supervisor = supervisor
+        self.podman = podman
+        self._cache = {}
+        self._machine = None
+        self._lock = threading.Lock()
+
+    def check(self, app):
+        # Par identité : deux apps homonymes de configs différentes sont distinctes
+        key = app_identity(app) or (app.get("type",""), app.get("name",""))
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+        try:
+            result = self._check(app)
+        except Exception as ex:
+            result = (False, f"état inconnu ({ex})")
+        with self._lock:
+            self._cache[key] = result
+        return result
+
+    def _check(self, app):
+        atype = app.get("type","")
+        if atype in ("Spring Boot", "ActiveMQ", "Elasticsearch"):
+            return self._check_process(app)
+        if atype == "Podman":
+            if self.podman is None:
+                return False, ""
+            info = self.podman.state(app.get("container","").strip())
+            if info and info["state"] == "running":
+                return True, f"container {info['state']}" + (f" ({info['health']})" if info["health"] else "")
+            return False, ""
+        if atype == "Podman Machine":
+            return self._check_machine()
+        if atype == "Docker Compose":
+            return self._check_compose(app)
+        return False, ""
+
+    def _check_process(self, app):
+        name = app.get("name","")
+        sup = self.supervisor
+        proc = sup.get(name) if sup else None
+        if proc is not None and proc.alive and cmd_matches(app, proc.cmd):
+            return True, f"PID {proc.pid} (supervisé)"
+        pid, path = find_pid(app, sup)
+        if pid:
+            return True, f"PID {pid} ({os.path.basename(path)})"
+        return False, ""
+
+    def _check_machine(self):
+        if self._machine is None:
+            out = subprocess.run(["podman", "machine", "list", "--format", "json"],
+                                 capture_output=True, text=True, timeout=30)
+            machines = json.loads(out.stdout or "[]") if out.returncode == 0 else []
+            self._machine = any(m.get("Running") for m in machines)
+        return (True, "machine démarrée") if self._machine else (False, "")
+
+    def _check_compose(self, app):
+        directory = app.get("directory","").strip() or None
+        compose_file = app.get("compose_file","").strip() or "docker-compose.yaml"
+        out = subprocess.run(["podman", "compose", "-f", compose_file, "ps", "-q"], cwd=directory,
+                             capture_output=True, text=True, timeout=60)
+        ids = out.stdout.split() if out.returncode == 0 else []
+        return (True, f"{len(ids)} container(s) en cours") if ids else (False, "")
+
+def find_pid(app, supervisor=None):
+    """(PID, fichier PID) d'un processus de l'app encore en vie, (None, None) sinon"""
+    paths = []
+    if supervisor is not None and supervisor.log_dir:
+        paths.append(supervisor.pid_path(app.get("name","")))
+    if app.get("type") == "ActiveMQ" and app.get("home"):
+        paths.append(os.path.join(app["home"].strip(), "data", "activemq.pid"))
+    token = process_token(app)
+    for path in paths:
+        pid = read_pid_file(path)
+        if pid and pid_alive(pid) and pid_matches(pid, token) and cmd_matches(app, read_pid_cmd(path)):
+            return pid, path
+    return None, None
+
+def process_token(app):
+    """Fragment attendu dans la ligne de commande du processus de l'app"""
+    t = app.get("type","")
+    if t == "Spring Boot":
+        return os.path.basename(app.get("jar","").strip())
+    if t in ("ActiveMQ", "Elasticsearch"):
+        return "activemq" if t == "ActiveMQ" else "elasticsearch"
+    return ""
@@ -0,0 +1,511 @@
+import heapq, os, shlex, subprocess, threading, time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from probes import build_probes
+from preflight import preflight, is_enabled, SCRIPT_EXT
+from supervisor import Supervisor, RestartPolicy
+from cds import CdsCache, watch_started
+from podman import PodmanBackend
+from detect import RunningState
+from timeline import Timeline
+from admission import Admission
+from build import BUILDER
+from metrics import METRICS
+
+MAX_PARALLEL = 8
+
+# Types dont la commande se termine une fois le travail fait (le succès = code 0)
+ONESHOT_TYPES = {"Podman", "Podman Machine", "Docker Compose"}
+# Types dont les entrées consécutives peuvent partir ensemble (démarrages groupés)
+BATCH_TYPES = {"Podman"}
+
+# ─── GRAPHE DE DÉPENDANCES ──────────────────────────────────────────
+class GraphError(ValueError):
+    pass
+
+def parse_depends(value):
+    """Normalise `depends_on` (liste ou chaîne séparée par des virgules)"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [v.strip() for v in value if v and v.strip()]
+
+class LaunchGraph:
+    """Graphe des apps d'une config.
+
+    Si aucune app ne déclare `depends_on`, chaque app dépend de la précédente :
+    on retrouve l'ordre séquentiel historique. Seule exception, une suite de
+    containers Podman consécutifs part d'un bloc (un seul démarrage groupé).
+    Sinon seules les dépendances déclarées comptent et les apps
+    indépendantes partent en même temps.
+    """
+    def __init__(self, apps):
+        self.apps = list(apps)
+        self.declared = any(parse_depends(a.get("depends_on")) for a in self.apps)
+        n = len(self.apps)
+        if self.declared:
+            index = {}
+            for i, app in enumerate(self.apps):
+                index.setdefault(app.get("name", ""), []).append(i)
+            self.deps = []
+            for i, app in enumerate(self.apps):
+                deps = []
+                for dep in parse_depends(app.get("depends_on")):
+                    idx = index.get(dep)
+                    if not idx:
+                        raise GraphError(f"« {app.get('name','?')} » dépend d'une app inconnue : {dep}")
+                    if len(idx) > 1:
+                        raise GraphError(f"Nom d'app ambigu dans depends_on : {dep}")
+                    if idx[0] not in deps:
+                        deps.append(idx[0])
+                self.deps.append(deps)
+        else:
+            self.deps = []
+            prev, run = [], []
+            for i, app in enumerate(self.apps):
+                if app.get("type") in BATCH_TYPES and run and self.apps[run[0]].get("type") == app.get("type"):
+                    run.append(i)
+                    self.deps.append(list(prev))
+                    continue
+                prev = run or ([i-1] if i else [])
+                run = [i]
+                self.deps.append(list(prev))
+        self.children = [[] for _ in range(n)]
+        for i, deps in enumerate(self.deps):
+            for d in deps:
+                self.children[d].append(i)
+        self._check_cycles()
+
+    def _check_cycles(self):
+        WHITE, GREY, BLACK = 0, 1, 2
+        color = [WHITE] * len(self.apps)
+        for root in range(len(self.apps)):
+            if color[root] != WHITE:
+                continue
+            stack = [(root, iter(self.deps[root]))]
+            path = [root]
+            color[root] = GREY
+            while stack:
+                node, it = stack[-1]
+                nxt = next(it, None)
+                if nxt is None:
+                    color[node] = BLACK
+                    stack.pop()
+                    path.pop()
+                elif color[nxt] == GREY:
+                    cycle = path[path.index(nxt):] + [nxt]
+                    names = " → ".join(self.apps[i].get("name", "?") for i in reversed(cycle))
+                    raise GraphError(f"Cycle de dépendances : {names}")
+                elif color[nxt] == WHITE:
+                    color[nxt] = GREY
+                    path.append(nxt)
+                    stack.append((nxt, iter(self.deps[nxt])))
+
+    def order(self):
+        """Ordre topologique, stable par rapport à l'ordre de la liste"""
+        pending = [len(d) for d in self.deps]
+        ready = [i for i, p in enumerate(pending) if not p]
+        heapq.heapify(ready)
+        out = []
+        while ready:
+            i = heapq.heappop(ready)
+            out.append(i)
+            for c in self.children[i]:
+                pending[c] -= 1
+                if not pending[c]:
+                    heapq.heappush(ready, c)
+        return out
+
+    def critical_path(self, times):
+        """Chaîne de dépendances qui a fini en dernier, d'après {idx: (début, fin)}"""
+        if not times:
+            return []
+        node = max(times, key=lambda i: times[i][1])
+        path = [node]
+        while True:
+            deps = [d for d in self.deps[node] if d in times]
+            if not deps:
+                break
+            node = max(deps, key=lambda d: times[d][1])
+            path.append(node)
+        return path[::-1]
+
+# ─── COMMANDES ──────────────────────────────────────────────────────
+def build_argv(app, jvm_opts=()):
+    """Ligne de commande de l'app sous forme de liste d'arguments (lancée sans shell)"""
+    t = app.get("type","")
+    if t == "Spring Boot":
+        rc = app.get("run_config","").strip()
+        return ["java", *jvm_opts, "-jar", app.get("jar","").strip(), *shlex.split(rc, posix=os.name != "nt")]
+    elif t == "ActiveMQ":
+        home = app.get("home","").strip()
+        # Sous Linux "start" passe en démon : "console" garde le broker au premier plan
+        return [os.path.join(home, "bin", "activemq" + SCRIPT_EXT), "start" if os.name == "nt" else "console"]
+    elif t == "Elasticsearch":
+        return [os.path.join(app.get("home","").strip(), "bin", "elasticsearch" + SCRIPT_EXT)]
+    elif t == "Podman":
+        return ["podman", "start", app.get("container","").strip()]
+    elif t == "Podman Machine":
+        return ["podman", "machine", "start"]
+    elif t == "Docker Compose":
+        compose_file = app.get("compose_file","").strip() or "docker-compose.yaml"
+        return ["podman", "compose", "-f", compose_file, "up", "-d"]
+    return None
+
+def format_argv(argv):
+    """Affichage d'une liste d'arguments comme on la taperait dans un terminal"""
+    return subprocess.list2cmdline(argv) if os.name == "nt" else shlex.join(argv)
+
+def app_cwd(app):
+    """Répertoire de travail du processus de l'app"""
+    t = app.get("type","")
+    if t == "Docker Compose":
+        return app.get("directory","").strip() or None
+    if t == "Spring Boot":
+        path = app.get("path","").strip()
+        return path if path and os.path.isdir(path) else None
+    return None
+
+# ─── MOTEUR DE LANCEMENT ────────────────────────────────────────────
+class LaunchEngine:
+    """Lance les apps d'une config en parallèle, dans l'ordre du graphe.
+
+    `log(msg, app=None)` peut être appelé depuis n'importe quel thread.
+    """
+    def __init__(self, apps, log, max_parallel=MAX_PARALLEL, supervisor=None, report=None, cds=None,
+                 podman=None, only=None, skip_running=True, timeline=None, runs_dir=None,
+                 admission=None, plan=None, builder=None, ports=None):
+        self.graph = LaunchGraph(apps)
+        self.log = log
+        self.supervisor = supervisor or Supervisor()
+        self.cds = cds or CdsCache()
+        self.podman = podman or PodmanBackend()
+        self.only = set(only) if only is not None else None   # noms à (re)lancer, None = toutes
+        self.skip_running = skip_running
+        self.already_running = set()
+        self.report = report    # PreflightReport déjà calculé (sinon fait au début de run)
+        self.timeline = timeline or Timeline()
+        self.runs_dir = runs_dir   # archive des timelines, None = pas d'archive
+        self.admission = admission or Admission()
+        self.builder = builder or BUILDER
+        self.builds = {}   # index -> Future du build Maven de l'app
+        self._group = None     # lot de containers Podman en cours de constitution
+        self._groups = {}      # index -> lot admis (place d'admission partagée)
+        self._group_lock = threading.Lock()
+        self.ports = dict(ports or {})   # ${port:nom} -> port, déjà substitués dans `apps`
+        # Plan compilé (plan.LaunchPlan) : commandes, répertoires et validation déjà calculés
+        self.plan = plan if plan is not None and len(plan.entries) == len(self.graph.apps) else None
+        self.max_parallel = max(1, int(max_parallel or 1))
+        self.status = {}
+        self.times = {}
+        self.ready_waits = {}
+        self._t0 = 0.0
+        self.duration = 0.0
+
+    def run(self):
+        g = self.graph
+        pending = [len(d) for d in g.deps]
+        ready = [i for i, p in enumerate(pending) if not p]
+        heapq.heapify(ready)
+        running = {}
+        self._t0 = time.perf_counter()
+        self.running = RunningState(self.supervisor, self.podman)   # cache valable pour ce lancement
+        tl = self.timeline
+        tl.begin(None, "run")
+        if self.ports:
+            tl.meta["ports"] = dict(self.ports)
+            self.log("🔌 Ports : " + ", ".join(f"{n}={p}" for n, p in sorted(self.ports.items())))
+        if self.report is None:
+            self.report = self.plan.report() if self.plan else preflight(g.apps, timeline=tl)
+        self.log(self.report.format())
+        self._start_builds()
+
+        def release(i):
+            for c in g.children[i]:
+                pending[c] -= 1
+                if not pending[c]:
+                    heapq.heappush(ready, c)
+
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as pool:
+            while ready or running:
+                while ready:
+                    i = heapq.heappop(ready)
+                    if self.only is not None and g.apps[i].get("name") not in self.only:
+                        self.status[i] = "ok"
+                        release(i)
+                        continue
+                    if i in self.report.errors:
+                        self.status[i] = "invalid"
+                        tl.mark(g.apps[i].get("name"), "invalid")
+                        self.log(f"⚠ {g.apps[i].get('name','?')} non lancé : {self.report.errors[i]}",
+                                 g.apps[i].get("name"))
+                        release(i)
+                        continue
+                    # En mode historique, un échec n'empêche pas la suite
+                    failed = [d for d in g.deps[i] if self.status.get(d) != "ok"] if g.declared else []
+                    if failed:
+                        self.status[i] = "skipped"
+                        tl.mark(g.apps[i].get("name"), "skipped")
+                        self.log(f"⏭ {g.apps[i].get('name','?')} ignoré "
+                                 f"(dépendance en échec : {g.apps[failed[0]].get('name','?')})",
+                                 g.apps[i].get("name"))
+                        release(i)
+                        continue
+                    running[pool.submit(self._run_app, i)] = i
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    i = running.pop(fut)
+                    start, end, ok = fut.result()
+                    self.times[i] = (start, end)
+                    self.status[i] = "ok" if ok else "failed"
+                    release(i)
+        tl.end(None, "run")
+        self.duration = time.perf_counter() - self._t0
+        METRICS.observe_run(self)
+        self._report()
+        if self.runs_dir:
+            try:
+                self.log(f"📊 Timeline : {tl.save(self.runs_dir)}")
+            except OSError as ex:
+                self.log(f"⚠ Timeline non enregistrée : {ex}")
+        return self.status
+
+    def _start_builds(self):
+        """Tous les builds partent dès le début, en parallèle de l'attente des dépendances"""
+        for i, app in enumerate(self.graph.apps):
+            name = app.get("name")
+            if (app.get("type") != "Spring Boot" or not is_enabled(app.get("build"))
+                    or i in self.report.errors or (self.only is not None and name not in self.only)):
+                continue
+            # Une app déjà lancée ne sera pas relancée : inutile de reconstruire son jar
+            if self.skip_running and self.running.check(app)[0]:
+                continue
+            self.builds[i] = self.builder.submit(
+                app, lambda msg, name=name: self.log(f"  [{name}] {msg}", name), self.timeline)
+
+    def _report(self):
+        g = self.graph
+        total = self.duration
+        path = g.critical_path(self.times)
+        if path:
+            names = " → ".join(g.apps[i].get("name","?") for i in path)
+            span = self.times[path[-1]][1] - self.times[path[0]][0]
+            self.log(f"\n⏱ Durée totale : {total:.1f}s — chemin critique ({span:.1f}s) : {names}")
+        if self.ready_waits:
+            waits = ", ".join(f"{g.apps[i].get('name','?')} {s:.1f}s"
+                              for i, s in sorted(self.ready_waits.items()))
+            self.log(f"⏳ Attentes de disponibilité : {waits}")
+
+    def _run_app(self, i):
+        app = self.graph.apps[i]
+        start = time.perf_counter() - self._t0
+        self.timeline.begin(app.get("name"), "start")
+        try:
+            ok = self._start_app(i, app)
+        except Exception as ex:
+            self.log(f"  [{app.get('name','?')}] ❌ Erreur : {ex}", app.get("name"))
+            ok = False
+        finally:
+            self._release(i)   # prête ou en échec : la place revient à la suivante
+        self.timeline.end(app.get("name"), "start")
+        if not ok:
+            self.timeline.mark(app.get("name"), "failed")
+        return start, time.perf_counter() - self._t0, ok
+
+    def _start_app(self, i, app):
+        atype = app.get("type","")
+        name  = app.get("name","?")
+
+        def write(msg):
+            self.log(f"  [{name}] {msg}", name)
+
+        self.log(f"▶ {name} [{atype}]…", name)
+
+        if self.skip_running and atype != "Timer":
+            running, detail = self.running.check(app)
+            if running:
+                write(f"⏩ Déjà en cours ({detail}), non relancé")
+                self.already_running.add(i)
+                self.timeline.mark(name, "already_running")
+                proc = self.supervisor.get(name)
+                proc = proc if proc is not None and proc.alive else None
+                if proc is not None:
+                    self._watch(i, app)
+                probes = build_probes(app, log_source=proc.output.reader() if proc else None,
+                                      podman=self.podman)
+                # Sans sortie capturée, une sonde de log ne pourrait jamais réussir
+                probes = [p for p in probes if not (p.kind == "log" and p.source is None and not p.file)]
+                return self._wait_ready(i, probes, write, proc)
+
+        if atype == "Timer":
+            seconds = int(app.get("seconds","0"))
+            write(f"⏱️ Attente de {seconds} seconde(s)...")
+            for elapsed in range(seconds):
+                time.sleep(1)
+                remaining = seconds - elapsed - 1
+                if remaining > 0:
+                    write(f"{remaining}s...")
+            write("✅ Délai écoulé")
+            return True
+
+        build = self.builds.get(i)
+        if build is not None and not build.result():
+            return False
+
+        if atype == "Podman":
+            self._admit_podman(i, app, write)
+            container = app.get("container","").strip()
+            probes = build_probes(app, podman=self.podman)
+            write(f"podman start {container}")
+            self.timeline.mark(name, "spawn")
+            ok, msg = self.podman.start(container)
+            write(f"✅ {container} : {msg}" if ok else f"❌ {container} : {msg}")
+            return ok and self._wait_ready(i, probes, write, None)
+
+        self._admit(i, app, write)
+        entry = self.plan.entries[i] if self.plan else None
+        argv = entry.argv if entry else build_argv(app)
+        cds_plan = None
+        if atype == "Spring Boot" and is_enabled(app.get("cds")):
+            cds_plan = self.cds.prepare(app)
+            if cds_plan.note:
+                write(cds_plan.note)
+            if cds_plan.mode is None:
+                write("CDS : JVM < 13 ou introuvable, lancement sans archive")
+            else:
+                write("CDS : archive trouvée" if cds_plan.mode == "use" else "CDS : génération de l'archive")
+            argv = build_argv(dict(app, jar=cds_plan.jar), cds_plan.flags)
+        if not argv:
+            write("⚠ Type inconnu, ignoré.")
+            return False
+        proc = self.supervisor.create(name, list(argv), cwd=entry.cwd if entry else app_cwd(app),
+                                      env=dict(entry.env) if entry else app.get("env"))
+        probes = build_probes(app, log_source=proc.output.reader(), podman=self.podman)
+        for p in probes:
+            p.prepare()
+        write(f"$ {format_argv(argv)}")
+        proc.start()
+        self.timeline.attach(name, proc)
+        write(f"✅ Démarré (PID {proc.pid})")
+        if cds_plan and cds_plan.mode:
+            def started(seconds):
+                msg = self.cds.record(cds_plan, seconds)
+                if msg:
+                    write(msg)
+            watch_started(proc, started)
+        if atype in ONESHOT_TYPES:
+            code = proc.wait()
+            if code != 0:
+                write(f"❌ Code de sortie {code}")
+                return False
+        else:
+            self._watch(i, app)
+        return self._wait_ready(i, probes, write, proc)
+
+    def _watch(self, i, app):
+        """Confie au superviseur le redémarrage automatique de l'app (clé `restart`)"""
+        policy = RestartPolicy.from_app(app)
+        self.supervisor.set_policy(app.get("name",""), policy,
+                                   deps_ready=(lambda: self._deps_ready(i)) if policy else None)
+
+    def _deps_ready(self, i):
+        """(prêtes ?, détail) : dépendances de l'app en cours et sondes passantes, vérifiées à l'instant"""
+        state = RunningState(self.supervisor, self.podman)
+        for d in self.graph.deps[i]:
+            dep = self.graph.apps[d]
+            if dep.get("type") == "Timer":
+                continue
+            running, _ = state.check(dep)
+            if not running:
+                return False, f"{dep.get('name','?')} arrêté"
+            for p in build_probes(dep, podman=self.podman):
+                if p.kind == "log":
+                    continue   # les lignes déjà écrites ne disent rien de l'état actuel
+                ok, detail = p.check()
+                if not ok:
+                    return False, f"{dep.get('name','?')} pas prêt ({detail})"
+        return True, ""
+
+    def _admit(self, i, app, write, name=None):
+        """Attend une place de démarrage (voir admission.Admission)"""
+        name = name or app.get("name")
+        self.timeline.begin(name, "admission")
+        waited = self.admission.acquire(i, app, on_wait=lambda why: write(f"⏸ En attente de ressources ({why})"))
+        self.timeline.end(name, "admission")
+        if waited >= 0.1:
+            write(f"▶ Admis après {waited:.1f}s d'attente")
+
+    def _admit_podman(self, i, app, write):
+        """Admission commune des containers prêts à démarrer ensemble.
+
+        Les apps Podman qui arrivent dans la fenêtre de regroupement du backend
+        prennent une seule place, du poids de tout le lot : leurs `start`
+        partent alors ensemble et le backend les regroupe. La place est rendue
+        quand le dernier container du lot est prêt (ou en échec).
+        """
+        with self._group_lock:
+            group = self._group
+            leader = group is None
+            if leader:
+                group = self._group = {"members": [], "weight": 0.0, "admitted": threading.Event()}
+            group["members"].append(i)
+            group["weight"] += self.admission.weight(app)
+            self._groups[i] = group
+        if not leader:
+            self.timeline.begin(app.get("name"), "admission")
+            group["admitted"].wait()
+            self.timeline.end(app.get("name"), "admission")
+            return
+        time.sleep(getattr(self.podman, "window", 0))
+        with self._group_lock:
+            self._group = None
+            group["left"] = len(group["members"])
+        group["key"] = ("podman", i)
+        try:
+            if len(group["members"]) > 1:
+                write(f"Lot de {len(group['members'])} containers admis ensemble")
+            self._admit(group["key"], dict(app, weight=group["weight"]), write, name=app.get("name"))
+        finally:
+            group["admitted"].set()
+
+    def _release(self, i):
+        with self._group_lock:
+            group = self._groups.pop(i, None)
+            if group is not None:
+                group["left"] = group.get("left", 1) - 1
+                if group["left"] > 0:
+                    return
+        self.admission.release(group["key"] if group is not None and "key" in group else i)
+
+    def _wait_ready(self, i, probes, write, proc):
+        """Bloque les dépendants jusqu'à ce que toutes les sondes de l'app passent"""
+        name = self.graph.apps[i].get("name")
+        if not probes:
+            self.timeline.mark(name, "ready")
+            return True
+        oneshot = self.graph.apps[i].get("type","") in ONESHOT_TYPES
+        died = lambda: not oneshot and proc is not None and proc.exited
+        t0 = time.perf_counter()
+        self.timeline.begin(name, "readiness")
+        try:
+            for p in probes:
+                write(f"⏳ Attente de disponibilité : {p.describe()} (max {p.timeout:.0f}s)")
+                ok, elapsed, detail = p.wait(cancelled=died)
+                if not ok and died():
+                    self.ready_waits[i] = time.perf_counter() - t0
+                    write(f"❌ Processus terminé (code {proc.exit_code}) avant d'être prêt")
+                    return False
+                if not ok:
+                    self.ready_waits[i] = time.perf_counter() - t0
+                    write(f"❌ Pas prêt après {elapsed:.1f}s : {detail}")
+                    return False
+                write(f"✔ {p.describe()} en {elapsed:.1f}s ({detail})")
+        finally:
+            self.timeline.end(name, "readiness")
+        self.ready_waits[i] = time.perf_counter() - t0
+        self.timeline.mark(name, "ready")
+        write(f"✅ Prêt en {self.ready_waits[i]:.1f}s")
+        return True
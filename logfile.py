@@ -0,0 +1,306 @@
+import glob, mmap, os, re, threading, time
+from array import array
+from bisect import bisect_left
+
+BLOCK       = 64 * 1024      # octets entre deux points de l'index des lignes
+INDEX_STEP  = 64             # blocs indexés par prise du verrou
+TS_UNIT     = 4096           # finesse de la recherche dichotomique par horodatage
+TS_SCAN     = 1024 * 1024    # octets parcourus au plus pour trouver un horodatage
+TS_HEAD     = 120            # l'horodatage est cherché au début de chaque ligne
+MAX_LINE    = 4096           # caractères affichés au plus par ligne
+
+TS_RE = re.compile(rb"(\d{4})-(\d{2})-(\d{2})[ T](\d{2}):(\d{2}):(\d{2})")
+WHEN_RE = re.compile(r"^(?:(\d{4})-(\d{2})-(\d{2})[ T])?(\d{1,2}):(\d{2})(?::(\d{2}))?$")
+
+def line_ts(line):
+    """Horodatage (epoch, heure locale) en tête de ligne, None s'il n'y en a pas"""
+    m = TS_RE.search(line, 0, TS_HEAD)
+    if not m:
+        return None
+    try:
+        return time.mktime(tuple(int(g) for g in m.groups()) + (0, 0, -1))
+    except (OverflowError, ValueError):
+        return None
+
+def parse_when(text, ref=None):
+    """« 2026-01-01 12:00[:00] » ou « 12:00[:00] » (le jour de `ref`) → epoch, None sinon"""
+    m = WHEN_RE.match(text.strip())
+    if not m:
+        return None
+    y, mo, d, h, mi, s = m.groups()
+    if y is None:
+        day = time.localtime(ref if ref is not None else time.time())
+        y, mo, d = day.tm_year, day.tm_mon, day.tm_mday
+    return time.mktime((int(y), int(mo), int(d), int(h), int(mi), int(s or 0), 0, 0, -1))
+
+def log_files(app, extra=()):
+    """Fichiers de log connus d'une app, le plus récemment modifié d'abord.
+
+    ActiveMQ : <home>/data/*.log ; Elasticsearch : <home>/logs/*.log ;
+    Spring Boot : <path>/logs/*.log et <path>/*.log. `extra` : fichiers de
+    sortie capturée par le superviseur.
+    """
+    t = app.get("type")
+    if t == "ActiveMQ":
+        patterns = [("home", "data", "*.log")]
+    elif t == "Elasticsearch":
+        patterns = [("home", "logs", "*.log")]
+    elif t == "Spring Boot":
+        patterns = [("path", "logs", "*.log"), ("path", "*.log")]
+    else:
+        patterns = []
+    found = []
+    for key, *rest in patterns:
+        base = app.get(key, "").strip()
+        if base:
+            found += glob.glob(os.path.join(base, *rest))
+    found += [p for p in extra if os.path.isfile(p)]
+
+    def mtime(p):
+        try:
+            return os.stat(p).st_mtime
+        except OSError:
+            return 0
+    return sorted(dict.fromkeys(os.path.abspath(p) for p in found), key=mtime, reverse=True)
+
+# ─── FICHIER PROJETÉ EN MÉMOIRE ──────────────────────────────────────
+class LogFile:
+    """Fichier de log ouvert par mmap : rien n'est lu avant d'être affiché.
+
+    L'index des lignes est clairsemé : le nombre de sauts de ligne avant le
+    début de chaque bloc de BLOCK octets (8 octets par bloc, ~256 Ko pour
+    2 Go). Il se construit en tâche de fond (index()), la position d'une ligne
+    se retrouve depuis le point le plus proche. refresh() suit le fichier qui
+    grandit : seuls les octets ajoutés sont indexés ; un fichier tronqué ou
+    remplacé (rotation) est rouvert et réindexé.
+    Les positions manipulées sont des offsets en octets de débuts de ligne.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._f = None
+        self.mm = None
+        self.closed = False
+        self._open()
+
+    def _open(self):
+        self._unmap()
+        self._f = open(self.path, "rb")
+        st = os.fstat(self._f.fileno())
+        self.ino = st.st_ino
+        self.size = 0
+        self.marks = array("Q", [0])   # marks[k] = sauts de ligne avant k * BLOCK
+        self.indexed = 0               # octets déjà comptés
+        self.newlines = 0              # sauts de ligne dans les octets comptés
+        self._map(st.st_size)
+
+    def _map(self, size):
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+        self.size = size
+        if size:
+            self.mm = mmap.mmap(self._f.fileno(), size, access=mmap.ACCESS_READ)
+
+    def _unmap(self):
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+    def close(self):
+        with self._lock:
+            self.closed = True
+            self._unmap()
+
+    def refresh(self):
+        """Prend en compte les octets ajoutés ; renvoie "grown", "reset" ou None"""
+        with self._lock:
+            if self.closed:
+                return None
+            try:
+                st = os.stat(self.path)
+            except OSError:
+                return None
+            if st.st_ino != self.ino or st.st_size < self.size:
+                self._open()
+                return "reset"
+            if st.st_size == self.size:
+                return None
+            old = self.size
+            self._map(st.st_size)
+            if self.indexed == old:
+                while self.index():   # index complet : on n'y ajoute que les nouveaux octets
+                    pass
+            return "grown"
+
+    # ── Index des lignes ─────────────────────────────────────────────
+    @property
+    def progress(self):
+        return self.indexed / self.size if self.size else 1.0
+
+    @property
+    def lines(self):
+        """Nombre de lignes connues (toutes une fois l'index complet)"""
+        last = self.size and self.indexed == self.size and self.mm[self.size - 1:self.size] != b"\n"
+        return self.newlines + (1 if last else 0)
+
+    def index(self, blocks=INDEX_STEP):
+        """Indexe au plus `blocks` blocs ; renvoie False quand tout est indexé"""
+        with self._lock:
+            if self.closed or self.indexed >= self.size:
+                return False
+            mm = self.mm
+            for _ in range(blocks):
+                if self.indexed >= self.size:
+                    break
+                end = min(self.size, (self.indexed // BLOCK + 1) * BLOCK)
+                self.newlines += mm[self.indexed:end].count(b"\n")
+                self.indexed = end
+                if end % BLOCK == 0:
+                    self.marks.append(self.newlines)
+            return self.indexed < self.size
+
+    def index_all(self, stop=None):
+        while self.index() and not (stop and stop.is_set()):
+            time.sleep(0)   # laisse le thread Tk prendre le verrou entre deux lots
+
+    def line_offset(self, n):
+        """Offset du début de la ligne n (0 = première), None si elle n'est pas encore indexée"""
+        with self._lock:
+            if n <= 0 or self.mm is None:
+                return 0
+            if n > self.newlines:
+                return None
+            k = bisect_left(self.marks, n) - 1   # dernier bloc qui commence avant la ligne
+            pos, need = k * BLOCK, n - self.marks[k]
+            find = self.mm.find
+            for _ in range(need):
+                pos = find(b"\n", pos) + 1
+            return pos
+
+    def line_at(self, offset):
+        """Numéro (0 = première) de la ligne qui commence à `offset`, None si non indexée"""
+        with self._lock:
+            if self.mm is None:
+                return 0
+            if offset > self.indexed:
+                return None
+            k = offset // BLOCK
+            return self.marks[k] + self.mm[k * BLOCK:offset].count(b"\n")
+
+    # ── Lecture ──────────────────────────────────────────────────────
+    def line_start(self, offset):
+        """Début de la ligne qui contient `offset`"""
+        with self._lock:
+            if self.mm is None or offset <= 0:
+                return 0
+            offset = min(offset, self.size)
+            return self.mm.rfind(b"\n", 0, offset) + 1
+
+    def next_line(self, offset):
+        with self._lock:
+            if self.mm is None:
+                return 0
+            k = self.mm.find(b"\n", offset)
+            return self.size if k < 0 else k + 1
+
+    def prev_line(self, offset):
+        with self._lock:
+            if offset <= 0 or self.mm is None:
+                return 0
+            return self.mm.rfind(b"\n", 0, offset - 1) + 1
+
+    def read(self, offset, count):
+        """[(offset, ligne)] : jusqu'à `count` lignes décodées à partir de `offset`"""
+        out = []
+        with self._lock:
+            mm = self.mm
+            if mm is None:
+                return out
+            pos = offset
+            while len(out) < count and pos < self.size:
+                k = mm.find(b"\n", pos)
+                end = self.size if k < 0 else k
+                raw = mm[pos:min(end, pos + MAX_LINE * 4)]
+                out.append((pos, raw.decode("utf-8", "replace")[:MAX_LINE].rstrip("\r")))
+                pos = end + 1
+        return out
+
+    def tail_offset(self, count):
+        """Début des `count` dernières lignes"""
+        with self._lock:
+            if self.mm is None:
+                return 0
+            pos = self.size
+            if self.mm[pos - 1:pos] == b"\n":
+                pos -= 1
+            for _ in range(count):
+                if pos <= 0:
+                    return 0
+                pos = self.mm.rfind(b"\n", 0, pos)
+                if pos < 0:
+                    return 0
+            return pos + 1
+
+    # ── Horodatages ──────────────────────────────────────────────────
+    def _first_ts(self, offset, limit=TS_SCAN):
+        """(horodatage, offset) de la première ligne horodatée à partir de `offset`"""
+        mm, end = self.mm, min(self.size, offset + limit)
+        pos = self.line_start(offset) if offset else 0
+        if pos < offset:
+            pos = self.next_line(offset)
+        while pos < end:
+            ts = line_ts(mm[pos:pos + TS_HEAD])
+            if ts is not None:
+                return ts, pos
+            k = mm.find(b"\n", pos, end)
+            if k < 0:
+                break
+            pos = k + 1
+        return None
+
+    def last_ts(self):
+        """Horodatage de la dernière ligne horodatée (parmi les TS_SCAN derniers octets)"""
+        with self._lock:
+            if self.mm is None:
+                return None
+            pos = self.size
+            start = max(0, pos - TS_SCAN)
+            while pos > start:
+                pos = self.line_start(pos - 1)
+                ts = line_ts(self.mm[pos:pos + TS_HEAD])
+                if ts is not None:
+                    return ts
+            return None
+
+    def find_time(self, ts):
+        """Offset de la première ligne horodatée à `ts` ou après (fin du fichier sinon).
+
+        Recherche dichotomique par tranches de TS_UNIT octets, sans attendre
+        l'index des lignes : les logs sont supposés écrits dans l'ordre
+        chronologique.
+        """
+        with self._lock:
+            if self.mm is None:
+                return 0
+            lo, hi = 0, (self.size - 1) // TS_UNIT + 1
+            while lo < hi:
+                mid = (lo + hi) // 2
+                found = self._first_ts(mid * TS_UNIT)
+                if found is None or found[0] >= ts:
+                    hi = mid
+                else:
+                    lo = mid + 1
+            # La tranche lo-1 commence avant `ts` : la ligne cherchée est dans cette tranche ou après
+            pos = max(0, lo - 1) * TS_UNIT
+            pos = self.next_line(pos - 1) if pos else 0
+            mm, end = self.mm, min(self.size, lo * TS_UNIT + TS_SCAN)
+            while pos < end:
+                t = line_ts(mm[pos:pos + TS_HEAD])
+                if t is not None and t >= ts:
+                    return pos
+                pos = self.next_line(pos)
+            return self.line_start(pos)
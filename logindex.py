@@ -0,0 +1,318 @@
+import collections, fnmatch, re, threading, time
+from array import array
+from bisect import bisect_left, bisect_right
+
+SEGMENT_LINES = 8192               # lignes par segment
+MAX_BYTES     = 256 * 1024**2      # texte gardé au plus, les segments les plus anciens partent
+INDEX_TICK    = 0.2                # secondes entre deux passes de l'indexeur
+MAX_RESULTS   = 500
+CONTEXT_SCAN  = 50000              # lignes parcourues au plus pour trouver le contexte d'une app
+MIN_TOKEN, MAX_TOKEN = 2, 64
+
+LEVELS = {"trace": 0, "debug": 1, "info": 2, "warn": 3, "warning": 3, "error": 4, "severe": 4, "fatal": 5}
+LEVEL_NAMES = ["TRACE", "DEBUG", "INFO", "WARN", "ERROR", "FATAL"]
+LEVEL_RE = re.compile(r"\b(TRACE|DEBUG|INFO|WARN|WARNING|ERROR|SEVERE|FATAL)\b")
+TOKEN_RE = re.compile(r"\w+")
+UNITS = {"s": 1, "sec": 1, "second": 1, "seconde": 1,
+         "m": 60, "mn": 60, "min": 60, "minute": 60,
+         "h": 3600, "hr": 3600, "hour": 3600, "heure": 3600,
+         "d": 86400, "j": 86400, "day": 86400, "jour": 86400}   # pluriels : « s » final retiré
+
+def tokens(text):
+    return {t for t in TOKEN_RE.findall(text.lower()) if MIN_TOKEN <= len(t) <= MAX_TOKEN}
+
+def detect_level(text, stream):
+    """Niveau de log d'une ligne (-1 si inconnu) ; stderr sans niveau compte comme WARN"""
+    m = LEVEL_RE.search(text, 0, 200)
+    if m:
+        return LEVELS[m.group(1).lower()]
+    return LEVELS["warn"] if stream == "err" else -1
+
+def _contains(sorted_array, value):
+    k = bisect_left(sorted_array, value)
+    return k < len(sorted_array) and sorted_array[k] == value
+
+# ─── SEGMENT ─────────────────────────────────────────────────────────
+class Segment:
+    """Bloc de lignes consécutives : colonnes (horodatage, app, niveau, texte) et index inversé"""
+    def __init__(self, base):
+        self.base = base             # numéro global de la première ligne
+        self.ts = array("d")
+        self.app = array("H")
+        self.level = array("b")
+        self.text = []
+        self.postings = {}           # jeton -> array("I") des positions dans le segment
+        self.apps = set()
+        self.bytes = 0
+
+    def __len__(self):
+        return len(self.text)
+
+    def add(self, ts, app_id, level, text):
+        pos = len(self.text)
+        self.ts.append(ts)
+        self.app.append(app_id)
+        self.level.append(level)
+        self.text.append(text)
+        self.apps.add(app_id)
+        self.bytes += len(text)
+        postings = self.postings
+        for tok in tokens(text):
+            lst = postings.get(tok)
+            if lst is None:
+                lst = postings[tok] = array("I")
+            lst.append(pos)
+
+# ─── REQUÊTES ────────────────────────────────────────────────────────
+class Query:
+    """Requête analysée.
+
+    Mots (tous requis), "phrase exacte", -mot ou « not mot » (exclu),
+    app=nom (jokers * acceptés, plusieurs app= : l'une ou l'autre),
+    level>=warn / level=error, last 5 min / since 10m / last:2h.
+    « and » est implicite et ignoré.
+    """
+    def __init__(self, text):
+        self.text = text
+        self.terms, self.excluded, self.phrases, self.apps = [], [], [], []
+        self.min_level = self.level = None
+        self.since = None   # secondes dans le passé
+        text = re.sub(r"\b(?:in\s+the\s+)?(?:last|since)[\s:]+(\d+(?:\.\d+)?)\s*([a-z]+)\b",
+                      self._window, text, flags=re.I)
+        for phrase in re.findall(r'"([^"]+)"', text):
+            self.phrases.append(phrase.lower())
+            self.terms += sorted(tokens(phrase))
+        text = re.sub(r'"[^"]*"', " ", text)
+        words = text.split()
+        negate = False
+        for w in words:
+            low = w.lower()
+            if low in ("and", "&&"):
+                continue
+            if low == "not":
+                negate = True
+                continue
+            m = re.match(r"app[=:](.+)$", w, re.I)
+            if m:
+                self.apps.append(m.group(1).lower())
+                continue
+            m = re.match(r"level(>=|=|:)(\w+)$", low)
+            if m:
+                if m.group(2) not in LEVELS:
+                    raise ValueError(f"Niveau inconnu : {m.group(2)}")
+                if m.group(1) == ">=":
+                    self.min_level = LEVELS[m.group(2)]
+                else:
+                    self.level = LEVELS[m.group(2)]
+                continue
+            if low.startswith("-") and len(low) > 1:
+                negate, low = True, low[1:]
+            toks = sorted(tokens(low))
+            (self.excluded if negate else self.terms).extend(toks)
+            negate = False
+
+    def _window(self, m):
+        unit = m.group(2).lower()
+        unit = unit if unit in UNITS else unit[:-1] if unit.endswith("s") else unit
+        if unit not in UNITS:
+            return m.group(0)   # « since 3 retries » : du texte à chercher, pas une fenêtre
+        self.since = float(m.group(1)) * UNITS[unit]
+        return " "
+
+    @property
+    def empty(self):
+        return not (self.terms or self.apps or self.since or self.level is not None
+                    or self.min_level is not None)
+
+# ─── INDEX ───────────────────────────────────────────────────────────
+Hit = collections.namedtuple("Hit", "seq ts app level text")
+
+class LogIndex:
+    """Index plein texte de la sortie de toutes les apps, tenu à jour au fil de l'eau.
+
+    Les lignes arrivent par le listener du superviseur (coût : un append) et
+    sont indexées par lots dans un thread de fond, par segments de
+    SEGMENT_LINES. Une requête ne lit que les listes de positions de ses mots
+    dans les segments compatibles avec sa fenêtre de temps et ses apps, du
+    plus récent au plus ancien, et s'arrête à `limit` résultats.
+    """
+    def __init__(self, segment_lines=SEGMENT_LINES, max_bytes=MAX_BYTES):
+        self.segment_lines = segment_lines
+        self.max_bytes = max_bytes
+        self.segments = collections.deque()
+        self.app_names = []     # id -> nom
+        self.app_ids = {}       # nom -> id
+        self.lines = 0          # lignes indexées depuis le début
+        self.bytes = 0
+        self.pending = collections.deque()
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ── Alimentation ─────────────────────────────────────────────────
+    def attach(self, supervisor):
+        """S'abonne à la sortie des processus supervisés et démarre l'indexeur"""
+        supervisor.listeners.append(self.on_line)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def on_line(self, proc, stream, text):
+        self.pending.append((time.time(), proc.name, stream, text))
+
+    def _run(self):
+        while not self._stop.wait(INDEX_TICK):
+            self.flush()
+
+    def flush(self):
+        """Indexe les lignes en attente, renvoie leur nombre"""
+        n = 0
+        pending = self.pending
+        with self._lock:
+            while pending:
+                ts, app, stream, text = pending.popleft()
+                self.add(ts, app, text, detect_level(text, stream))
+                n += 1
+        return n
+
+    def add(self, ts, app, text, level=-1):
+        with self._lock:
+            app_id = self.app_ids.get(app)
+            if app_id is None:
+                app_id = self.app_ids[app] = len(self.app_names)
+                self.app_names.append(app)
+            seg = self.segments[-1] if self.segments else None
+            if seg is None or len(seg) >= self.segment_lines:
+                seg = Segment(self.lines)
+                self.segments.append(seg)
+                self._trim()
+            seg.add(ts, app_id, level, text)
+            self.lines += 1
+            self.bytes += len(text)
+
+    def _trim(self):
+        while len(self.segments) > 1 and self.bytes > self.max_bytes:
+            self.bytes -= self.segments.popleft().bytes
+
+    # ── Recherche ────────────────────────────────────────────────────
+    def _app_filter(self, patterns):
+        if not patterns:
+            return None
+        return {i for i, name in enumerate(self.app_names)
+                if any(fnmatch.fnmatchcase(name.lower(), p) for p in patterns)}
+
+    def search(self, query, limit=MAX_RESULTS, now=None):
+        """Hits du plus récent au plus ancien ; `query` est un texte ou une Query"""
+        q = query if isinstance(query, Query) else Query(query)
+        self.flush()
+        hits = []
+        with self._lock:
+            apps = self._app_filter(q.apps)
+            if apps is not None and not apps:
+                return hits
+            t_min = (now or time.time()) - q.since if q.since else None
+            for seg in reversed(self.segments):
+                if not len(seg):
+                    continue
+                if t_min is not None and seg.ts[-1] < t_min:
+                    break   # segments plus anciens : hors fenêtre
+                if apps is not None and not (seg.apps & apps):
+                    continue
+                start = bisect_left(seg.ts, t_min) if t_min is not None else 0
+                for pos in self._candidates(seg, q, start):
+                    if apps is not None and seg.app[pos] not in apps:
+                        continue
+                    lvl = seg.level[pos]
+                    if q.level is not None and lvl != q.level:
+                        continue
+                    if q.min_level is not None and lvl < q.min_level:
+                        continue
+                    text = seg.text[pos]
+                    if q.phrases and not all(p in text.lower() for p in q.phrases):
+                        continue
+                    hits.append(Hit(seg.base + pos, seg.ts[pos], self.app_names[seg.app[pos]],
+                                    LEVEL_NAMES[lvl] if lvl >= 0 else "", text))
+                    if len(hits) >= limit:
+                        return hits
+        return hits
+
+    def _candidates(self, seg, q, start):
+        """Positions du segment (décroissantes, >= start) qui contiennent tous les mots"""
+        if q.terms:
+            lists = []
+            for t in q.terms:
+                lst = seg.postings.get(t)
+                if lst is None:
+                    return []
+                lists.append(lst)
+            lists.sort(key=len)
+            found = lists[0][bisect_left(lists[0], start):]
+            # La liste la plus courte guide : dichotomie dans les autres si elles sont bien plus
+            # longues, sinon un ensemble
+            for other in lists[1:]:
+                if len(found) * 16 < len(other):
+                    found = [p for p in found if _contains(other, p)]
+                else:
+                    keep = set(other)
+                    found = [p for p in found if p in keep]
+                if not found:
+                    return []
+            positions = reversed(found)
+        else:
+            positions = range(len(seg) - 1, start - 1, -1)
+        if q.excluded:
+            excluded = set()
+            for t in q.excluded:
+                excluded.update(seg.postings.get(t, ()))
+            return (p for p in positions if p not in excluded)
+        return positions
+
+    def _locate(self, seq):
+        """(segment, position) de la ligne globale `seq`, None si elle a été évincée"""
+        segs = self.segments
+        if not segs or seq < segs[0].base:
+            return None
+        k = bisect_right([s.base for s in segs], seq) - 1
+        seg = segs[k]
+        return (k, seq - seg.base) if seq - seg.base < len(seg) else None
+
+    def context(self, seq, before=20, after=20, same_app=True):
+        """Lignes autour de `seq` : [(Hit, est-ce la ligne cherchée)]"""
+        with self._lock:
+            loc = self._locate(seq)
+            if loc is None:
+                return []
+            k, pos = loc
+            app = self.segments[k].app[pos]
+            out = []
+
+            def walk(step, count):
+                kk, pp = k, pos
+                lines = []
+                for _ in range(CONTEXT_SCAN):
+                    if len(lines) >= count:
+                        break
+                    pp += step
+                    if pp < 0 or pp >= len(self.segments[kk]):
+                        kk += step
+                        if kk < 0 or kk >= len(self.segments):
+                            break
+                        pp = len(self.segments[kk]) - 1 if step < 0 else 0
+                    seg = self.segments[kk]
+                    if same_app and seg.app[pp] != app:
+                        continue
+                    lvl = seg.level[pp]
+                    lines.append(Hit(seg.base + pp, seg.ts[pp], self.app_names[seg.app[pp]],
+                                     LEVEL_NAMES[lvl] if lvl >= 0 else "", seg.text[pp]))
+                return lines
+            out += [(h, False) for h in reversed(walk(-1, before))]
+            seg = self.segments[k]
+            lvl = seg.level[pos]
+            out.append((Hit(seq, seg.ts[pos], self.app_names[app], LEVEL_NAMES[lvl] if lvl >= 0 else "",
+                            seg.text[pos]), True))
+            out += [(h, False) for h in walk(1, after)]
+            return out
@@ -0,0 +1,29 @@
+import collections
+
+QUEUE_MAX = 200_000   # au-delà, les lignes les plus anciennes non affichées sont perdues
+
+class LogQueue:
+    """File de lignes (app, texte) alimentée par n'importe quel thread.
+
+    deque.append/popleft sont atomiques en CPython : pas de verrou côté
+    producteur, le thread Tk vide la file par lots.
+    """
+    def __init__(self, maxlen=QUEUE_MAX):
+        self._q = collections.deque(maxlen=maxlen)
+        self.pushed = 0
+
+    def push(self, app, text):
+        self._q.append((app, text))
+        self.pushed += 1
+
+    def drain(self, limit):
+        """Retire au plus `limit` lignes, dans l'ordre d'arrivée"""
+        q = self._q
+        out = []
+        pop = q.popleft
+        for _ in range(min(limit, len(q))):
+            out.append(pop())
+        return out
+
+    def __len__(self):
+        return len(self._q)
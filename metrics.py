@@ -0,0 +1,196 @@
+import bisect, os, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = int(os.environ.get("APP_LAUNCHER_METRICS_PORT") or 0)   # 0 = pas d'endpoint
+LAUNCH_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300)   # secondes
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(names, values):
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}" if names else ""
+
+def _num(v):
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+# ─── SÉRIES ──────────────────────────────────────────────────────────
+class Histogram:
+    """Compteurs cumulés par seau, somme et nombre d'observations"""
+    def __init__(self, buckets=LAUNCH_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)   # dernier seau : +Inf
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def copy(self):
+        h = Histogram(self.buckets)
+        h.counts, h.sum = list(self.counts), self.sum
+        return h
+
+    def lines(self, name, label_names, label_values):
+        labels = _labels(label_names, label_values)
+        prefix = f"{name}_bucket{labels[:-1]}," if labels else f"{name}_bucket{{"
+        out, total = [], 0
+        for le, n in zip(self.buckets + ("+Inf",), self.counts):
+            total += n
+            out.append(f'{prefix}le="{le}"}} {total}')
+        out.append(f"{name}_sum{labels} {_num(self.sum)}")
+        out.append(f"{name}_count{labels} {total}")
+        return out
+
+class Family:
+    """Métrique Prometheus : une valeur (ou un Histogram) par jeu de labels"""
+    def __init__(self, name, kind, help, labels=()):
+        self.name, self.kind, self.help, self.labels = name, kind, help, tuple(labels)
+        self.values = {}   # tuple de labels -> nombre ou Histogram
+
+    def snapshot(self):
+        return [(k, v.copy() if isinstance(v, Histogram) else v) for k, v in self.values.items()]
+
+    def render(self, items):
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in sorted(items):
+            if isinstance(value, Histogram):
+                out += value.lines(self.name, self.labels, key)
+            else:
+                out.append(f"{self.name}{_labels(self.labels, key)} {_num(value)}")
+        return out
+
+# ─── REGISTRE ────────────────────────────────────────────────────────
+class Metrics:
+    """Métriques du lanceur, agrégées au fil de l'eau.
+
+    Les moteurs et l'échantillonneur mettent à jour les compteurs (quelques
+    additions sous un verrou) ; le texte exposé n'est recalculé qu'après un
+    changement, hors verrou à partir d'une copie des valeurs. Une lecture sert
+    sinon les octets déjà prêts.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = 0
+        self._cache = (-1, b"")
+        f = self.families = {}
+        f["launch"] = Family("launcher_app_launch_seconds", "histogram",
+                             "Durée du lancement d'une app, jusqu'à disponibilité", ("config", "app"))
+        f["config"] = Family("launcher_config_launch_seconds", "histogram",
+                             "Durée du lancement complet d'une config", ("config",))
+        f["ready"] = Family("launcher_app_readiness_wait_seconds", "histogram",
+                            "Attente des sondes de disponibilité", ("config", "app"))
+        f["launches"] = Family("launcher_app_launches_total", "counter",
+                               "Lancements d'app par statut", ("config", "app", "status"))
+        f["restarts"] = Family("launcher_app_restarts_total", "counter",
+                               "Redémarrages automatiques après un arrêt", ("app",))
+        f["up"] = Family("launcher_app_up", "gauge", "1 si le processus ou le container tourne", ("app",))
+        f["rss"] = Family("launcher_app_resident_memory_bytes", "gauge",
+                          "Mémoire résidente de l'app (arbre de processus)", ("app",))
+        f["cpu"] = Family("launcher_app_cpu_ratio", "gauge",
+                          "CPU de l'app au dernier relevé, en cœurs", ("app",))
+
+    def _histogram(self, family, key):
+        h = self.families[family].values.get(key)
+        if h is None:
+            h = self.families[family].values[key] = Histogram()
+        return h
+
+    # ── Mises à jour ─────────────────────────────────────────────────
+    def observe_run(self, engine):
+        """Fin d'un LaunchEngine.run : durées, attentes et statuts des apps lancées"""
+        config = engine.timeline.label or ""
+        apps = engine.graph.apps
+        with self._lock:
+            for i, (start, end) in engine.times.items():
+                name = apps[i].get("name", "?")
+                self._histogram("launch", (config, name)).observe(end - start)
+            for i, wait in engine.ready_waits.items():
+                self._histogram("ready", (config, apps[i].get("name", "?"))).observe(wait)
+            launches = self.families["launches"].values
+            only = engine.only
+            for i, status in engine.status.items():
+                name = apps[i].get("name", "?")
+                if only is not None and name not in only:
+                    continue
+                key = (config, name, status)
+                launches[key] = launches.get(key, 0) + 1
+            if engine.times:
+                self._histogram("config", (config,)).observe(engine.duration)
+            self._version += 1
+
+    def on_sample(self, sampler):
+        """Relevé de l'échantillonneur : état, mémoire, CPU et redémarrages"""
+        sup = sampler.supervisor
+        up, rss, cpu = {}, {}, {}
+        now = time.time()
+        for name, series in list(sampler.series.items()):
+            latest = series.latest()
+            fresh = latest and latest[0] >= now - 2 * sampler.period(name)
+            if fresh:
+                cpu[(name,)] = round(latest[1] / 100, 4)
+                rss[(name,)] = int(latest[2] * 1024**2)
+            up[(name,)] = 1 if fresh else 0
+        restarts = {}
+        if sup is not None:
+            for name, proc in list(sup.procs.items()):
+                up[(name,)] = 1 if proc.alive else 0
+            restarts = {(name,): n for name, n in list(sup.restart_counts.items())}
+        f = self.families
+        with self._lock:
+            changed = (f["up"].values != up or f["rss"].values != rss or f["cpu"].values != cpu
+                       or f["restarts"].values != restarts)
+            if changed:
+                f["up"].values, f["rss"].values, f["cpu"].values = up, rss, cpu
+                f["restarts"].values = restarts
+                self._version += 1
+
+    # ── Exposition ───────────────────────────────────────────────────
+    def render(self):
+        """Texte au format d'exposition Prometheus, en octets"""
+        version, data = self._cache
+        if version == self._version:
+            return data
+        with self._lock:
+            version = self._version
+            snapshot = [(family, family.snapshot()) for family in self.families.values()]
+        lines = []
+        for family, items in snapshot:
+            lines += family.render(items)
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        self._cache = (version, data)
+        return data
+
+METRICS = Metrics()
+
+# ─── ENDPOINT HTTP ───────────────────────────────────────────────────
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # connexions réutilisées par Prometheus
+    disable_nagle_algorithm = True  # en-têtes et corps partent sans attendre d'accusé
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.server.metrics.render()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+def serve(sampler=None, port=METRICS_PORT, host=METRICS_HOST, metrics=METRICS):
+    """Expose `metrics` sur http://host:port/metrics dans un thread ; renvoie le serveur"""
+    if sampler is not None:
+        sampler.listeners.append(metrics.on_sample)
+    server = _Server((host, port), _Handler)
+    server.metrics = metrics
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
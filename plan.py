@@ -0,0 +1,188 @@
+import collections, hashlib, json, os, threading
+
+from engine import LaunchGraph, build_argv, format_argv, app_cwd
+from preflight import preflight, PreflightReport, SCRIPT_EXT
+from probes import probe_specs
+
+PLAN_DIR = ".plans"   # plans compilés, à côté du fichier de configs
+MEMORY_PLANS = 32     # plans gardés en mémoire
+DISK_PLANS   = 64     # plans gardés sur disque (les plus récemment utilisés)
+
+# Une entrée de plan : tout ce qu'il faut pour lancer une app, sans relire sa config
+PlanEntry = collections.namedtuple("PlanEntry", [
+    "index", "name", "type", "argv", "cwd", "env", "probes", "deps", "paths", "error"])
+
+def app_paths(app):
+    """Chemins dont dépendent la validation et la commande d'une app, absolus"""
+    t = app.get("type","")
+    paths = []
+    if t == "Spring Boot":
+        paths += [app.get("jar","").strip(), app.get("path","").strip()]
+    elif t in ("ActiveMQ", "Elasticsearch"):
+        home = app.get("home","").strip()
+        if home:
+            paths.append(os.path.join(home, "bin", ("activemq" if t == "ActiveMQ" else "elasticsearch")
+                                      + SCRIPT_EXT))
+    elif t == "Docker Compose":
+        directory = app.get("directory","").strip()
+        if directory:
+            paths += [directory, os.path.join(directory, app.get("compose_file","").strip()
+                                              or "docker-compose.yaml")]
+    return tuple(os.path.abspath(p) for p in paths if p)
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None   # absent : la clé change dès que le fichier apparaît
+
+def plan_key(apps):
+    """Hash des entrées de la config et des dates de modification des fichiers concernés"""
+    h = hashlib.sha1(json.dumps(apps, sort_keys=True, ensure_ascii=False).encode())
+    for app in apps:
+        for path in app_paths(app):
+            h.update(f"{path}|{_mtime(path)}".encode())
+    return h.hexdigest()[:20]
+
+# ─── PLAN ────────────────────────────────────────────────────────────
+class LaunchPlan:
+    """Plan de lancement figé d'une config"""
+    def __init__(self, key, entries, declared, validated_in=0.0, source="compilé"):
+        self.key = key
+        self.entries = tuple(entries)
+        self.declared = declared       # dépendances déclarées (sinon ordre de la liste)
+        self.validated_in = validated_in
+        self.source = source           # "compilé", "mémoire" ou "disque"
+
+    @property
+    def errors(self):
+        return {e.index: e.error for e in self.entries if e.error}
+
+    def report(self):
+        apps = [{"name": e.name, "type": e.type} for e in self.entries]
+        return PreflightReport(apps, self.errors, self.validated_in)
+
+    def to_json(self):
+        return {"key": self.key, "declared": self.declared, "validated_in": self.validated_in,
+                "entries": [e._asdict() for e in self.entries]}
+
+    @classmethod
+    def from_json(cls, data, source="disque"):
+        entries = []
+        for e in data["entries"]:
+            e = dict(e, argv=tuple(e["argv"]) if e["argv"] is not None else None,
+                     env=tuple(tuple(kv) for kv in e["env"]), probes=tuple(e["probes"]),
+                     deps=tuple(e["deps"]), paths=tuple(e["paths"]))
+            entries.append(PlanEntry(**e))
+        return cls(data["key"], entries, data["declared"], data["validated_in"], source)
+
+    def format(self):
+        """Vue « à blanc » : ce qui serait lancé, sans rien lancer"""
+        lines = [f"Plan {self.key} ({self.source}, "
+                 + ("dépendances déclarées" if self.declared else "ordre de la liste") + ")"]
+        for e in self.entries:
+            lines.append(f"\n[{e.index + 1}] {e.name} — {e.type}")
+            if e.error:
+                lines.append(f"    ⚠ {e.error}")
+            if e.argv:
+                lines.append(f"    $ {format_argv(e.argv)}")
+            if e.cwd:
+                lines.append(f"    dans {e.cwd}")
+            for k, v in e.env:
+                lines.append(f"    {k}={v}")
+            if e.deps:
+                lines.append("    après : " + ", ".join(self.entries[d].name for d in e.deps))
+            for spec in e.probes:
+                lines.append("    prêt quand : " + json.dumps(spec, ensure_ascii=False))
+        return "\n".join(lines)
+
+def compile_plan(apps, key=None, timeline=None):
+    """Valide et traduit les apps d'une config en plan (GraphError si le graphe est invalide)"""
+    apps = list(apps)
+    graph = LaunchGraph(apps)
+    report = preflight(apps, timeline=timeline)
+    entries = []
+    for i, app in enumerate(apps):
+        try:
+            probes = tuple(probe_specs(app))
+        except (ValueError, KeyError):
+            probes = ()   # erreur déjà remontée par la validation
+        argv = build_argv(app)
+        env = app.get("env") if isinstance(app.get("env"), dict) else {}
+        entries.append(PlanEntry(
+            index=i, name=app.get("name","?"), type=app.get("type",""),
+            argv=tuple(argv) if argv else None, cwd=app_cwd(app),
+            env=tuple(sorted((str(k), str(v)) for k, v in env.items())),
+            probes=probes, deps=tuple(graph.deps[i]), paths=app_paths(app),
+            error=report.errors.get(i)))
+    return LaunchPlan(key or plan_key(apps), entries, graph.declared, report.elapsed)
+
+# ─── CACHE ───────────────────────────────────────────────────────────
+class PlanCache:
+    """Plans compilés, en mémoire puis sur disque, par clé plan_key"""
+    def __init__(self, root=PLAN_DIR, size=MEMORY_PLANS, keep=DISK_PLANS):
+        self.root = root
+        self.size = size
+        self.keep = keep
+        self._mem = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def path(self, key):
+        return os.path.join(self.root, f"{key}.json")
+
+    def get(self, apps, timeline=None):
+        apps = list(apps)
+        key = plan_key(apps)
+        with self._lock:
+            plan = self._mem.get(key)
+            if plan is not None:
+                self._mem.move_to_end(key)
+                return LaunchPlan(plan.key, plan.entries, plan.declared, plan.validated_in, "mémoire")
+        plan = self._load(key)
+        if plan is None:
+            plan = compile_plan(apps, key, timeline)
+            self._save(plan)
+        with self._lock:
+            self._mem[key] = plan
+            while len(self._mem) > self.size:
+                self._mem.popitem(last=False)
+        return plan
+
+    def _load(self, key):
+        try:
+            with open(self.path(key), encoding="utf-8") as f:
+                plan = LaunchPlan.from_json(json.load(f))
+            os.utime(self.path(key))   # récemment utilisé : épargné par _prune
+            return plan
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save(self, plan):
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            tmp = self.path(plan.key) + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(plan.to_json(), f, indent=1, ensure_ascii=False)
+            os.replace(tmp, self.path(plan.key))
+            self._prune()
+        except OSError:
+            pass   # le cache disque n'est qu'une optimisation
+
+    def _prune(self):
+        """Ne garde que les `keep` plans les plus récemment écrits ou relus"""
+        plans = []
+        with os.scandir(self.root) as it:
+            for e in it:
+                if e.name.endswith(".json"):
+                    try:
+                        plans.append((e.stat().st_mtime_ns, e.path))
+                    except OSError:
+                        pass
+        plans.sort(reverse=True)
+        for _, path in plans[self.keep:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+PLAN_CACHE = PlanCache()
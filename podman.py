@@ -0,0 +1,275 @@
+import http.client, json, os, socket, subprocess, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+API_VERSION  = "v4.0.0"
+BATCH_WINDOW = 0.05   # secondes pendant lesquelles les démarrages simultanés sont regroupés
+SNAPSHOT_TTL = 2.0    # durée de validité de l'état des containers en cache
+POOL_SIZE    = 4
+
+def default_socket():
+    """Socket de l'API Podman : CONTAINER_HOST, puis socket rootless, puis root"""
+    host = os.environ.get("CONTAINER_HOST", "")
+    if host.startswith("unix://"):
+        return host[len("unix://"):]
+    candidates = []
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        candidates.append(os.path.join(os.environ["XDG_RUNTIME_DIR"], "podman", "podman.sock"))
+    candidates.append("/run/podman/podman.sock")
+    return next((p for p in candidates if os.path.exists(p)), None)
+
+def _health(status):
+    """Santé déduite du texte Status (« Up 3 minutes (healthy) »)"""
+    for h in ("unhealthy", "healthy", "starting"):
+        if f"({h})" in (status or ""):
+            return h
+    return ""
+
+def _snapshot(containers):
+    snap = {}
+    for c in containers or []:
+        names = c.get("Names") or []
+        if isinstance(names, str):
+            names = [names]
+        info = {"id": c.get("Id", ""), "state": (c.get("State") or "").lower(),
+                "health": _health(c.get("Status"))}
+        for n in names:
+            snap[n.lstrip("/")] = info
+    return snap
+
+UNITS = {"b": 1, "kb": 1e3, "mb": 1e6, "gb": 1e9, "kib": 1024, "mib": 1024**2, "gib": 1024**3}
+
+def _size_mb(text):
+    """« 12.5MB » ou « 1.2GiB » en Mo"""
+    text = text.strip().lower().replace(" ", "")
+    num = text.rstrip("abcdefghijklmnopqrstuvwxyz")
+    try:
+        return float(num) * UNITS.get(text[len(num):], 1) / 1024**2
+    except ValueError:
+        return 0.0
+
+# ─── API REST ────────────────────────────────────────────────────────
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout=30):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = path
+
+    def connect(self):
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        s.settimeout(self.timeout)
+        s.connect(self.socket_path)
+        self.sock = s
+
+class PodmanAPI:
+    """Client libpod sur la socket unix, avec un pool de connexions persistantes"""
+    def __init__(self, socket_path, pool_size=POOL_SIZE, timeout=30):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(pool_size)
+
+    def request(self, method, path, body=None, timeout=None):
+        """Renvoie (statut HTTP, JSON décodé ou texte)"""
+        url = f"/{API_VERSION}/libpod{path}"
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        payload = json.dumps(body) if body is not None else None
+        with self._slots:
+            for attempt in (1, 2):
+                with self._lock:
+                    conn = self._idle.pop() if self._idle else None
+                if conn is None:
+                    conn = UnixHTTPConnection(self.socket_path, self.timeout)
+                # Délai propre à la requête (arrêt d'un container), rétabli ensuite
+                conn.timeout = timeout or self.timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(conn.timeout)
+                try:
+                    conn.request(method, url, body=payload, headers=headers)
+                    resp = conn.getresponse()
+                    raw = resp.read()
+                except (OSError, http.client.HTTPException):
+                    conn.close()
+                    if attempt == 2:
+                        raise
+                    continue   # connexion persistante fermée par le serveur : on en rouvre une
+                if resp.will_close:
+                    conn.close()
+                else:
+                    if conn.sock is not None and timeout:
+                        conn.sock.settimeout(self.timeout)
+                    with self._lock:
+                        self._idle.append(conn)
+                try:
+                    return resp.status, json.loads(raw) if raw else None
+                except ValueError:
+                    return resp.status, raw.decode("utf-8", "replace")
+
+    def containers(self):
+        status, data = self.request("GET", "/containers/json?all=true")
+        if status != 200:
+            raise OSError(f"API Podman : HTTP {status}")
+        return data
+
+    def start(self, name):
+        status, data = self.request("POST", f"/containers/{quote(name, safe='')}/start")
+        if status in (204, 304):
+            return True, "déjà démarré" if status == 304 else "démarré"
+        return False, (data or {}).get("message", f"HTTP {status}") if isinstance(data, dict) else f"HTTP {status}"
+
+    def stop(self, name, timeout=10):
+        status, data = self.request("POST", f"/containers/{quote(name, safe='')}/stop?timeout={int(timeout)}",
+                                    timeout=timeout + 30)
+        if status in (204, 304):
+            return True, "déjà arrêté" if status == 304 else "arrêté"
+        return False, (data or {}).get("message", f"HTTP {status}") if isinstance(data, dict) else f"HTTP {status}"
+
+    def stats(self, names):
+        """{nom: (CPU %, mémoire Mo)} des containers en cours parmi `names`"""
+        query = "&".join(f"containers={quote(n, safe='')}" for n in names)
+        status, data = self.request("GET", f"/containers/stats?stream=false&{query}")
+        if status != 200 or not isinstance(data, dict):
+            return {}
+        return {st.get("Name", ""): (float(st.get("CPU") or 0), (st.get("MemUsage") or 0) / 1024**2)
+                for st in data.get("Stats") or []}
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+# ─── CLI ─────────────────────────────────────────────────────────────
+class PodmanCLI:
+    """Repli sur la commande podman quand la socket n'est pas disponible"""
+    def containers(self):
+        out = subprocess.run(["podman", "ps", "-a", "--format", "json"],
+                             capture_output=True, text=True, timeout=30)
+        if out.returncode != 0:
+            raise OSError(out.stderr.strip() or "podman ps en échec")
+        return json.loads(out.stdout or "[]")
+
+    def start_many(self, names):
+        """Un seul `podman start a b c` pour tout le lot"""
+        out = subprocess.run(["podman", "start", *names], capture_output=True, text=True, timeout=300)
+        return _batch_results(names, out, "démarré")
+
+    def stop_many(self, names, timeout=10):
+        """Un seul `podman stop -t N a b c` pour tout le lot"""
+        out = subprocess.run(["podman", "stop", "-t", str(int(timeout)), *names],
+                             capture_output=True, text=True, timeout=timeout + 300)
+        return _batch_results(names, out, "arrêté")
+
+    def stats(self, names):
+        out = subprocess.run(["podman", "stats", "--no-stream", "--format",
+                              "{{.Name}}|{{.CPUPerc}}|{{.MemUsage}}", *names],
+                             capture_output=True, text=True, timeout=30)
+        stats = {}
+        for line in out.stdout.splitlines():
+            parts = line.split("|")
+            if len(parts) == 3:
+                try:
+                    cpu = float(parts[1].strip().rstrip("%") or 0)
+                except ValueError:
+                    cpu = 0.0
+                stats[parts[0]] = (cpu, _size_mb(parts[2].split("/")[0]))
+        return stats
+
+def _batch_results(names, out, done):
+    """{nom: (ok, message)} d'après la sortie d'une commande podman sur un lot"""
+    ok = set(out.stdout.split())
+    errors = out.stderr.strip()
+    results = {}
+    for n in names:
+        if n in ok:
+            results[n] = (True, done)
+        else:
+            line = next((l for l in errors.splitlines() if n in l), errors or f"code {out.returncode}")
+            results[n] = (False, line)
+    return results
+
+# ─── BACKEND ─────────────────────────────────────────────────────────
+class PodmanBackend:
+    """Démarrages de containers regroupés et état en cache.
+
+    Les appels start() (ou stop()) qui arrivent dans la même fenêtre de
+    BATCH_WINDOW (apps indépendantes lancées en parallèle) partent en un seul
+    lot : une seule commande `podman start`, ou des requêtes sur les
+    connexions persistantes de l'API si la socket est disponible.
+    """
+    def __init__(self, socket_path=None, window=BATCH_WINDOW, snapshot_ttl=SNAPSHOT_TTL):
+        path = socket_path or default_socket()
+        self.api = PodmanAPI(path) if path and hasattr(socket, "AF_UNIX") and os.path.exists(path) else None
+        self.cli = PodmanCLI()
+        self.window = window
+        self.snapshot_ttl = snapshot_ttl
+        self._lock = threading.Lock()
+        self._batches = {}   # opération -> lot en cours de constitution
+        self._snap = None
+        self._snap_at = 0.0
+        self._snap_lock = threading.Lock()
+
+    def _client(self):
+        return self.api or self.cli
+
+    def snapshot(self, max_age=None):
+        """{nom: {"id", "state", "health"}} à partir d'un seul ps/list"""
+        max_age = self.snapshot_ttl if max_age is None else max_age
+        with self._snap_lock:
+            if self._snap is None or time.monotonic() - self._snap_at > max_age:
+                self._snap = _snapshot(self._client().containers())
+                self._snap_at = time.monotonic()
+            return self._snap
+
+    def invalidate(self):
+        with self._snap_lock:
+            self._snap = None
+
+    def state(self, name, max_age=None):
+        return self.snapshot(max_age).get(name)
+
+    def start(self, name):
+        """Démarre un container (regroupé avec les démarrages simultanés), renvoie (ok, message)"""
+        return self._batched("start", name, self._start_many)
+
+    def stop(self, name, timeout=10):
+        """Arrête un container (regroupé avec les arrêts simultanés de même délai), renvoie (ok, message)"""
+        return self._batched(("stop", timeout), name, lambda names: self._stop_many(names, timeout))
+
+    def _batched(self, op, name, run):
+        with self._lock:
+            batch = self._batches.get(op)
+            leader = batch is None
+            if leader:
+                batch = self._batches[op] = {"names": [], "done": threading.Event(), "results": {}}
+            batch["names"].append(name)
+        if leader:
+            time.sleep(self.window)
+            with self._lock:
+                del self._batches[op]
+            try:
+                batch["results"] = run(list(dict.fromkeys(batch["names"])))
+            except Exception as ex:
+                batch["results"] = {n: (False, str(ex)) for n in batch["names"]}
+            self.invalidate()
+            batch["done"].set()
+        else:
+            batch["done"].wait()
+        return batch["results"].get(name, (False, "résultat manquant"))
+
+    def stats(self, names):
+        """CPU et mémoire des containers démarrés parmi `names` (les autres sont ignorés)"""
+        running = [n for n in names if (self.state(n) or {}).get("state") == "running"]
+        return self._client().stats(running) if running else {}
+
+    def _start_many(self, names):
+        if self.api:
+            with ThreadPoolExecutor(max_workers=POOL_SIZE) as pool:
+                return dict(zip(names, pool.map(self.api.start, names)))
+        return self.cli.start_many(names)
+
+    def _stop_many(self, names, timeout):
+        if self.api:
+            with ThreadPoolExecutor(max_workers=POOL_SIZE) as pool:
+                return dict(zip(names, pool.map(lambda n: self.api.stop(n, timeout), names)))
+        return self.cli.stop_many(names, timeout)
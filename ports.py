@@ -0,0 +1,146 @@
+import collections, json, os, re, socket, threading
+
+try:
+    import fcntl
+except ImportError:   # Windows : verrou entre processus indisponible, le verrou local reste
+    fcntl = None
+
+PORTS_FILE = ".ports.json"        # réservations, partagées par l'interface, la CLI et le démon
+PORT_RANGE = (20000, 29999)       # ports attribués aux ${port:nom}
+PORT_RE = re.compile(r"\$\{port:([A-Za-z0-9_.-]+)\}")
+
+def placeholders(value):
+    """Noms des ${port:nom} d'une valeur d'app (texte, liste ou dict, à toute profondeur)"""
+    if isinstance(value, str):
+        return set(PORT_RE.findall(value))
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (list, tuple)):
+        names = set()
+        for v in value:
+            names |= placeholders(v)
+        return names
+    return set()
+
+def substitute(value, ports):
+    """Copie de `value` où chaque ${port:nom} est remplacé par son port"""
+    if isinstance(value, str):
+        return PORT_RE.sub(lambda m: str(ports[m.group(1)]), value) if "${port:" in value else value
+    if isinstance(value, dict):
+        return {k: substitute(v, ports) for k, v in value.items()}
+    if isinstance(value, list):
+        return [substitute(v, ports) for v in value]
+    return value
+
+def sample(value):
+    """`value` avec un port quelconque à la place de chaque ${port:nom} : pour valider une app non résolue"""
+    return substitute(value, collections.defaultdict(lambda: PORT_RANGE[0]))
+
+def port_free(port):
+    """Personne n'écoute sur `port` (toutes interfaces) ?"""
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        if os.name != "nt":
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)   # ignore TIME_WAIT, comme les serveurs
+        s.bind(("", port))
+        return True
+    except OSError:
+        return False
+    finally:
+        s.close()
+
+# ─── RÉSERVATIONS ────────────────────────────────────────────────────
+class PortAllocator:
+    """Attribue les ${port:nom} des apps d'une config.
+
+    Un nom vaut un port pour toute la config : l'app qui écoute et celles
+    qui s'y connectent (run_config, env, sondes) écrivent le même
+    ${port:nom}. Les ports sont réservés par config dans PORTS_FILE, relu
+    sous verrou à chaque attribution : deux configs (ou deux processus du
+    lanceur) n'obtiennent jamais le même port. Une réservation reste
+    attachée à sa config d'un lancement à l'autre (mêmes URL) jusqu'à
+    release(). Un nouveau port est cherché à partir d'un curseur et testé
+    par bind : en pratique un ou deux essais.
+    """
+    def __init__(self, path=PORTS_FILE, port_range=PORT_RANGE):
+        self.path = path
+        self.lo, self.hi = port_range
+        self._next = self.lo
+        self._lock = threading.Lock()
+
+    # ── Fichier partagé ──────────────────────────────────────────────
+    def _locked(self, fn):
+        """fn(réservations) sous verrou local et, si possible, entre processus ; réécrit le fichier"""
+        with self._lock:
+            lock = None
+            if fcntl is not None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                lock = open(self.path + ".lock", "a")
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                data = self._load()
+                result = fn(data)
+                self._save(data)
+                return result
+            finally:
+                if lock is not None:
+                    lock.close()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            return {str(c): {str(n): int(p) for n, p in ports.items()} for c, ports in data.items()}
+        except (OSError, ValueError, AttributeError, TypeError):
+            return {}
+
+    def _save(self, data):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    # ── Attribution ──────────────────────────────────────────────────
+    def allocate(self, config, names):
+        """{nom: port} pour la config, en gardant ses réservations existantes"""
+        def run(data):
+            mine = data.setdefault(config, {})
+            taken = {p for c, ports in data.items() if c != config for p in ports.values()}
+            for name in sorted(names):
+                port = mine.get(name)
+                if port is None or port in taken:
+                    port = mine[name] = self._find(taken | set(mine.values()))
+                taken.add(port)
+            if not mine:
+                del data[config]
+            return {n: mine[n] for n in names}
+        return self._locked(run) if names else {}
+
+    def _find(self, taken):
+        size = self.hi - self.lo + 1
+        for k in range(size):
+            port = self.lo + (self._next - self.lo + k) % size
+            if port not in taken and port_free(port):
+                self._next = port + 1 if port < self.hi else self.lo
+                return port
+        raise RuntimeError(f"Aucun port libre entre {self.lo} et {self.hi}")
+
+    def resolve(self, config, apps):
+        """(copies des apps aux ${port:nom} remplacés, {nom: port}) ; apps inchangées sans ${port:…}"""
+        names = set()
+        for app in apps:
+            names |= placeholders(app)
+        if not names:
+            return list(apps), {}
+        ports = self.allocate(config, names)
+        return [substitute(app, ports) for app in apps], ports
+
+    def reservations(self):
+        with self._lock:
+            return self._load()
+
+    def release(self, config):
+        """Rend les ports d'une config ; renvoie ceux qui étaient réservés"""
+        return self._locked(lambda data: data.pop(config, {}))
+
+PORTS = PortAllocator()
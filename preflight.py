@@ -0,0 +1,160 @@
+import os, threading, time
+from concurrent.futures import ThreadPoolExecutor
+
+from probes import probe_specs
+from ports import sample
+from supervisor import RestartPolicy
+
+STAT_TTL        = 10.0   # secondes pendant lesquelles un résultat os.path.exists est réutilisé
+PREFLIGHT_WORKERS = 16
+
+# Scripts de démarrage selon la plateforme
+SCRIPT_EXT = ".bat" if os.name == "nt" else ""
+
+# ─── CACHE DE STAT ───────────────────────────────────────────────────
+class StatCache:
+    """os.path.exists mémorisé pendant `ttl` secondes (partages réseau lents)"""
+    def __init__(self, ttl=STAT_TTL):
+        self.ttl = ttl
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def exists(self, path):
+        now = time.monotonic()
+        with self._lock:
+            hit = self._cache.get(path)
+        if hit and now - hit[1] < self.ttl:
+            return hit[0]
+        found = os.path.exists(path)
+        with self._lock:
+            self._cache[path] = (found, now)
+        return found
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+STAT_CACHE = StatCache()
+
+def is_enabled(value):
+    """Interprète un réglage oui/non d'une app (booléen JSON ou texte)"""
+    return str(value).strip().lower() in ("1", "true", "oui", "yes", "on")
+
+# ─── VALIDATION ──────────────────────────────────────────────────────
+def validate_app(app, stat=STAT_CACHE):
+    """Valide les paramètres d'une application avant lancement"""
+    atype = app.get("type","")
+    exists = stat.exists if stat else os.path.exists
+    error = None
+
+    if atype == "Spring Boot":
+        jar = app.get("jar","").strip()
+        path = app.get("path","").strip()
+        if not jar:
+            error = "Chemin du JAR non spécifié"
+        elif is_enabled(app.get("build")):
+            # Le JAR sera produit par le build : c'est le projet qui doit exister
+            if not path:
+                error = "Path du projet non spécifié (requis pour le build)"
+            elif not exists(os.path.join(path, "pom.xml")):
+                error = f"pom.xml introuvable dans {path}"
+        elif not exists(jar):
+            error = f"Fichier JAR introuvable : {jar}"
+
+    elif atype in ("ActiveMQ", "Elasticsearch"):
+        home = app.get("home","").strip()
+        script = "activemq" if atype == "ActiveMQ" else "elasticsearch"
+        if not home:
+            error = "Home path non spécifié"
+        else:
+            path = os.path.join(home, "bin", script + SCRIPT_EXT)
+            if not exists(path):
+                error = f"{atype} introuvable : {path}"
+
+    elif atype == "Podman":
+        container = app.get("container","").strip()
+        if not container:
+            error = "Nom du container non spécifié"
+
+    elif atype == "Podman Machine":
+        # Pas de validation requise
+        pass
+
+    elif atype == "Docker Compose":
+        directory = app.get("directory","").strip()
+        compose_file = app.get("compose_file","").strip() or "docker-compose.yaml"
+        if not directory:
+            error = "Répertoire projet non spécifié"
+        elif not exists(directory):
+            error = f"Répertoire introuvable : {directory}"
+        elif not exists(os.path.join(directory, compose_file)):
+            error = f"Fichier Docker Compose introuvable : {os.path.join(directory, compose_file)}"
+
+    elif atype == "Timer":
+        seconds = app.get("seconds","").strip()
+        if not seconds:
+            error = "Nombre de secondes non spécifié"
+        else:
+            try:
+                int(seconds)
+            except ValueError:
+                error = f"Nombre de secondes invalide : {seconds}"
+
+    if error is None and app.get("weight") not in (None, ""):
+        try:
+            float(app["weight"])
+        except (TypeError, ValueError):
+            error = f"Poids invalide : {app['weight']}"
+
+    if error is None and app.get("restart"):
+        try:
+            RestartPolicy.from_app(app)
+        except (TypeError, ValueError) as ex:
+            error = str(ex)
+
+    if error is None and app.get("ready"):
+        try:
+            probe_specs(sample(app))   # ports ${port:nom} attribués seulement au lancement
+        except (ValueError, KeyError) as ex:
+            error = f"Sonde invalide : {ex}"
+    return error
+
+# ─── PRÉ-VÉRIFICATION ────────────────────────────────────────────────
+class PreflightReport:
+    """Résultat de la validation de toutes les apps d'une config"""
+    def __init__(self, apps, errors, elapsed):
+        self.apps = apps
+        self.errors = errors   # index -> message
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def format(self):
+        lines = [f"Pré-vérification : {len(self.apps)} app(s) en {self.elapsed:.2f}s"
+                 + (f" — {len(self.errors)} problème(s)" if self.errors else " — OK")]
+        for i in sorted(self.errors):
+            lines.append(f"  ⚠ {self.apps[i].get('name','?')} : {self.errors[i]}")
+        return "\n".join(lines)
+
+def preflight(apps, stat=STAT_CACHE, max_workers=PREFLIGHT_WORKERS, timeline=None):
+    """Valide toutes les apps en parallèle, avant de démarrer quoi que ce soit"""
+    apps = list(apps)
+    t0 = time.perf_counter()
+    if not apps:
+        return PreflightReport(apps, {}, 0.0)
+
+    def check(app):
+        if timeline is None:
+            return validate_app(app, stat)
+        timeline.begin(app.get("name"), "validation")
+        try:
+            return validate_app(app, stat)
+        finally:
+            timeline.end(app.get("name"), "validation")
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(apps))) as pool:
+        results = list(pool.map(check, apps))
+    errors = {i: err for i, err in enumerate(results) if err}
+    return PreflightReport(apps, errors, time.perf_counter() - t0)
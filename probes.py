@@ -0,0 +1,243 @@
+import json, os, re, socket, subprocess, time
+import urllib.request, urllib.error
+
+# Valeurs par défaut, surchargeables sur chaque sonde
+DEFAULTS = {"interval": 0.5, "backoff": 1.5, "max_interval": 5.0, "timeout": 120.0}
+
+# ─── SONDES ──────────────────────────────────────────────────────────
+class Probe:
+    """Sonde de disponibilité : check() renvoie (prêt, détail)"""
+    kind = "?"
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.interval     = float(spec.get("interval",     DEFAULTS["interval"]))
+        self.backoff      = max(1.0, float(spec.get("backoff", DEFAULTS["backoff"])))
+        self.max_interval = float(spec.get("max_interval", DEFAULTS["max_interval"]))
+        self.timeout      = float(spec.get("timeout",      DEFAULTS["timeout"]))
+
+    def prepare(self):
+        """Appelée avant le démarrage de l'app"""
+
+    def check(self):
+        raise NotImplementedError
+
+    def describe(self):
+        return self.kind
+
+    def wait(self, cancelled=lambda: False):
+        """Interroge la sonde jusqu'au succès ou au timeout, renvoie (ok, durée, détail)"""
+        t0 = time.monotonic()
+        deadline = t0 + self.timeout
+        delay = self.interval
+        detail = ""
+        while True:
+            try:
+                ok, detail = self.check()
+            except Exception as ex:
+                ok, detail = False, str(ex)
+            now = time.monotonic()
+            if ok:
+                return True, now - t0, detail
+            if now >= deadline or cancelled():
+                return False, now - t0, detail or "timeout"
+            time.sleep(min(delay, max(0.0, deadline - now)))
+            delay = min(delay * self.backoff, self.max_interval)
+
+class TcpProbe(Probe):
+    kind = "tcp"
+
+    def __init__(self, spec):
+        super().__init__(spec)
+        self.host = spec.get("host", "localhost")
+        self.port = int(spec["port"])
+
+    def describe(self):
+        return f"tcp {self.host}:{self.port}"
+
+    def check(self):
+        try:
+            with socket.create_connection((self.host, self.port), timeout=min(2.0, self.timeout)):
+                return True, "port ouvert"
+        except OSError as ex:
+            return False, str(ex)
+
+class HttpProbe(Probe):
+    kind = "http"
+
+    def __init__(self, spec):
+        super().__init__(spec)
+        self.url = spec["url"]
+        status = spec.get("status")
+        self.status = [int(s) for s in status] if isinstance(status, list) else \
+                      [int(status)] if status else None
+        self.body = re.compile(spec["body"]) if spec.get("body") else None
+
+    def describe(self):
+        return f"http {self.url}"
+
+    def check(self):
+        try:
+            with urllib.request.urlopen(self.url, timeout=min(5.0, self.timeout)) as r:
+                code, body = r.status, r.read(65536)
+        except urllib.error.HTTPError as ex:
+            code, body = ex.code, ex.read(65536) if ex.fp else b""
+        except (OSError, ValueError) as ex:
+            return False, str(ex)
+        if self.status is not None and code not in self.status:
+            return False, f"HTTP {code}"
+        if self.status is None and not 200 <= code < 400:
+            return False, f"HTTP {code}"
+        if self.body and not self.body.search(body.decode("utf-8", "replace")):
+            return False, f"HTTP {code}, corps non conforme"
+        return True, f"HTTP {code}"
+
+class LogProbe(Probe):
+    """Regex sur la sortie de l'app : un fichier de log ou une source de lignes"""
+    kind = "log"
+
+    def __init__(self, spec, source=None):
+        super().__init__(spec)
+        self.pattern = re.compile(spec["pattern"])
+        self.file = spec.get("file")
+        self.source = source
+        self._pos = 0
+        self._rest = ""
+
+    def describe(self):
+        return f"log /{self.pattern.pattern}/"
+
+    def prepare(self):
+        # On ignore ce que contenait déjà le fichier avant le lancement
+        if self.file and os.path.exists(self.file):
+            self._pos = os.path.getsize(self.file)
+
+    def _new_lines(self):
+        if self.source is not None:
+            return self.source()
+        if not self.file or not os.path.exists(self.file):
+            return []
+        if os.path.getsize(self.file) < self._pos:   # fichier tourné
+            self._pos = 0
+        with open(self.file, encoding="utf-8", errors="replace") as f:
+            f.seek(self._pos)
+            chunk = f.read()
+            self._pos = f.tell()
+        lines = (self._rest + chunk).split("\n")
+        self._rest = lines.pop()
+        return lines
+
+    def check(self):
+        if self.source is None and not self.file:
+            return False, "aucune sortie capturée ni fichier de log"
+        for line in self._new_lines():
+            if self.pattern.search(line):
+                return True, line.strip()
+        return False, "motif non trouvé"
+
+class PodmanProbe(Probe):
+    """Healthcheck podman, ou simple état running si le container n'en a pas"""
+    kind = "podman"
+
+    def __init__(self, spec, backend=None):
+        super().__init__(spec)
+        self.container = spec["container"]
+        self.backend = backend
+
+    def describe(self):
+        return f"podman {self.container}"
+
+    def check(self):
+        if self.backend is not None:
+            info = self.backend.state(self.container, max_age=self.interval / 2)
+            if info is None:
+                return False, "container inconnu"
+            if info["health"]:
+                return info["health"] == "healthy", f"health={info['health']}"
+            return info["state"] == "running", f"state={info['state']}"
+        out = subprocess.run(
+            ["podman", "inspect", "--format", "{{.State.Health.Status}}|{{.State.Status}}", self.container],
+            capture_output=True, text=True, timeout=min(10.0, self.timeout))
+        if out.returncode != 0:
+            return False, out.stderr.strip() or "inspect en échec"
+        health, _, state = out.stdout.strip().partition("|")
+        if health and health not in ("<no value>", "<nil>"):
+            return health == "healthy", f"health={health}"
+        return state == "running", f"state={state}"
+
+PROBES = {"tcp": TcpProbe, "http": HttpProbe, "log": LogProbe, "podman": PodmanProbe}
+REQUIRED = {"tcp": ("port",), "http": ("url",), "log": ("pattern",), "podman": ("container",)}
+
+def check_spec(spec):
+    """Lève ValueError si la spec ne peut pas donner une sonde (type, clés requises, valeurs)"""
+    if not isinstance(spec, dict):
+        raise ValueError(f"spec de sonde attendue, reçu : {spec!r}")
+    kind = spec.get("type")
+    if kind not in PROBES:
+        raise ValueError(f"Type de sonde inconnu : {kind}")
+    missing = [k for k in REQUIRED[kind] if spec.get(k) in (None, "")]
+    if missing:
+        raise ValueError(f"sonde {kind} : {', '.join(missing)} manquant")
+    try:
+        PROBES[kind](spec)   # conversions : port, statuts, regex, délais
+    except (TypeError, ValueError, re.error) as ex:
+        raise ValueError(f"sonde {kind} : {ex}") from None
+
+# ─── CONSTRUCTION ────────────────────────────────────────────────────
+def parse_spec(text, app=None):
+    """Forme courte : "tcp:61616", "tcp:host:61616", "http://…", "log:<regex>", "podman[:nom]" """
+    text = text.strip()
+    if text.startswith(("{", "[")):
+        return json.loads(text)
+    if text.startswith(("http://", "https://")):
+        return {"type": "http", "url": text}
+    kind, _, rest = text.partition(":")
+    if kind == "tcp":
+        host, _, port = rest.rpartition(":")
+        return {"type": "tcp", "host": host or "localhost", "port": int(port)}
+    if kind == "log":
+        return {"type": "log", "pattern": rest}
+    if kind == "podman":
+        return {"type": "podman", "container": rest or (app or {}).get("container", "")}
+    raise ValueError(f"Sonde inconnue : {text}")
+
+def probe_specs(app):
+    """Liste des specs de sondes déclarées par une app (clé `ready`), vérifiées par check_spec"""
+    ready = app.get("ready")
+    if not ready:
+        return []
+    if isinstance(ready, str):
+        ready = parse_spec(ready, app)
+    if isinstance(ready, dict):
+        ready = [ready]
+    specs = []
+    for spec in ready:
+        if isinstance(spec, str):
+            spec = parse_spec(spec, app)
+        if isinstance(spec, dict) and spec.get("type") == "podman" and not spec.get("container"):
+            spec = dict(spec, container=app.get("container", ""))
+        check_spec(spec)
+        specs.append(spec)
+    return specs
+
+def build_probes(app, log_source=None, podman=None):
+    probes = []
+    for spec in probe_specs(app):
+        cls = PROBES.get(spec.get("type"))
+        if cls is None:
+            raise ValueError(f"Type de sonde inconnu : {spec.get('type')}")
+        if cls is LogProbe and not spec.get("file"):
+            probes.append(LogProbe(spec, source=log_source))
+        elif cls is PodmanProbe:
+            probes.append(PodmanProbe(spec, backend=podman))
+        else:
+            probes.append(cls(spec))
+    return probes
+
+def format_spec(ready):
+    """Inverse de probe_specs pour l'affichage dans les dialogues"""
+    if not ready:
+        return ""
+    if isinstance(ready, str):
+        return ready
+    return json.dumps(ready, ensure_ascii=False)
@@ -0,0 +1,211 @@
+import csv, os, threading, time
+from array import array
+
+SAMPLE_INTERVAL = 1.0   # secondes entre deux relevés
+SERIES_SIZE     = 600   # relevés gardés par app (10 min à 1 Hz)
+TREE_REFRESH    = 10    # relevés entre deux redécouvertes d'un arbre de processus
+CONTAINER_EVERY = 5     # relevés entre deux stats Podman par l'API
+CONTAINER_EVERY_CLI = 30   # idem sans socket : chaque relevé lance un processus `podman stats`
+
+CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_MB = (os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096) / 1024**2
+
+# ─── HISTORIQUE ──────────────────────────────────────────────────────
+class Series:
+    """Relevés d'une app dans trois tableaux circulaires de taille fixe :
+    horodatage, CPU (% d'un cœur), RSS (Mo)"""
+    def __init__(self, size=SERIES_SIZE):
+        self.size = size
+        self.ts  = array("d", [0.0]) * size
+        self.cpu = array("d", [0.0]) * size
+        self.rss = array("d", [0.0]) * size
+        self.n = 0   # nombre total de relevés ajoutés
+
+    def append(self, ts, cpu, rss):
+        i = self.n % self.size
+        self.ts[i], self.cpu[i], self.rss[i] = ts, cpu, rss
+        self.n += 1
+
+    def __len__(self):
+        return min(self.n, self.size)
+
+    def values(self, field, last=None):
+        """Les `last` dernières valeurs d'un champ ("ts", "cpu", "rss"), de la plus ancienne à la plus récente"""
+        arr = getattr(self, field)
+        k = len(self) if last is None else min(last, len(self))
+        if not k:
+            return []
+        end = self.n % self.size
+        start = (self.n - k) % self.size
+        return arr[start:end].tolist() if start < end else (arr[start:] + arr[:end]).tolist()
+
+    def latest(self):
+        if not self.n:
+            return None
+        i = (self.n - 1) % self.size
+        return self.ts[i], self.cpu[i], self.rss[i]
+
+# ─── /proc ───────────────────────────────────────────────────────────
+def _read(path):
+    """Lecture brute, sans objet fichier Python (deux fois moins coûteux par relevé)"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, 65536)
+    finally:
+        os.close(fd)
+
+def read_stat(pid):
+    """(ticks CPU utilisateur + système, RSS en Mo) d'après /proc/<pid>/stat"""
+    data = _read(f"/proc/{pid}/stat")
+    # Le nom du processus (2e champ) peut contenir des espaces : on repart de la dernière « ) »
+    fields = data[data.rindex(b")") + 2:].split()
+    return int(fields[11]) + int(fields[12]), int(fields[21]) * PAGE_MB
+
+def _children(pid):
+    return [int(c) for c in _read(f"/proc/{pid}/task/{pid}/children").split()]
+
+def _ppid_map():
+    """{ppid: [pids]} en parcourant /proc (noyaux sans fichier « children »)"""
+    tree = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                data = _read(f"/proc/{entry}/stat")
+                ppid = int(data[data.rindex(b")") + 2:].split()[1])
+            except (OSError, ValueError, IndexError):
+                continue
+            tree.setdefault(ppid, []).append(int(entry))
+    return tree
+
+def has_children_file():
+    return os.path.exists(f"/proc/{os.getpid()}/task/{os.getpid()}/children")
+
+def process_tree(pid, ppids=None):
+    """PID racine et tous ses descendants, via `ppids` (voir _ppid_map) ou les fichiers « children »"""
+    out, todo = [], [pid]
+    while todo:
+        p = todo.pop()
+        out.append(p)
+        if ppids is not None:
+            todo.extend(ppids.get(p, ()))
+            continue
+        try:
+            todo.extend(_children(p))
+        except OSError:
+            pass
+    return out
+
+# ─── ÉCHANTILLONNEUR ─────────────────────────────────────────────────
+class Sampler:
+    """Relève CPU et mémoire des apps lancées, dans un thread de fond.
+
+    Processus supervisés : somme sur l'arbre de processus (/proc, Linux
+    uniquement). Containers : un seul appel de stats Podman pour tous les
+    containers surveillés, tous les CONTAINER_EVERY relevés seulement
+    (CONTAINER_EVERY_CLI sans socket d'API).
+    """
+    def __init__(self, supervisor, podman=None, interval=SAMPLE_INTERVAL, size=SERIES_SIZE):
+        self.supervisor = supervisor
+        self.podman = podman
+        self.interval = interval
+        self.size = size
+        self.series = {}       # app -> Series
+        self.containers = {}   # app -> container
+        self.container_every = CONTAINER_EVERY if podman is None or getattr(podman, "api", None) \
+            else CONTAINER_EVERY_CLI
+        self.listeners = []    # callables (sampler) appelés après chaque relevé
+        self._prev = {}        # pid -> (ticks, horodatage)
+        self._trees = {}       # PID racine -> (PID de l'arbre, n° du relevé de découverte)
+        self._ticks = 0
+        self._samples = 0      # relevés effectués (cadence des stats Podman)
+        self._stop = threading.Event()
+        self._thread = None
+        self.has_proc = os.path.isdir("/proc/self")
+        self.has_children = self.has_proc and has_children_file()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def watch_container(self, app, container):
+        if container:
+            self.containers[app] = container
+
+    def period(self, app):
+        """Secondes entre deux relevés de l'app"""
+        return self.interval * (self.container_every if app in self.containers else 1)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+                for fn in list(self.listeners):
+                    fn(self)
+            except Exception:
+                pass   # un relevé raté ne doit pas arrêter les suivants
+
+    def _series(self, app):
+        s = self.series.get(app)
+        if s is None:
+            s = self.series[app] = Series(self.size)
+        return s
+
+    def sample(self):
+        """Un relevé pour toutes les apps surveillées, renvoie le nombre d'apps relevées"""
+        now = time.time()
+        count = 0
+        self._samples += 1
+        if self.has_proc and self.supervisor is not None:
+            seen = set()
+            self._ticks += 1
+            procs = [p for p in list(self.supervisor.procs.values()) if p.alive and p.pid]
+            # Les arbres changent rarement : on ne les redécouvre que tous les TREE_REFRESH relevés
+            stale = [p for p in procs if p.pid not in self._trees
+                     or self._ticks - self._trees[p.pid][1] >= TREE_REFRESH]
+            # Sans fichiers « children », un seul parcours de /proc sert à tous les arbres
+            ppids = _ppid_map() if stale and not self.has_children else None
+            for p in stale:
+                self._trees[p.pid] = (process_tree(p.pid, ppids), self._ticks)
+            for proc in procs:
+                cpu = rss = 0.0
+                for pid in self._trees[proc.pid][0]:
+                    try:
+                        ticks, mb = read_stat(pid)
+                    except (OSError, ValueError, IndexError):
+                        self._trees[proc.pid] = (self._trees[proc.pid][0], -TREE_REFRESH)  # à redécouvrir
+                        continue
+                    prev = self._prev.get(pid)
+                    if prev and now > prev[1]:
+                        cpu += (ticks - prev[0]) / CLK_TCK / (now - prev[1]) * 100
+                    self._prev[pid] = (ticks, now)
+                    seen.add(pid)
+                    rss += mb
+                self._series(proc.name).append(now, cpu, rss)
+                count += 1
+            for pid in set(self._prev) - seen:
+                del self._prev[pid]
+            roots = {p.pid for p in procs}
+            for pid in set(self._trees) - roots:
+                del self._trees[pid]
+        if self.podman is not None and self.containers and (self._samples - 1) % self.container_every == 0:
+            stats = self.podman.stats(list(set(self.containers.values())))
+            for app, container in list(self.containers.items()):
+                if container in stats:
+                    cpu, rss = stats[container]
+                    self._series(app).append(now, cpu, rss)
+                    count += 1
+        return count
+
+    def write_csv(self, path):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["app", "timestamp", "cpu_percent", "rss_mb"])
+            for app, s in sorted(self.series.items()):
+                for ts, cpu, rss in zip(s.values("ts"), s.values("cpu"), s.values("rss")):
+                    w.writerow([app, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts)),
+                                f"{cpu:.1f}", f"{rss:.1f}"])
@@ -0,0 +1,165 @@
+import os, threading
+from concurrent.futures import ThreadPoolExecutor
+
+from store import Manager, CONFIG_FILE
+from supervisor import Supervisor
+
+# Mêmes dossiers que l'interface graphique
+LOG_DIR  = "logs"
+RUNS_DIR = "runs"
+CHECK_WORKERS = 8
+
+# ─── SERVICE SANS INTERFACE ──────────────────────────────────────────
+class LauncherService:
+    """Opérations du lanceur sans Tk : utilisé par la CLI en direct et par le démon.
+
+    Les modules de lancement (engine, podman, probes…) ne sont importés qu'au
+    premier lancement ou arrêt, pour que `list` et `logs` démarrent vite.
+    `log(texte, app=None)` reçoit le journal, comme LaunchEngine.
+    """
+    def __init__(self, config_file=CONFIG_FILE, log_dir=LOG_DIR, runs_dir=RUNS_DIR):
+        self.mgr = Manager(config_file)
+        self.sup = Supervisor(log_dir=log_dir)
+        self.runs_dir = runs_dir
+        self.last_runs = {}   # config -> dernier LaunchEngine
+        self._podman = None
+        self._mtime = self._config_mtime()
+        self._lock = threading.Lock()
+
+    @property
+    def podman(self):
+        if self._podman is None:
+            from podman import PodmanBackend
+            self._podman = PodmanBackend()
+        return self._podman
+
+    def _config_mtime(self):
+        try:
+            return os.stat(self.mgr.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _refresh(self):
+        """Relit le fichier de configs s'il a changé (modifié depuis l'interface)"""
+        with self._lock:
+            mtime = self._config_mtime()
+            if mtime != self._mtime:
+                self._mtime = mtime
+                self.mgr.load()
+
+    def config(self, name):
+        self._refresh()
+        cfg = self.mgr.get_config(name)
+        if cfg is None:
+            raise KeyError(f"Config inconnue : {name}")
+        return cfg
+
+    def configs(self):
+        self._refresh()
+        return self.mgr.data["configs"]
+
+    # ── Lancement / arrêt ────────────────────────────────────────────
+    def launch(self, name, log, only=None):
+        """Lance une config, renvoie {app: statut}"""
+        from engine import LaunchEngine, MAX_PARALLEL
+        from plan import PLAN_CACHE
+        from timeline import Timeline
+        from admission import Admission
+        from build import Builder
+        from ports import PORTS
+        cfg = self.config(name)
+        apps, ports = PORTS.resolve(name, cfg["apps"])
+        plan = PLAN_CACHE.get(apps)
+        engine = LaunchEngine(apps, log, max_parallel=cfg.get("max_parallel", MAX_PARALLEL),
+                              supervisor=self.sup, podman=self.podman, only=set(only) if only else None,
+                              timeline=Timeline(name), runs_dir=self.runs_dir,
+                              admission=Admission.from_config(cfg), builder=Builder.from_config(cfg),
+                              plan=plan, ports=ports)
+        self.last_runs[name] = engine
+        status = engine.run()
+        return {engine.graph.apps[i].get("name","?"): s for i, s in sorted(status.items())}
+
+    def restart(self, name, apps, log):
+        """Relance des apps d'une config et celles qui en dépendent, renvoie {app: statut}"""
+        from engine import MAX_PARALLEL
+        from switch import RestartEngine
+        from timeline import Timeline
+        from admission import Admission
+        from build import Builder
+        from ports import PORTS
+        cfg = self.config(name)
+        resolved, ports = PORTS.resolve(name, cfg["apps"])
+        engine = RestartEngine(resolved, set(apps), log, max_parallel=cfg.get("max_parallel", MAX_PARALLEL),
+                               supervisor=self.sup, podman=self.podman, timeline=Timeline(name),
+                               runs_dir=self.runs_dir, admission=Admission.from_config(cfg),
+                               builder=Builder.from_config(cfg), ports=ports)
+        self.last_runs[name] = engine.launcher
+        status = engine.run()
+        return {engine.graph.apps[i].get("name","?"): s for i, s in sorted(status.items())
+                if engine.graph.apps[i].get("name") in engine.names}
+
+    def stop(self, name, log):
+        """Arrête les apps d'une config, renvoie {app: statut}"""
+        from engine import MAX_PARALLEL
+        from shutdown import StopEngine
+        from timeline import Timeline
+        cfg = self.config(name)
+        last = self.last_runs.get(name)
+        engine = StopEngine(cfg["apps"], log, max_parallel=cfg.get("max_parallel", MAX_PARALLEL),
+                            supervisor=self.sup, podman=self.podman,
+                            timeline=last.timeline if last else Timeline(name), runs_dir=self.runs_dir)
+        status = engine.run()
+        return {engine.graph.apps[i].get("name","?"): s for i, s in sorted(status.items())}
+
+    # ── État ─────────────────────────────────────────────────────────
+    def status(self, name=None):
+        """[{config, name, type, running, detail, pid}] pour une config ou toutes"""
+        from detect import RunningState
+        cfgs = [self.config(name)] if name else self.configs()
+        apps = [(c["name"], a) for c in cfgs for a in c["apps"] if a.get("type") != "Timer"]
+        state = RunningState(self.sup, self.podman)
+
+        def check(item):
+            cfg_name, app = item
+            running, detail = state.check(app)
+            proc = self.sup.get(app.get("name",""))
+            return {"config": cfg_name, "name": app.get("name","?"), "type": app.get("type",""),
+                    "running": running, "detail": detail,
+                    "pid": proc.pid if proc is not None and proc.alive else None}
+        with ThreadPoolExecutor(max_workers=CHECK_WORKERS) as pool:
+            return list(pool.map(check, apps))
+
+    # ── Sortie des processus ─────────────────────────────────────────
+    def tail(self, app, lines=50):
+        """Dernières lignes d'une app : mémoire si elle est supervisée ici, sinon fichier de log"""
+        proc = self.sup.get(app)
+        if proc is not None:
+            return [l[3] for l in proc.output.tail(lines)]
+        return tail_file(self.sup.log_path(app), lines)
+
+    def follow(self, app, emit, stop):
+        """Transmet chaque nouvelle ligne de l'app à emit(texte) jusqu'à stop.is_set()"""
+        def on_line(proc, stream, text):
+            if proc.name == app:
+                emit(text)
+        self.sup.listeners.append(on_line)
+        try:
+            stop.wait()
+        finally:
+            self.sup.listeners.remove(on_line)
+
+def tail_file(path, lines=50, block=65536):
+    """Dernières lignes d'un fichier sans le lire en entier"""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            data = b""
+            while pos > 0 and data.count(b"\n") <= lines:
+                step = min(block, pos)
+                pos -= step
+                f.seek(pos)
+                data = f.read(step) + data
+    except OSError:
+        return []
+    return data.decode("utf-8", "replace").splitlines()[-lines:] if lines else []
@@ -0,0 +1,177 @@
+import heapq, os, subprocess, time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from engine import LaunchGraph, MAX_PARALLEL
+from preflight import SCRIPT_EXT
+from supervisor import Supervisor, STOP_GRACE, kill_tree
+from podman import PodmanBackend
+from detect import RunningState, find_pid, pid_alive
+from timeline import Timeline
+
+COMMAND_TIMEOUT = 120   # secondes max pour `activemq stop`, `compose down`, `machine stop`
+
+def stop_grace(app, default=STOP_GRACE):
+    """Délai d'arrêt propre d'une app (clé `stop_timeout`, en secondes)"""
+    try:
+        return float(app.get("stop_timeout") or default)
+    except (TypeError, ValueError):
+        return default
+
+# ─── MOTEUR D'ARRÊT ──────────────────────────────────────────────────
+class StopEngine:
+    """Arrête les apps d'une config dans l'ordre inverse du graphe de lancement.
+
+    Une app ne s'arrête qu'une fois arrêtées toutes celles qui dépendent
+    d'elle ; les apps indépendantes s'arrêtent en parallèle et les containers
+    Podman simultanés partent en un seul `podman stop`. Même journal et même
+    Timeline que LaunchEngine.
+    """
+    def __init__(self, apps, log, max_parallel=MAX_PARALLEL, supervisor=None, podman=None,
+                 timeline=None, runs_dir=None):
+        self.graph = LaunchGraph(apps)
+        self.log = log
+        self.supervisor = supervisor or Supervisor()
+        self.podman = podman or PodmanBackend()
+        self.timeline = timeline or Timeline()
+        self.runs_dir = runs_dir
+        self.max_parallel = max(1, int(max_parallel or 1))
+        self.status = {}
+
+    def run(self):
+        g = self.graph
+        t0 = time.perf_counter()
+        pending = [len(c) for c in g.children]
+        ready = [-i for i, p in enumerate(pending) if not p]   # de la fin de la liste vers le début
+        heapq.heapify(ready)
+        running = {}
+        self.running = RunningState(self.supervisor, self.podman)
+        tl = self.timeline
+        tl.begin(None, "stop all")
+        self.log("■ Arrêt des applications…")
+
+        def release(i):
+            for d in g.deps[i]:
+                pending[d] -= 1
+                if not pending[d]:
+                    heapq.heappush(ready, -d)
+
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as pool:
+            while ready or running:
+                while ready:
+                    i = -heapq.heappop(ready)
+                    running[pool.submit(self._stop_app, i)] = i
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    i = running.pop(fut)
+                    self.status[i] = fut.result()
+                    release(i)
+        tl.end(None, "stop all")
+        stopped = sum(1 for s in self.status.values() if s == "stopped")
+        failed = sum(1 for s in self.status.values() if s == "failed")
+        self.log(f"\n■ {stopped} app(s) arrêtée(s)" + (f", {failed} en échec" if failed else "")
+                 + f" en {time.perf_counter() - t0:.1f}s")
+        if self.runs_dir:
+            try:
+                self.log(f"📊 Timeline : {tl.save(self.runs_dir)}")
+            except OSError as ex:
+                self.log(f"⚠ Timeline non enregistrée : {ex}")
+        return self.status
+
+    def _stop_app(self, i):
+        app = self.graph.apps[i]
+        name = app.get("name","?")
+
+        def write(msg):
+            self.log(f"  [{name}] {msg}", name)
+
+        if app.get("type") == "Timer":
+            return "not_running"
+        # Arrêt voulu : ni relance en attente, ni redémarrage automatique pendant l'arrêt
+        self.supervisor.set_policy(name, None)
+        proc = self.supervisor.get(name)
+        if proc is not None:
+            proc.stopping = True
+        try:
+            running, detail = self.running.check(app)
+        except Exception as ex:
+            running, detail = True, str(ex)
+        if not running:
+            return "not_running"
+        self.log(f"■ {name} [{app.get('type','')}] ({detail})…", name)
+        self.timeline.begin(name, "stop")
+        try:
+            ok = self._stop(app, write)
+        except Exception as ex:
+            write(f"❌ Erreur : {ex}")
+            ok = False
+        self.timeline.end(name, "stop")
+        self.timeline.mark(name, "stopped" if ok else "stop_failed")
+        return "stopped" if ok else "failed"
+
+    def _stop(self, app, write):
+        atype = app.get("type","")
+        grace = stop_grace(app)
+        if atype == "Podman":
+            container = app.get("container","").strip()
+            write(f"podman stop -t {grace:.0f} {container}")
+            ok, msg = self.podman.stop(container, grace)
+            write(f"✅ {container} : {msg}" if ok else f"❌ {container} : {msg}")
+            return ok
+        if atype == "Podman Machine":
+            return self._command(["podman", "machine", "stop"], None, write)
+        if atype == "Docker Compose":
+            compose_file = app.get("compose_file","").strip() or "docker-compose.yaml"
+            return self._command(["podman", "compose", "-f", compose_file, "down", "-t", str(int(grace))],
+                                 app.get("directory","").strip() or None, write)
+        if atype == "ActiveMQ":
+            home = app.get("home","").strip()
+            if self._command([os.path.join(home, "bin", "activemq" + SCRIPT_EXT), "stop"], None, write):
+                proc = self.supervisor.get(app.get("name",""))
+                if proc is not None:
+                    proc.wait(grace)
+                if proc is None or proc.exited:
+                    return True
+                write(f"⚠ Broker toujours actif après {grace:.0f}s")
+            # Le broker a refusé ou ignoré l'arrêt : signaux en dernier recours
+        return self._terminate(app, grace, write)
+
+    def _command(self, argv, cwd, write):
+        write("$ " + " ".join(f'"{a}"' if " " in a else a for a in argv))
+        out = subprocess.run(argv, cwd=cwd, capture_output=True, text=True, timeout=COMMAND_TIMEOUT)
+        if out.returncode != 0:
+            write(f"❌ Code de sortie {out.returncode} : {(out.stderr or out.stdout).strip()[-300:]}")
+            return False
+        write("✅ Commande terminée")
+        return True
+
+    def _terminate(self, app, grace, write):
+        """SIGTERM, puis SIGKILL si le processus est encore là après `grace` secondes"""
+        name = app.get("name","")
+        proc = self.supervisor.get(name)
+        if proc is not None and proc.alive:
+            write(f"SIGTERM → PID {proc.pid} (max {grace:.0f}s)")
+            clean = proc.stop(grace)
+            write("✅ Arrêté" if clean else f"⚠ Toujours actif après {grace:.0f}s : SIGKILL")
+            return True
+        if proc is not None and proc.exited:
+            write("✅ Arrêté")
+            return True
+        # Processus d'un lancement précédent du lanceur, retrouvé par son fichier PID
+        pid, _ = find_pid(app, self.supervisor)
+        if not pid:
+            write("✅ Déjà arrêté")
+            return True
+        write(f"SIGTERM → PID {pid} (max {grace:.0f}s)")
+        kill_tree(pid)
+        deadline = time.monotonic() + grace
+        while pid_alive(pid) and time.monotonic() < deadline:
+            time.sleep(0.2)
+        if pid_alive(pid):
+            write(f"⚠ Toujours actif après {grace:.0f}s : SIGKILL")
+            kill_tree(pid, force=True)
+            time.sleep(0.5)
+        if pid_alive(pid):
+            write(f"❌ PID {pid} ne s'arrête pas")
+            return False
+        write("✅ Arrêté")
+        return True
@@ -0,0 +1,191 @@
+import atexit, json, os, threading, time
+
+CONFIG_FILE = "start_configs.json"
+SAVE_DELAY  = 0.5   # secondes sans modification avant d'écrire le fichier
+BACKUPS     = 5     # copies <fichier>.1 … <fichier>.N gardées
+
+# ─── ÉCRITURE ATOMIQUE ───────────────────────────────────────────────
+def atomic_write(path, text, backups=BACKUPS, rotate=True):
+    """Écrit via un fichier temporaire + fsync + rename.
+
+    Avec `rotate`, l'ancien fichier devient <fichier>.1 et les sauvegardes
+    plus anciennes sont décalées ; sinon elles restent telles quelles.
+    """
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    if rotate and backups and os.path.exists(path):
+        for i in range(backups - 1, 0, -1):
+            if os.path.exists(f"{path}.{i}"):
+                os.replace(f"{path}.{i}", f"{path}.{i+1}")
+        os.replace(path, f"{path}.1")
+    os.replace(tmp, path)
+    if os.name != "nt":
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+# ─── DATA MANAGER ────────────────────────────────────────────────────
+class Manager:
+    """Configs indexées par nom, sauvegardées en tâche de fond.
+
+    save() ne fait que signaler une modification : un thread d'écriture
+    regroupe les modifications rapprochées et écrit au plus une fois par
+    SAVE_DELAY. flush() force l'écriture (appelé aussi à la sortie).
+    Les sauvegardes ne tournent qu'à la première écriture de la session :
+    <fichier>.1 reste l'état d'avant la session, quel que soit le nombre
+    d'enregistrements qui suivent.
+    """
+    def __init__(self, path=CONFIG_FILE, save_delay=SAVE_DELAY, backups=BACKUPS):
+        self.path = path
+        self.save_delay = save_delay
+        self.backups = backups
+        self.data = {"configs": []}
+        self.index = {}
+        self.load_error = None
+        self._dirty = False
+        self._changed_at = 0.0
+        self._rotated = False   # sauvegardes déjà décalées pendant cette session
+        self._corrupt = False   # fichier illisible, mis de côté à la première écriture
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self.load()
+        threading.Thread(target=self._writer, daemon=True).start()
+        atexit.register(self.flush)
+
+    # ── Persistance ──────────────────────────────────────────────────
+    def save(self):
+        with self._cond:
+            self._dirty = True
+            self._changed_at = time.monotonic()
+            self._cond.notify()
+
+    def flush(self):
+        """Écrit immédiatement les modifications en attente"""
+        with self._cond:
+            if not self._dirty:
+                return
+            self._dirty = False
+        try:
+            self._write()
+        except Exception:
+            with self._cond:
+                self._dirty = True
+            raise
+
+    def _writer(self):
+        while True:
+            with self._cond:
+                while not self._dirty:
+                    self._cond.wait()
+                # Attend que les modifications se calment
+                while True:
+                    delay = self._changed_at + self.save_delay - time.monotonic()
+                    if delay <= 0 or not self._dirty:
+                        break
+                    self._cond.wait(delay)
+                if not self._dirty:
+                    continue
+                self._dirty = False
+            try:
+                self._write()
+            except Exception:
+                # On réessaiera à la prochaine modification ou au flush
+                with self._cond:
+                    self._dirty = True
+                time.sleep(self.save_delay)
+
+    def _write(self):
+        with self._write_lock:
+            try:
+                text = json.dumps(self.data, indent=2, ensure_ascii=False)
+            except RuntimeError:
+                # Modifié pendant la sérialisation : une nouvelle écriture suivra
+                self.save()
+                return
+            if self._corrupt:
+                # Le fichier abîmé est mis de côté plutôt qu'écrasé ou décalé en .1
+                if os.path.exists(self.path):
+                    os.replace(self.path, f"{self.path}.corrupt-{int(time.time())}")
+                self._corrupt = False
+            atomic_write(self.path, text, self.backups, rotate=not self._rotated)
+            self._rotated = True
+
+    def load(self):
+        """Charge le fichier, ou la sauvegarde la plus récente s'il est illisible.
+
+        Le fichier n'est jamais modifié ici : un fichier abîmé n'est mis de
+        côté qu'à la prochaine écriture (les commandes en lecture seule n'y
+        touchent pas).
+        """
+        self.load_error = None
+        self._corrupt = False
+        candidates = [self.path] + [f"{self.path}.{i}" for i in range(1, self.backups + 1)]
+        for path in candidates:
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if not isinstance(data.get("configs"), list):
+                    raise ValueError("clé « configs » absente")
+            except Exception as ex:
+                if path == self.path:
+                    self.load_error = f"{self.path} illisible ({ex})"
+                    self._corrupt = True
+                continue
+            if path != self.path:
+                self.load_error = (self.load_error or f"{self.path} absent") + f", restauré depuis {path}"
+            self._set(data)
+            return
+        self._set({"configs": []})
+
+    def _set(self, data):
+        self.data = data
+        self.index = {c["name"]: c for c in data["configs"]}
+
+    # ── Configs ──────────────────────────────────────────────────────
+    @property
+    def config_names(self):
+        return list(self.index)
+
+    def add_config(self, name):
+        if name in self.index:
+            return False
+        cfg = {"name": name, "apps": []}
+        self.data["configs"].append(cfg)
+        self.index[name] = cfg
+        self.save()
+        return True
+
+    def delete_config(self, name):
+        cfg = self.index.pop(name, None)
+        if cfg is not None:
+            self.data["configs"].remove(cfg)
+            self.save()
+
+    def get_config(self, name):
+        return self.index.get(name)
+
+    def add_app(self, config_name, app):
+        cfg = self.get_config(config_name)
+        if cfg is not None:
+            cfg["apps"].append(app)
+            self.save()
+
+    def remove_app(self, config_name, idx):
+        cfg = self.get_config(config_name)
+        if cfg and 0 <= idx < len(cfg["apps"]):
+            cfg["apps"].pop(idx)
+            self.save()
+
+    def move_app(self, config_name, from_idx, to_idx):
+        cfg = self.get_config(config_name)
+        if cfg and 0 <= from_idx < len(cfg["apps"]) and 0 <= to_idx <= len(cfg["apps"]):
+            app = cfg["apps"].pop(from_idx)
+            cfg["apps"].insert(to_idx, app)
+            self.save()
@@ -0,0 +1,406 @@
+import collections, itertools, os, signal, subprocess, threading, time
+
+MAX_LINES   = 5000           # lignes gardées en mémoire par app
+SPILL_BYTES = 5 * 1024**2    # taille d'un fichier de log avant rotation
+SPILL_KEEP  = 3              # nombre de fichiers tournés conservés
+STOP_GRACE  = 30             # secondes laissées à un processus pour s'arrêter proprement
+
+# Redémarrage automatique (clés d'app restart, restart_max, restart_window, restart_backoff)
+RESTART_POLICIES = ("never", "on-failure", "always")
+RESTART_MAX      = 5         # relances au plus dans la fenêtre, au-delà : crash-loop
+RESTART_WINDOW   = 300.0     # secondes
+RESTART_BACKOFF  = 1.0       # premier délai, doublé à chaque relance de la fenêtre
+RESTART_MAX_WAIT = 60.0      # délai maximum entre deux relances
+DEPS_POLL        = 2.0       # secondes entre deux vérifications des dépendances
+
+# ─── TAMPON CIRCULAIRE ───────────────────────────────────────────────
+class RingBuffer:
+    """Dernières lignes de sortie d'une app, avec numéros de séquence.
+
+    Chaque ligne est un tuple (seq, timestamp, flux, texte). Les lecteurs
+    retiennent le dernier numéro lu et ne récupèrent que les nouvelles lignes.
+    """
+    def __init__(self, maxlen=MAX_LINES, spill=None):
+        self.lines = collections.deque(maxlen=maxlen)
+        self.spill = spill
+        self.seq = 0
+        self._lock = threading.Lock()
+
+    def append(self, stream, text):
+        ts = time.time()
+        with self._lock:
+            self.seq += 1
+            self.lines.append((self.seq, ts, stream, text))
+            if self.spill:
+                self.spill.write(ts, stream, text)
+
+    def since(self, seq):
+        """Lignes de numéro > seq (les plus anciennes ont pu être évincées)"""
+        with self._lock:
+            if not self.lines or self.lines[-1][0] <= seq:
+                return []
+            first = self.lines[0][0]
+            start = max(0, seq - first + 1)
+            return list(itertools.islice(self.lines, start, None))
+
+    def tail(self, n):
+        with self._lock:
+            return list(self.lines)[-n:]
+
+    def reader(self, from_seq=0):
+        """Fonction qui renvoie le texte des nouvelles lignes à chaque appel"""
+        last = [from_seq]
+
+        def read():
+            lines = self.since(last[0])
+            if lines:
+                last[0] = lines[-1][0]
+            return [l[3] for l in lines]
+        return read
+
+    def close(self):
+        if self.spill:
+            self.spill.close()
+
+class RotatingFile:
+    """Fichier de log qui tourne en <nom>.1 … <nom>.N au-delà de max_bytes"""
+    def __init__(self, path, max_bytes=SPILL_BYTES, keep=SPILL_KEEP):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.keep = keep
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._f = open(path, "a", encoding="utf-8")
+        self._size = self._f.tell()
+
+    def write(self, ts, stream, text):
+        line = f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts))} {stream} {text}\n"
+        self._f.write(line)
+        self._size += len(line)
+        if self._size >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        self._f.close()
+        for i in range(self.keep - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i+1}")
+        if self.keep:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._f = open(self.path, "a", encoding="utf-8")
+        self._size = 0
+
+    def flush(self):
+        self._f.flush()
+
+    def close(self):
+        self._f.close()
+
+# ─── SIGNAUX ─────────────────────────────────────────────────────────
+def kill_tree(pid, force=False):
+    """Demande l'arrêt (SIGTERM) ou tue (SIGKILL) un processus et son groupe"""
+    if os.name == "nt":
+        if force:
+            subprocess.run(["taskkill", "/PID", str(pid), "/T", "/F"], capture_output=True)
+        else:
+            try:
+                os.kill(pid, signal.CTRL_BREAK_EVENT)   # reçu par tout le groupe créé au lancement
+            except OSError:
+                pass
+        return
+    sig = signal.SIGKILL if force else signal.SIGTERM
+    try:
+        # Nos processus ont leur propre groupe (start_new_session) : on vise le groupe entier
+        if os.getpgid(pid) == pid and pid != os.getpgid(0):
+            os.killpg(pid, sig)
+        else:
+            os.kill(pid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+# ─── POLITIQUE DE REDÉMARRAGE ────────────────────────────────────────
+class RestartPolicy:
+    """Quand et à quel rythme relancer un processus qui s'arrête tout seul"""
+    def __init__(self, mode="never", max_restarts=RESTART_MAX, window=RESTART_WINDOW,
+                 backoff=RESTART_BACKOFF, max_wait=RESTART_MAX_WAIT):
+        if mode not in RESTART_POLICIES:
+            raise ValueError(f"Politique de redémarrage inconnue : {mode} ({', '.join(RESTART_POLICIES)})")
+        self.mode = mode
+        self.max_restarts = int(max_restarts)
+        self.window = float(window)
+        self.backoff = float(backoff)
+        self.max_wait = float(max_wait)
+
+    @classmethod
+    def from_app(cls, app):
+        """Politique déclarée par une app, None pour « never » (défaut)"""
+        mode = str(app.get("restart") or "never").strip().lower()
+        if mode == "never":
+            return None
+        return cls(mode, app.get("restart_max") or RESTART_MAX, app.get("restart_window") or RESTART_WINDOW,
+                   app.get("restart_backoff") or RESTART_BACKOFF)
+
+    def wants(self, code):
+        return self.mode == "always" or (self.mode == "on-failure" and code != 0)
+
+    def delay(self, recent):
+        """Délai avant la relance n° recent+1 de la fenêtre"""
+        return min(self.backoff * 2 ** recent, self.max_wait)
+
+class RestartState:
+    """Relances d'une app : horodatages dans la fenêtre et état affiché sur sa carte"""
+    def __init__(self, policy, deps_ready=None):
+        self.policy = policy
+        self.deps_ready = deps_ready   # callable -> (prêtes ?, détail)
+        self.times = collections.deque()
+        self.state = "watching"        # watching, backoff, waiting_deps, crashloop
+        self.detail = ""
+        self.next_at = None
+
+    def recent(self, now):
+        while self.times and now - self.times[0] > self.policy.window:
+            self.times.popleft()
+        return len(self.times)
+
+# ─── PROCESSUS SUPERVISÉ ─────────────────────────────────────────────
+class ManagedProcess:
+    """Un processus enfant dont on garde PID, état, code de sortie et sortie"""
+    def __init__(self, name, cmd, cwd=None, env=None, output=None, on_line=None, on_exit=None,
+                 pid_file=None):
+        self.name = name
+        self.cmd = cmd
+        self.cwd = cwd or None
+        self.env = env
+        self.output = output or RingBuffer()
+        self.on_line = on_line
+        self.on_exit = on_exit
+        self.pid_file = pid_file
+        self.pid = None
+        self.state = "created"
+        self.exit_code = None
+        self.started_at = None
+        self.first_output_at = None
+        self.exited_at = None
+        self.popen = None
+        self.stopping = False   # arrêt demandé : pas de redémarrage automatique
+        self._exited = threading.Event()
+
+    def start(self):
+        kw = {}
+        if os.name == "nt":
+            kw["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.CREATE_NO_WINDOW
+        else:
+            kw["start_new_session"] = True   # groupe de processus à part, pour pouvoir l'arrêter en bloc
+        env = dict(os.environ, **self.env) if self.env else None
+        try:
+            self.popen = subprocess.Popen(self.cmd, shell=isinstance(self.cmd, str), cwd=self.cwd, env=env,
+                                          stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                          stderr=subprocess.PIPE, **kw)
+        except OSError:
+            self.state = "failed"
+            self.exited_at = time.time()
+            self._exited.set()
+            raise
+        self.pid = self.popen.pid
+        self.started_at = time.time()
+        self.state = "running"
+        if self.pid_file:
+            # Permet de retrouver le processus après un redémarrage du lanceur
+            with open(self.pid_file, "w", encoding="utf-8") as f:
+                f.write(f"{self.pid}\n{self.cmd if isinstance(self.cmd, str) else ' '.join(self.cmd)}\n")
+        readers = [threading.Thread(target=self._pump, args=(self.popen.stdout, "out"), daemon=True),
+                   threading.Thread(target=self._pump, args=(self.popen.stderr, "err"), daemon=True)]
+        for t in readers:
+            t.start()
+        threading.Thread(target=self._wait, args=(readers,), daemon=True).start()
+        return self
+
+    def _pump(self, pipe, stream):
+        for raw in iter(pipe.readline, b""):
+            text = raw.decode("utf-8", "replace").rstrip("\r\n")
+            if self.first_output_at is None:
+                self.first_output_at = time.time()
+            self.output.append(stream, text)
+            if self.on_line:
+                self.on_line(self, stream, text)
+        pipe.close()
+
+    def _wait(self, readers):
+        code = self.popen.wait()
+        for t in readers:
+            t.join(timeout=2)
+        self.exit_code = code
+        self.exited_at = time.time()
+        if self.state != "stopped":
+            self.state = "exited" if code == 0 else "failed"
+        if self.output.spill:
+            self.output.spill.flush()
+        if self.pid_file:
+            try:
+                os.remove(self.pid_file)
+            except OSError:
+                pass
+        self._exited.set()
+        if self.on_exit:
+            self.on_exit(self)
+
+    @property
+    def alive(self):
+        return self.state == "running"
+
+    @property
+    def exited(self):
+        return self._exited.is_set()
+
+    def wait(self, timeout=None):
+        """Attend la fin du processus, renvoie le code de sortie (None si timeout)"""
+        self._exited.wait(timeout)
+        return self.exit_code
+
+    def stop(self, grace=STOP_GRACE):
+        """SIGTERM puis SIGKILL après `grace` secondes ; renvoie True si arrêté sans SIGKILL"""
+        self.stopping = True
+        if self.exited or self.pid is None:
+            return True
+        self.state = "stopped"
+        kill_tree(self.pid)
+        if self._exited.wait(grace):
+            return True
+        kill_tree(self.pid, force=True)
+        self._exited.wait(5)
+        return False
+
+    def uptime(self):
+        if not self.started_at:
+            return 0.0
+        return (self.exited_at or time.time()) - self.started_at
+
+    def snapshot(self):
+        return {"name": self.name, "pid": self.pid, "state": self.state,
+                "exit_code": self.exit_code, "started_at": self.started_at,
+                "exited_at": self.exited_at, "uptime": self.uptime()}
+
+# ─── SUPERVISEUR ─────────────────────────────────────────────────────
+def _safe(name):
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+
+class Supervisor:
+    """Table des processus lancés, partagée entre les lancements"""
+    def __init__(self, log_dir=None, max_lines=MAX_LINES, spill_bytes=SPILL_BYTES, spill_keep=SPILL_KEEP):
+        self.log_dir = log_dir
+        self.max_lines = max_lines
+        self.spill_bytes = spill_bytes
+        self.spill_keep = spill_keep
+        self.procs = {}
+        self.listeners = []   # callables (proc, flux, texte)
+        self.restarts = {}    # nom -> RestartState
+        self.restart_counts = collections.Counter()   # nom -> relances automatiques effectuées
+        self._lock = threading.Lock()
+
+    def log_path(self, name):
+        return os.path.join(self.log_dir, f"{_safe(name)}.log")
+
+    def pid_path(self, name):
+        return os.path.join(self.log_dir, f"{_safe(name)}.pid")
+
+    def create(self, name, cmd, cwd=None, env=None):
+        """Prépare un processus (pas encore démarré) et le référence sous `name`"""
+        spill = None
+        if self.log_dir:
+            spill = RotatingFile(self.log_path(name), self.spill_bytes, self.spill_keep)
+        proc = ManagedProcess(name, cmd, cwd=cwd, env=env,
+                              output=RingBuffer(self.max_lines, spill),
+                              on_line=self._dispatch, on_exit=self._closed,
+                              pid_file=self.pid_path(name) if self.log_dir else None)
+        with self._lock:
+            old = self.procs.get(name)
+            self.procs[name] = proc
+        if old and old.exited:
+            old.output.close()
+        return proc
+
+    def spawn(self, name, cmd, cwd=None, env=None):
+        return self.create(name, cmd, cwd, env).start()
+
+    def get(self, name):
+        return self.procs.get(name)
+
+    def status(self):
+        with self._lock:
+            procs = list(self.procs.values())
+        return [p.snapshot() for p in procs]
+
+    def _dispatch(self, proc, stream, text):
+        for cb in list(self.listeners):
+            cb(proc, stream, text)
+
+    def _closed(self, proc):
+        if self.procs.get(proc.name) is not proc:
+            proc.output.close()
+            return
+        rs = self.restarts.get(proc.name)
+        if rs is not None and not proc.stopping and rs.policy.wants(proc.exit_code):
+            threading.Thread(target=self._restart, args=(proc, rs), daemon=True).start()
+
+    # ── Redémarrage automatique ──────────────────────────────────────
+    def set_policy(self, name, policy, deps_ready=None):
+        """Politique de redémarrage du processus `name` (None : plus de redémarrage)"""
+        with self._lock:
+            if policy is None:
+                self.restarts.pop(name, None)
+            else:
+                self.restarts[name] = RestartState(policy, deps_ready)
+
+    def restart_state(self, name):
+        rs = self.restarts.get(name)
+        return (rs.state, rs.detail, rs.next_at) if rs is not None else None
+
+    def _notify(self, proc, text):
+        """Message du superviseur dans la sortie de l'app (journal, fichier, listeners)"""
+        proc.output.append("restart", text)
+        self._dispatch(proc, "restart", text)
+
+    def _current(self, proc, rs):
+        """La relance est abandonnée si l'app a été relancée, arrêtée ou sa politique changée"""
+        return self.procs.get(proc.name) is proc and self.restarts.get(proc.name) is rs and not proc.stopping
+
+    def _restart(self, proc, rs):
+        now = time.time()
+        recent = rs.recent(now)
+        if recent >= rs.policy.max_restarts:
+            rs.state, rs.next_at = "crashloop", None
+            rs.detail = f"{recent} relances en {rs.policy.window:.0f}s, code {proc.exit_code}"
+            self._notify(proc, f"⛔ Crash-loop : {rs.detail}, plus de relance automatique")
+            return
+        delay = rs.policy.delay(recent)
+        label = f"relance {recent + 1}/{rs.policy.max_restarts}"
+        rs.state, rs.detail, rs.next_at = "backoff", label, now + delay
+        self._notify(proc, f"⟳ Arrêt (code {proc.exit_code}), {label} dans {delay:.1f}s")
+        time.sleep(delay)
+        # Dépendances d'abord : inutile de relancer une app dont le broker est tombé
+        while rs.deps_ready is not None and self._current(proc, rs):
+            try:
+                ready, detail = rs.deps_ready()
+            except Exception as ex:
+                ready, detail = False, str(ex)
+            if ready:
+                break
+            if rs.state != "waiting_deps":
+                self._notify(proc, f"⏳ Relance en attente des dépendances : {detail}")
+            rs.state, rs.detail, rs.next_at = "waiting_deps", detail, None
+            time.sleep(DEPS_POLL)
+        if not self._current(proc, rs):
+            return
+        rs.times.append(time.time())
+        self.restart_counts[proc.name] += 1
+        rs.state, rs.detail, rs.next_at = "watching", label, None
+        new = self.create(proc.name, proc.cmd, cwd=proc.cwd, env=proc.env)
+        try:
+            new.start()
+        except OSError as ex:
+            self._notify(new, f"❌ Relance impossible : {ex}")
+            self._restart(new, rs)   # compte comme un échec de plus
+            return
+        self._notify(new, f"⟳ Relancé (PID {new.pid}), {label}")
@@ -0,0 +1,185 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from engine import LaunchEngine, MAX_PARALLEL, parse_depends
+from shutdown import StopEngine
+from detect import app_identity
+
+CHECK_WORKERS = 8
+
+# ─── PLAN ────────────────────────────────────────────────────────────
+class SwitchPlan:
+    """Ce que change le passage à une config : apps gardées, arrêtées, lancées"""
+    def __init__(self, target, keep, stop, start):
+        self.target = target
+        self.keep = keep     # [(app de la config cible, détail)]
+        self.stop = stop     # [(app en cours, détail)]
+        self.start = start   # [app de la config cible]
+
+    @property
+    def empty(self):
+        return not self.stop and not self.start
+
+    def format(self):
+        lines = [f"Passage à « {self.target} » :"]
+        lines += [f"  ✔ garder   {a.get('name','?')} ({d})" for a, d in self.keep]
+        lines += [f"  ■ arrêter  {a.get('name','?')} ({d})" for a, d in self.stop]
+        lines += [f"  ▶ lancer   {a.get('name','?')}" for a in self.start]
+        if self.empty:
+            lines.append("  Rien à faire : tout est déjà en place.")
+        return "\n".join(lines)
+
+def plan_switch(configs, target_name, running):
+    """Compare ce qui tourne (toutes configs confondues) aux apps de la config cible.
+
+    `running` est un detect.RunningState ; les vérifications partent en parallèle.
+    """
+    target = next(c for c in configs if c["name"] == target_name)
+    # Apps regroupées par identité, celles de la config cible d'abord
+    candidates = {}
+    for cfg in [target] + [c for c in configs if c is not target]:
+        for app in cfg["apps"]:
+            ident = app_identity(app)
+            if ident is not None:
+                candidates.setdefault(ident, []).append(app)
+
+    def check(apps):
+        # Le même processus peut avoir été lancé sous le nom qu'il porte dans une autre config
+        for app in apps:
+            ok, detail = running.check(app)
+            if ok:
+                return app, detail
+        return None
+
+    with ThreadPoolExecutor(max_workers=CHECK_WORKERS) as pool:
+        up = {ident: r for ident, r in zip(candidates, pool.map(check, candidates.values())) if r}
+
+    wanted = set()
+    keep, start = [], []
+    for app in target["apps"]:
+        ident = app_identity(app)
+        wanted.add(ident)
+        if ident in up:
+            keep.append((app, up[ident][1]))
+        else:
+            start.append(app)
+    # Un Timer ne sert qu'à temporiser l'app qui le suit : inutile si elle tourne déjà
+    apps = target["apps"]
+    to_start = {id(a) for a in start}
+    needed = lambda k: next((id(a) in to_start for a in apps[k+1:] if app_identity(a) is not None), False)
+    start = [a for k, a in enumerate(apps)
+             if id(a) in to_start and (app_identity(a) is not None or needed(k))]
+    stop = [up[ident] for ident in up if ident not in wanted]
+    return SwitchPlan(target_name, keep, stop, start)
+
+def _detached(apps):
+    """Copies des apps dont les dépendances sont limitées à la liste (graphe d'arrêt partiel)"""
+    names = {a.get("name") for a in apps}
+    out = []
+    for app in apps:
+        app = dict(app)
+        deps = [d for d in parse_depends(app.get("depends_on")) if d in names]
+        app["depends_on"] = deps
+        out.append(app)
+    return out
+
+# ─── EXÉCUTION ───────────────────────────────────────────────────────
+class SwitchEngine:
+    """Arrête les apps en trop puis lance les nouvelles ; même journal, même Timeline"""
+    def __init__(self, plan, apps, log, max_parallel=MAX_PARALLEL, supervisor=None, podman=None,
+                 timeline=None, runs_dir=None, admission=None, builder=None, ports=None):
+        self.plan = plan
+        self.launcher = LaunchEngine(apps, log, max_parallel=max_parallel, supervisor=supervisor,
+                                     podman=podman, only={a.get("name") for a in plan.start},
+                                     timeline=timeline, runs_dir=runs_dir, admission=admission,
+                                     builder=builder, ports=ports)
+        stop_apps = _detached([a for a, _ in plan.stop])
+        self.stopper = StopEngine(stop_apps, log, max_parallel=max_parallel,
+                                  supervisor=self.launcher.supervisor, podman=self.launcher.podman,
+                                  timeline=self.launcher.timeline) if stop_apps else None
+        self.graph = self.launcher.graph
+        self.timeline = self.launcher.timeline
+
+    @property
+    def log(self):
+        return self.launcher.log
+
+    @log.setter
+    def log(self, fn):
+        self.launcher.log = fn
+        if self.stopper:
+            self.stopper.log = fn
+
+    @property
+    def times(self):
+        return self.launcher.times
+
+    @property
+    def status(self):
+        return self.launcher.status
+
+    def run(self):
+        self.log(self.plan.format())
+        if self.stopper:
+            self.stopper.run()
+        if self.plan.start:
+            self.log("")
+            self.launcher.run()
+        return self.status
+
+# ─── RELANCE CIBLÉE ──────────────────────────────────────────────────
+def dependents(graph, names):
+    """Noms des apps `names` et de toutes celles qui en dépendent (dépendances déclarées).
+
+    Sans `depends_on`, l'ordre de la liste n'est qu'un ordre de démarrage :
+    seules les apps nommées sont concernées.
+    """
+    index = [i for i, a in enumerate(graph.apps) if a.get("name") in names]
+    if not graph.declared:
+        return {graph.apps[i].get("name") for i in index}
+    seen, stack = set(index), list(index)
+    while stack:
+        for c in graph.children[stack.pop()]:
+            if c not in seen:
+                seen.add(c)
+                stack.append(c)
+    return {graph.apps[i].get("name") for i in seen}
+
+class RestartEngine:
+    """Arrête puis relance des apps et celles qui en dépendent ; le reste de la config ne bouge pas"""
+    def __init__(self, apps, names, log, max_parallel=MAX_PARALLEL, supervisor=None, podman=None,
+                 timeline=None, runs_dir=None, admission=None, builder=None, ports=None):
+        self.launcher = LaunchEngine(apps, log, max_parallel=max_parallel, supervisor=supervisor,
+                                     podman=podman, only=set(), timeline=timeline, runs_dir=runs_dir,
+                                     admission=admission, builder=builder, ports=ports)
+        self.graph = self.launcher.graph
+        self.timeline = self.launcher.timeline
+        self.names = dependents(self.graph, names)
+        self.launcher.only = self.names
+        self.stopper = StopEngine(_detached([a for a in self.graph.apps if a.get("name") in self.names]),
+                                  log, max_parallel=max_parallel, supervisor=self.launcher.supervisor,
+                                  podman=self.launcher.podman, timeline=self.timeline)
+
+    @property
+    def log(self):
+        return self.launcher.log
+
+    @log.setter
+    def log(self, fn):
+        self.launcher.log = fn
+        self.stopper.log = fn
+
+    @property
+    def times(self):
+        return self.launcher.times
+
+    @property
+    def status(self):
+        return self.launcher.status
+
+    def run(self):
+        self.log("↻ Relance : " + ", ".join(a.get("name","?") for a in self.graph.apps
+                                            if a.get("name") in self.names))
+        self.stopper.run()
+        self.log("")
+        self.launcher.run()
+        return self.status
@@ -0,0 +1,39 @@
+import pytest
+
+from logindex import Query, LEVELS
+
+@pytest.mark.parametrize("text, seconds", [
+    ("ERROR in the last 5 minutes", 300),
+    ("last 30 seconds", 30),
+    ("last 1 minute", 60),
+    ("since 10m", 600),
+    ("last 2 mn", 120),
+    ("last:2h", 7200),
+    ("last 3 hours", 10800),
+    ("last 1.5 days", 129600),
+    ("since 45 secs", 45),
+    ("last 5 mins", 300),
+])
+def test_time_window(text, seconds):
+    assert Query(text).since == seconds
+
+def test_window_is_removed_from_terms():
+    q = Query("ERROR in the last 5 minutes")
+    assert q.terms == ["error"]
+
+@pytest.mark.parametrize("text, terms", [
+    ("lost since 3 retries", ["lost", "since", "retries"]),
+    ("timeout last 2 attempts", ["timeout", "last", "attempts"]),
+    ("last 5 fortnights", ["last", "fortnights"]),
+])
+def test_unknown_unit_is_searched_as_text(text, terms):
+    q = Query(text)
+    assert q.since is None
+    assert q.terms == terms
+
+def test_filters():
+    q = Query('app=api* level>=warn "connection refused" -retry')
+    assert q.apps == ["api*"]
+    assert q.min_level == LEVELS["warn"]
+    assert q.phrases == ["connection refused"]
+    assert q.excluded == ["retry"]
@@ -0,0 +1,119 @@
+import json, os, socketserver, tempfile, threading
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from admission import Admission
+from engine import LaunchEngine
+from podman import PodmanAPI, PodmanBackend
+
+pytestmark = pytest.mark.skipif(not hasattr(socketserver, "UnixStreamServer"), reason="socket unix requise")
+
+# ─── SOCKET DE SUBSTITUTION ──────────────────────────────────────────
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        self._reply(200, [])
+
+    def do_POST(self):
+        with self.server.lock:
+            self.server.requests.append(self.path)
+            drop = self.server.drop_next
+            self.server.drop_next = False
+        if drop:
+            self.close_connection = True   # connexion persistante coupée sans réponse
+            return
+        self._reply(204 if "/start" in self.path else 404, None)
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+class _Stub(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path):
+        super().__init__(path, _Handler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = []
+        self.drop_next = False
+
+    def handle_error(self, request, client_address):
+        pass   # client parti (connexion coupée par le test ou en fin de test) : rien à signaler
+
+@pytest.fixture
+def stub():
+    with tempfile.TemporaryDirectory() as d:
+        server = _Stub(os.path.join(d, "podman.sock"))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        yield server
+        server.shutdown()
+        server.server_close()
+
+# ─── TESTS ───────────────────────────────────────────────────────────
+def test_pool_reuses_connection(stub):
+    api = PodmanAPI(stub.server_address)
+    for _ in range(5):
+        assert api.start("web") == (True, "démarré")
+    assert stub.connections == 1
+    api.close()
+
+def test_retry_on_closed_connection(stub):
+    api = PodmanAPI(stub.server_address)
+    assert api.start("web")[0]
+    stub.drop_next = True
+    assert api.start("db") == (True, "démarré")
+    assert stub.requests.count("/v4.0.0/libpod/containers/db/start") == 2
+    assert stub.connections == 2
+    api.close()
+
+def test_concurrent_starts_are_batched(stub):
+    backend = PodmanBackend(socket_path=stub.server_address, window=0.1)
+    batches = []
+    run = backend._start_many
+    backend._start_many = lambda names: batches.append(sorted(names)) or run(names)
+    results = {}
+    threads = [threading.Thread(target=lambda n=n: results.__setitem__(n, backend.start(n)))
+               for n in ("a", "b", "c")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert batches == [["a", "b", "c"]]
+    assert all(ok for ok, _ in results.values())
+    backend.api.close()
+
+class _CountingAdmission(Admission):
+    def __init__(self):
+        super().__init__(max_starting=1)
+        self.keys = []
+
+    def acquire(self, key, app, on_wait=None):
+        self.keys.append(key)
+        return super().acquire(key, app, on_wait)
+
+def test_engine_admits_podman_apps_as_one_group(stub):
+    backend = PodmanBackend(socket_path=stub.server_address, window=0.1)
+    apps = [{"type": "Podman", "name": n, "container": n, "depends_on": []} for n in ("a", "b", "c")]
+    admission = _CountingAdmission()
+    engine = LaunchEngine(apps, lambda *a: None, max_parallel=3, podman=backend, admission=admission)
+    status = engine.run()
+    assert set(status.values()) == {"ok"}
+    assert len(admission.keys) == 1
+    assert sorted(p.rsplit("/", 2)[1] for p in stub.requests) == ["a", "b", "c"]
+    assert not admission.starting
+    backend.api.close()
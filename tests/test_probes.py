@@ -0,0 +1,26 @@
+import pytest
+
+from preflight import validate_app
+from probes import probe_specs
+
+APP = {"type": "Podman", "name": "db", "container": "db"}
+
+@pytest.mark.parametrize("ready, error", [
+    ([{"type": "tcp"}], "port manquant"),
+    ({"type": "http"}, "url manquant"),
+    ({"type": "tcpp", "port": 1}, "Type de sonde inconnu"),
+    ([{"type": "log", "pattern": "("}], "sonde log"),
+    ({"type": "tcp", "port": "http"}, "sonde tcp"),
+])
+def test_invalid_specs_fail_preflight(ready, error):
+    assert error in validate_app(dict(APP, ready=ready))
+
+@pytest.mark.parametrize("ready", [
+    "tcp:5432", "tcp:${port:db}", "podman", "log:ready to accept",
+    {"type": "http", "url": "http://localhost:8080/health", "status": [200, 204]},
+])
+def test_valid_specs(ready):
+    assert validate_app(dict(APP, ready=ready)) is None
+
+def test_podman_probe_defaults_to_app_container():
+    assert probe_specs(dict(APP, ready="podman")) == [{"type": "podman", "container": "db"}]
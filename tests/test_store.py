@@ -0,0 +1,63 @@
+import json, os
+
+import pytest
+
+from store import Manager
+
+def _configs(path):
+    with open(path, encoding="utf-8") as f:
+        return [c["name"] for c in json.load(f)["configs"]]
+
+def test_backups_rotate_once_per_session(tmp_path):
+    path = str(tmp_path / "configs.json")
+    mgr = Manager(path, save_delay=0)
+    mgr.add_config("a")
+    mgr.flush()
+    for name in "bcdef":
+        mgr.add_config(name)
+        mgr.flush()
+    assert _configs(path) == list("abcdef")
+    assert not os.path.exists(path + ".2")
+
+    mgr = Manager(path, save_delay=0)
+    mgr.add_config("g")
+    mgr.flush()
+    mgr.add_config("h")
+    mgr.flush()
+    assert _configs(path + ".1") == list("abcdef")   # état d'avant la 2e session
+    assert not os.path.exists(path + ".2")
+
+def test_failed_flush_keeps_change_pending(tmp_path, monkeypatch):
+    path = str(tmp_path / "configs.json")
+    mgr = Manager(path, save_delay=60)
+    mgr.add_config("a")
+
+    def fail(*args, **kwargs):
+        raise OSError("disque plein")
+    monkeypatch.setattr("store.atomic_write", fail)
+    with pytest.raises(OSError):
+        mgr.flush()
+    assert mgr._dirty
+    monkeypatch.undo()
+    mgr.flush()
+    assert _configs(path) == ["a"]
+
+def test_corrupt_file_is_set_aside_only_when_writing(tmp_path):
+    path = str(tmp_path / "configs.json")
+    for name in "ab":
+        mgr = Manager(path, save_delay=0)
+        mgr.add_config(name)
+        mgr.flush()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{abîmé")
+    before = sorted(os.listdir(tmp_path))
+
+    mgr = Manager(path, save_delay=0)   # lecture seule, comme `list` ou `status`
+    assert mgr.config_names == ["a"] and "restauré depuis" in mgr.load_error
+    assert sorted(os.listdir(tmp_path)) == before
+
+    mgr.add_config("c")
+    mgr.flush()
+    assert _configs(path) == ["a", "c"]
+    assert _configs(path + ".1") == ["a"]   # la sauvegarde n'est pas remplacée par le fichier abîmé
+    assert len([n for n in os.listdir(tmp_path) if ".corrupt-" in n]) == 1
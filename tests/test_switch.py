@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+from detect import RunningState, cmd_matches
+from switch import plan_switch
+
+class _Supervisor:
+    log_dir = None
+
+    def __init__(self, **procs):
+        self.procs = {name: SimpleNamespace(name=name, cmd=cmd, alive=True, pid=1000 + k)
+                      for k, (name, cmd) in enumerate(procs.items())}
+
+    def get(self, name):
+        return self.procs.get(name)
+
+def _amq(home):
+    return {"type": "ActiveMQ", "name": "amq", "home": home}
+
+def test_same_name_different_home_is_another_app():
+    configs = [{"name": "x", "apps": [_amq("/x")]}, {"name": "y", "apps": [_amq("/y")]}]
+    sup = _Supervisor(amq=["/x/bin/activemq", "console"])
+    plan = plan_switch(configs, "y", RunningState(sup))
+    assert [a["home"] for a in plan.start] == ["/y"]
+    assert [a["home"] for a, _ in plan.stop] == ["/x"]
+    assert plan.keep == []
+
+def test_same_app_is_kept():
+    configs = [{"name": "x", "apps": [_amq("/x")]}, {"name": "y", "apps": [_amq("/x")]}]
+    sup = _Supervisor(amq=["/x/bin/activemq", "console"])
+    plan = plan_switch(configs, "y", RunningState(sup))
+    assert plan.empty and len(plan.keep) == 1
+
+def test_spring_boot_command_matching():
+    app = {"type": "Spring Boot", "name": "api", "jar": "/b/api.jar",
+           "run_config": "--server.port=${port:http} --spring.profiles.active=dev"}
+    assert cmd_matches(app, ["java", "-jar", "/b/api.jar", "--server.port=20001",
+                             "--spring.profiles.active=dev"])
+    assert cmd_matches(app, "java -XX:SharedArchiveFile=a.jsa -jar /b/api/api.jar "
+                            "--server.port=20001 --spring.profiles.active=dev")
+    assert not cmd_matches(app, ["java", "-jar", "/a/api.jar", "--server.port=20001",
+                                 "--spring.profiles.active=dev"])
+    assert not cmd_matches(app, ["java", "-jar", "/b/api.jar", "--server.port=20001",
+                                 "--spring.profiles.active=prod"])
@@ -0,0 +1,71 @@
+import os, threading, time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from watch import Inotify, Watcher
+
+def _es(name, home):
+    os.makedirs(os.path.join(home, "config"), exist_ok=True)
+    return {"type": "Elasticsearch", "name": name, "home": str(home)}
+
+def _wait(cond, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if cond():
+            return True
+        time.sleep(0.05)
+    return False
+
+def _write(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+
+@pytest.fixture(params=[False, True], ids=["stat", "inotify"])
+def use_inotify(request):
+    if request.param and not Inotify.supported():
+        pytest.skip("inotify indisponible")
+    return request.param
+
+def test_async_restart_absorbs_its_own_writes(tmp_path, use_inotify):
+    app = _es("es1", tmp_path / "es1")
+    conf = os.path.join(app["home"], "config", "es.yml")
+    _write(conf, "a")
+    calls, release = [], threading.Event()
+    pool = ThreadPoolExecutor(max_workers=1)
+
+    def restart(names):
+        calls.append(names)
+        _write(conf, "written by the restart")
+        release.wait(5)
+
+    w = Watcher([app], lambda names: pool.submit(restart, names), debounce=0.2, poll=0.1,
+                use_inotify=use_inotify).start()
+    try:
+        time.sleep(0.3)
+        _write(conf, "b")
+        assert _wait(lambda: calls)
+        assert _wait(lambda: w.pending is not None)   # le thread du watcher n'est pas bloqué par la relance
+        release.set()
+        assert _wait(lambda: w.pending is None)
+        time.sleep(0.5)
+        assert calls == [{"es1"}]
+    finally:
+        w.stop()
+        pool.shutdown()
+
+def test_set_apps_watches_new_apps(tmp_path, use_inotify):
+    es1 = _es("es1", tmp_path / "es1")
+    calls = []
+    w = Watcher([es1], calls.append, debounce=0.2, poll=0.1, use_inotify=use_inotify).start()
+    try:
+        es2 = _es("es2", tmp_path / "es2")
+        w.set_apps([es1, es2])
+        assert w.names == {"es1", "es2"}
+        assert _wait(lambda: len(w.paths) == 2)
+        time.sleep(0.3)
+        _write(os.path.join(es2["home"], "config", "es.yml"), "x")
+        assert _wait(lambda: calls)
+        assert calls == [{"es2"}]
+    finally:
+        w.stop()
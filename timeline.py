@@ -0,0 +1,108 @@
+import csv, json, os, time
+
+# ─── ÉVÉNEMENTS ──────────────────────────────────────────────────────
+class Timeline:
+    """Événements horodatés d'un lancement, par app.
+
+    Un enregistrement = un tuple ajouté à une liste (list.append est
+    atomique) : moins d'une microseconde, depuis n'importe quel thread.
+    Les horodatages des processus (premier affichage, sortie) sont lus
+    au moment de l'export, ce qui inclut les sorties postérieures au lancement.
+    """
+    def __init__(self, label=""):
+        self.label = label
+        self.t0 = time.time()
+        self.events = []   # (horodatage, app, nom, phase "B" | "E" | "i")
+        self.procs = {}    # app -> ManagedProcess
+        self.meta = {}     # données du lancement archivées avec lui (ports attribués…)
+
+    def begin(self, app, name):
+        self.events.append((time.time(), app, name, "B"))
+
+    def end(self, app, name):
+        self.events.append((time.time(), app, name, "E"))
+
+    def mark(self, app, name):
+        self.events.append((time.time(), app, name, "i"))
+
+    def attach(self, app, proc):
+        self.procs[app] = proc
+
+    # ── Lecture ──────────────────────────────────────────────────────
+    def apps(self):
+        """Apps dans l'ordre de leur premier événement"""
+        seen = {}
+        for _, app, _, _ in list(self.events):
+            if app is not None:
+                seen.setdefault(app, None)
+        return list(seen)
+
+    def spans(self):
+        """[(app, nom, début, fin)] en secondes depuis t0 ; fin=None si pas encore terminé"""
+        open_ = {}
+        out = []
+        for ts, app, name, ph in list(self.events):
+            if ph == "B":
+                open_[(app, name)] = len(out)
+                out.append([app, name, ts - self.t0, None])
+            elif ph == "E" and (app, name) in open_:
+                out[open_.pop((app, name))][3] = ts - self.t0
+        return [tuple(s) for s in out]
+
+    def instants(self):
+        """[(app, nom, t)] en secondes depuis t0, y compris ceux des processus
+        (spawn, first_output, exit)"""
+        out = [(app, name, ts - self.t0) for ts, app, name, ph in list(self.events) if ph == "i"]
+        for app, proc in list(self.procs.items()):
+            if proc.started_at:
+                out.append((app, "spawn", proc.started_at - self.t0))
+            if getattr(proc, "first_output_at", None):
+                out.append((app, "first_output", proc.first_output_at - self.t0))
+            if proc.exited_at:
+                out.append((app, "exit", proc.exited_at - self.t0))
+        return sorted(out, key=lambda e: e[2])
+
+    def duration(self):
+        ends = [e for _, _, _, e in self.spans() if e is not None] + [t for _, _, t in self.instants()]
+        return max(ends, default=0.0)
+
+    # ── Export ───────────────────────────────────────────────────────
+    def to_chrome(self):
+        """Format Chrome Trace Event (chrome://tracing, Perfetto)"""
+        apps = self.apps()
+        tid = {app: i + 1 for i, app in enumerate(apps)}
+        events = [{"name": "process_name", "ph": "M", "pid": 1, "args": {"name": self.label or "launch"}}]
+        events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": 0, "args": {"name": "(lancement)"}})
+        events += [{"name": "thread_name", "ph": "M", "pid": 1, "tid": tid[a], "args": {"name": a}} for a in apps]
+        now = time.time() - self.t0
+        for app, name, start, end in self.spans():
+            events.append({"name": name, "cat": "launch", "ph": "X", "pid": 1, "tid": tid.get(app, 0),
+                           "ts": round(start * 1e6), "dur": round(((end if end is not None else now) - start) * 1e6),
+                           "args": {} if end is not None else {"unfinished": True}})
+        for app, name, t in self.instants():
+            events.append({"name": name, "cat": "launch", "ph": "i", "s": "t", "pid": 1,
+                           "tid": tid.get(app, 0), "ts": round(t * 1e6)})
+        return {"traceEvents": events, "displayTimeUnit": "ms",
+                "otherData": {**self.meta, "label": self.label, "started_at": self.t0}}
+
+    def write_chrome(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome(), f)
+
+    def write_csv(self, path):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["app", "event", "start_s", "end_s", "duration_s"])
+            for app, name, start, end in self.spans():
+                w.writerow([app, name, f"{start:.6f}", "" if end is None else f"{end:.6f}",
+                            "" if end is None else f"{end - start:.6f}"])
+            for app, name, t in self.instants():
+                w.writerow([app, name, f"{t:.6f}", "", ""])
+
+    def save(self, directory):
+        """Archive le lancement sous <dir>/<label>-<date>.json, renvoie le chemin"""
+        os.makedirs(directory, exist_ok=True)
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in self.label) or "launch"
+        path = os.path.join(directory, f"{safe}-{time.strftime('%Y%m%d-%H%M%S', time.localtime(self.t0))}.json")
+        self.write_chrome(path)
+        return path
@@ -0,0 +1,293 @@
+import ctypes, ctypes.util, os, select, struct, sys, threading, time, zipfile
+
+WATCH_DEBOUNCE = 2.0    # secondes sans modification avant de considérer un fichier comme écrit
+WATCH_POLL     = 1.0    # secondes entre deux passes de stat, sans inotify
+WATCH_TICK     = 0.25   # vérification des fichiers en cours d'écriture
+
+# Masque inotify : écritures terminées, renommages (écriture atomique), créations, suppressions
+IN_MODIFY, IN_ATTRIB, IN_CLOSE_WRITE = 0x002, 0x004, 0x008
+IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE, IN_DELETE = 0x040, 0x080, 0x100, 0x200
+IN_DELETE_SELF, IN_MOVE_SELF, IN_IGNORED = 0x400, 0x800, 0x8000
+IN_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+           | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+EVENT = struct.Struct("iIII")
+
+def watch_paths(app):
+    """Entrées surveillées d'une app : fichiers et dossiers de configuration, absolus"""
+    t = app.get("type","")
+    paths = []
+    if t == "Spring Boot":
+        paths.append(app.get("jar","").strip())
+    elif t == "Docker Compose":
+        directory = app.get("directory","").strip()
+        compose_file = app.get("compose_file","").strip() or "docker-compose.yaml"
+        paths.append(os.path.join(directory, compose_file) if directory else compose_file)
+    elif t in ("ActiveMQ", "Elasticsearch"):
+        home = app.get("home","").strip()
+        if home:
+            paths.append(os.path.join(home, "conf" if t == "ActiveMQ" else "config"))
+    return [os.path.abspath(p) for p in paths if p]
+
+def signature(path):
+    """Empreinte stat d'un fichier, ou d'un dossier et de tout son contenu ; None si absent"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if not os.path.isdir(path):
+        return (st.st_size, st.st_mtime_ns, st.st_ino)
+    sig = []
+    for root, dirs, names in os.walk(path):
+        dirs.sort()
+        for n in sorted(names):
+            try:
+                s = os.stat(os.path.join(root, n))
+            except OSError:
+                continue
+            sig.append((os.path.relpath(os.path.join(root, n), path), s.st_size, s.st_mtime_ns))
+    return tuple(sig)
+
+def complete(path):
+    """Le fichier est-il lisible en entier ? (un jar doit avoir son répertoire zip final)"""
+    if os.path.isdir(path):
+        return True
+    if not os.path.isfile(path):
+        return False
+    if path.lower().endswith((".jar", ".war", ".zip")):
+        return zipfile.is_zipfile(path)
+    return True
+
+# ─── INOTIFY ─────────────────────────────────────────────────────────
+class Inotify:
+    """inotify par ctypes (Linux) : un descripteur, une surveillance par dossier"""
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add = libc.inotify_add_watch
+        self._add.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        self.dirs = {}   # wd -> dossier
+
+    @staticmethod
+    def supported():
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6")
+            return hasattr(libc, "inotify_init1")
+        except OSError:
+            return False
+
+    def add(self, directory):
+        """Surveille un dossier ; False s'il n'existe pas (encore)"""
+        wd = self._add(self.fd, os.fsencode(directory), IN_MASK)
+        if wd < 0:
+            return False
+        self.dirs[wd] = directory
+        return True
+
+    def read(self, timeout):
+        """[(dossier, nom, masque)] des événements arrivés en `timeout` secondes"""
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+        events = []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return events
+        pos = 0
+        while pos < len(data):
+            wd, mask, _, size = EVENT.unpack_from(data, pos)
+            name = data[pos + EVENT.size:pos + EVENT.size + size].rstrip(b"\0")
+            pos += EVENT.size + size
+            directory = self.dirs.get(wd)
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+            if directory is not None:
+                events.append((directory, os.fsdecode(name), mask))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+# ─── SURVEILLANCE ────────────────────────────────────────────────────
+class Watcher:
+    """Surveille les entrées des apps d'une config et signale celles qui ont changé.
+
+    inotify sous Linux (les dossiers parents des fichiers, pour voir les
+    écritures atomiques par renommage), sinon une passe de stat groupée toutes
+    les WATCH_POLL secondes. Un changement n'est signalé qu'après `debounce`
+    secondes sans nouvelle modification, une fois le fichier complet (jar
+    lisible), et seulement si son empreinte diffère de la référence.
+    on_change(noms d'apps) est appelé dans le thread du watcher ; s'il renvoie
+    un Future (relance confiée à un pool), la surveillance continue et rien
+    n'est signalé avant sa fin. Les changements survenus pendant la relance
+    (ses propres écritures) sont absorbés. set_apps() remplace les apps
+    surveillées (config modifiée).
+    """
+    def __init__(self, apps, on_change, debounce=WATCH_DEBOUNCE, poll=WATCH_POLL, use_inotify=None):
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll = poll
+        self.names = {a.get("name") for a in apps}
+        self.paths = self._paths(apps)   # chemin -> noms des apps qui en dépendent
+        self.inotify = None
+        if use_inotify is None:
+            use_inotify = Inotify.supported()
+        if use_inotify:
+            try:
+                self.inotify = Inotify()
+            except OSError:
+                self.inotify = None
+        self.base = {}      # chemin -> empreinte de référence
+        self.dirty = {}     # chemin -> (empreinte vue en dernier, instant du dernier changement)
+        self.unwatched = set()
+        self.pending = None   # Future de la relance en cours
+        self._new_apps = None
+        self._apps_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def mode(self):
+        return "inotify" if self.inotify else f"stat toutes les {self.poll:g}s"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    @staticmethod
+    def _paths(apps):
+        paths = {}
+        for app in apps:
+            for p in watch_paths(app):
+                paths.setdefault(p, set()).add(app.get("name"))
+        return paths
+
+    def set_apps(self, apps):
+        """Nouvelles apps à surveiller, prises en compte par le thread du watcher"""
+        with self._apps_lock:
+            self._new_apps = [dict(a) for a in apps]
+        self.names = {a.get("name") for a in apps}
+
+    def _apply_apps(self):
+        with self._apps_lock:
+            apps, self._new_apps = self._new_apps, None
+        if apps is None:
+            return
+        self.paths = self._paths(apps)
+        # Les chemins déjà surveillés gardent leur référence, les nouveaux partent de l'état actuel
+        self.base = {p: self.base[p] if p in self.base else signature(p) for p in self.paths}
+        self.dirty = {p: v for p, v in self.dirty.items() if p in self.paths}
+        if self.inotify:
+            self._add_watches(self.paths)
+            self._watch_dirs()
+
+    def _add_watches(self, paths):
+        watched = set(self.inotify.dirs.values())
+        for p in paths:
+            if os.path.isdir(p):
+                self.unwatched.update(root for root, _, _ in os.walk(p) if root not in watched)
+            elif os.path.dirname(p) not in watched:
+                self.unwatched.add(os.path.dirname(p))
+
+    def _baseline(self):
+        self.base = {p: signature(p) for p in self.paths}
+        self.dirty.clear()
+
+    def _watch_dirs(self):
+        """(Re)pose les surveillances inotify des dossiers qui existent maintenant"""
+        self.unwatched -= set(self.inotify.dirs.values())
+        for d in list(self.unwatched):
+            if self.inotify.add(d):
+                self.unwatched.discard(d)
+                # Ce qui a pu être écrit avant que la surveillance ne soit posée
+                for p in self.paths:
+                    if (p == d or p.startswith(d + os.sep)) and signature(p) != self.base[p]:
+                        self._touch(p)
+
+    def run(self):
+        self._baseline()
+        if self.inotify:
+            self._add_watches(self.paths)
+            self._watch_dirs()
+        next_poll = 0.0
+        try:
+            while not self._stop.is_set():
+                self._apply_apps()
+                now = time.monotonic()
+                if self.inotify:
+                    timeout = WATCH_TICK if self.dirty or self.unwatched or self.pending else self.poll
+                    for directory, name, mask in self.inotify.read(timeout):
+                        self._event(directory, name, mask)
+                    if self.unwatched:
+                        self._watch_dirs()
+                elif now >= next_poll:
+                    next_poll = now + self.poll
+                    for p in self.paths:
+                        if p not in self.dirty and signature(p) != self.base[p]:
+                            self._touch(p)
+                else:
+                    self._stop.wait(WATCH_TICK)
+                self._settle()
+        finally:
+            if self.inotify:
+                self.inotify.close()
+
+    def _event(self, directory, name, mask):
+        full = os.path.join(directory, name) if name else directory
+        if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+            self.unwatched.add(directory)   # dossier supprimé (mvn clean) : surveillance à reposer
+        elif mask & IN_CREATE and name and os.path.isdir(full):
+            self.unwatched.add(full)
+        for p in self.paths:
+            # Le fichier lui-même, un fichier du dossier surveillé, ou un dossier parent remplacé
+            if full == p or full.startswith(p + os.sep) or p.startswith(full + os.sep):
+                self._touch(p)
+
+    def _touch(self, path):
+        self.dirty[path] = (signature(path), time.monotonic())
+
+    def _settle(self):
+        """Signale les chemins stables depuis `debounce` secondes"""
+        if self.pending is not None:
+            if not self.pending.done():
+                return
+            self.pending = None
+            self._absorb()
+            return
+        if not self.dirty:
+            return
+        now = time.monotonic()
+        ready = []
+        for p, (sig, since) in list(self.dirty.items()):
+            current = signature(p)
+            if current != sig:
+                self.dirty[p] = (current, now)   # encore en cours d'écriture
+            elif now - since >= self.debounce and current is not None and complete(p):
+                del self.dirty[p]
+                if current != self.base[p]:
+                    ready.append(p)
+                self.base[p] = current
+        if not ready:
+            return
+        names = set()
+        for p in ready:
+            names |= self.paths[p]
+        result = self.on_change(names)
+        if hasattr(result, "done"):
+            self.pending = result
+            return
+        self._absorb()
+
+    def _absorb(self):
+        """Nouvelle référence après une relance : ses propres écritures ne comptent pas"""
+        self._baseline()
+        if self.inotify:
+            while self.inotify.read(0):   # événements de la relance
+                pass